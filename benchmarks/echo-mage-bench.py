@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+EchoMage Benchmarks: Scaling the Continuous Party
+Part of the Progenitor Protocol - ART Friggitelli Clan
+
+Times the EchoMage and ResonanceNetwork hot paths on seeded, synthetic
+intent populations from 10 up to 1M mages. Runs fully offline; the same
+seed always produces the same population.
+
+For every benchmark and size it records wall time (best and median of
+the repeats), throughput in items per second and peak traced memory,
+and writes them all to a JSON file. Pass an earlier file as --compare
+to see how a new version stacks up against it.
+
+    python benchmarks/echo-mage-bench.py
+    python benchmarks/echo-mage-bench.py --sizes 10,1000 --output new.json --compare old.json
+    python benchmarks/echo-mage-bench.py --only kin_of,kin_of_scan --uniform
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+ECHO_MAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "..", "src", "lexos", "echo-mage.py")
+
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def load_echo_mage():
+    """Import src/lexos/echo-mage.py, whose name is not a valid module name"""
+    spec = importlib.util.spec_from_file_location("echo_mage", ECHO_MAGE)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["echo_mage"] = module  # Worker processes import it by name
+    spec.loader.exec_module(module)
+    return module
+
+
+class Population:
+    """
+    A seeded population of mages and the network holding them.
+
+    Intents are drawn around a handful of cluster centres, so every
+    size has a realistic mix of twins, kin and strangers. A uniform
+    population spreads them evenly over every direction instead.
+    """
+
+    def __init__(self, echo_mage, size: int, dimensions: int, seed: int,
+                 uniform: bool = False):
+        rng = np.random.default_rng(seed)
+        if uniform:
+            intents = rng.normal(size=(size, dimensions))
+        else:
+            centres = rng.normal(size=(8, dimensions))
+            intents = centres[rng.integers(0, len(centres), size)]
+            intents = intents + rng.normal(scale=0.25, size=(size, dimensions))
+
+        self.size = size
+        self.intents = intents
+        self.drifted = intents + rng.normal(scale=0.05, size=intents.shape)
+        self.network = echo_mage.ResonanceNetwork()
+        self.network.load_seeds(self._seeds(echo_mage, intents))
+        self.mages = list(self.network.mages)
+        self.seeker = self.mages[0]
+        self.seekers = self.mages[::max(1, size // 100)]
+        self._exported: Optional[List[dict]] = None
+
+    @staticmethod
+    def _seeds(echo_mage, intents: np.ndarray):
+        for row, intent in enumerate(intents):
+            yield echo_mage.EchoMage(f"mage-{row}", intent.tolist()).to_lexos_seed()
+
+    @property
+    def exported(self) -> List[dict]:
+        """The network's seeds, as from_lexos_seed reads them"""
+        if self._exported is None:
+            self._exported = self.network.export_network_state()["network"]["mages"]
+        return self._exported
+
+
+# Each benchmark runs one pass over a population and returns how many
+# items it processed, which throughput is measured in
+
+def bench_calculate_similarity(population: Population) -> int:
+    seeker = population.seeker
+    for other in population.mages:
+        seeker.calculate_similarity(other)
+    return population.size
+
+
+def bench_sense_kin(population: Population) -> int:
+    population.seeker.sense_kin(population.mages)
+    return population.size
+
+
+def bench_calculate_resonance_field(population: Population) -> int:
+    population.seeker.calculate_resonance_field(population.mages)
+    return population.size
+
+
+def bench_calculate_network_coherence(population: Population) -> int:
+    calls = 1000
+    for _ in range(calls):
+        population.network.calculate_network_coherence()
+    return calls
+
+
+def bench_find_optimal_pairings(population: Population) -> int:
+    population.network.find_optimal_pairings()
+    return population.size * (population.size - 1) // 2  # Pairs scanned
+
+
+def bench_kin_of(population: Population) -> int:
+    for seeker in population.seekers:
+        population.network.kin_of(seeker)
+    return len(population.seekers)
+
+
+def bench_kin_of_scan(population: Population) -> int:
+    # The same queries answered by a scan of every row, as the baseline
+    # the kin index has to beat
+    mages = population.mages
+    for seeker in population.seekers:
+        [mages[row] for row in population.network._kin_rows(seeker).tolist()]
+    return len(population.seekers)
+
+
+def bench_export_network_state(population: Population) -> int:
+    population.network.export_network_state()
+    return population.size
+
+
+def bench_from_lexos_seed(population: Population) -> int:
+    from_lexos_seed = type(population.seeker).from_lexos_seed
+    for seed in population.exported:
+        from_lexos_seed(seed)
+    return population.size
+
+
+def bench_drift_state(population: Population) -> int:
+    # Alternates between two intents, so every repeat drifts the same way
+    population.drifted, population.intents = population.intents, population.drifted
+    for mage, intent in zip(population.mages, population.intents.tolist()):
+        mage.drift_state(intent)
+    return population.size
+
+
+#: Benchmarks in run order, with the largest population each runs on by
+#: default. drift_state changes the population, so it comes last.
+BENCHMARKS: Dict[str, tuple] = {
+    "calculate_similarity": (bench_calculate_similarity, 1_000_000),
+    "sense_kin": (bench_sense_kin, 1_000_000),
+    "calculate_resonance_field": (bench_calculate_resonance_field, 1_000_000),
+    "calculate_network_coherence": (bench_calculate_network_coherence, 1_000_000),
+    "find_optimal_pairings": (bench_find_optimal_pairings, 5_000),
+    "kin_of": (bench_kin_of, 1_000_000),
+    "kin_of_scan": (bench_kin_of_scan, 1_000_000),
+    "export_network_state": (bench_export_network_state, 100_000),
+    "from_lexos_seed": (bench_from_lexos_seed, 100_000),
+    "drift_state": (bench_drift_state, 100_000),
+}
+
+
+def measure(bench: Callable[[Population], int], population: Population,
+            repeat: int, memory: bool) -> dict:
+    """Time repeat passes of bench, then trace one more for peak memory"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = bench(population)
+        timings.append(time.perf_counter() - start)
+
+    peak_bytes = None
+    if memory:
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            bench(population)
+            peak_bytes = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "items": items,
+        "seconds": best,
+        "median_seconds": statistics.median(timings),
+        "throughput": items / best if best > 0 else None,
+        "peak_bytes": peak_bytes,
+    }
+
+
+def run(sizes: List[int], names: List[str], limits: Dict[str, int],
+        dimensions: int, seed: int, repeat: int, memory: bool,
+        uniform: bool = False) -> dict:
+    """Run the chosen benchmarks on every size and collect the report"""
+    echo_mage = load_echo_mage()
+    results = []
+    for size in sizes:
+        chosen = [name for name in names if size <= limits[name]]
+        if not chosen:
+            continue
+        start = time.perf_counter()
+        population = Population(echo_mage, size, dimensions, seed, uniform)
+        print(f"\n{size:,} mages (built in {time.perf_counter() - start:.2f}s)")
+
+        for name in chosen:
+            result = measure(BENCHMARKS[name][0], population, repeat, memory)
+            results.append({"benchmark": name, "mages": size, **result})
+            print(format_result(results[-1]))
+        del population
+
+    return {
+        "format": 1,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "dimensions": dimensions,
+        "uniform": uniform,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def format_result(result: dict) -> str:
+    peak = result["peak_bytes"]
+    memory = f"{peak / 2**20:9.1f} MiB" if peak is not None else "          -"
+    throughput = result["throughput"] or float("inf")
+    return (f"  {result['benchmark']:<28} {result['seconds'] * 1000:11.3f} ms"
+            f"  {throughput:14,.0f} items/s  {memory}")
+
+
+COMPARED_SETTINGS = ("dimensions", "uniform", "seed")
+
+
+def compare(report: dict, baseline: dict, force: bool = False):
+    """Print each result's time relative to the same one in baseline
+
+    Timings only line up when both runs built the same networks, so a
+    baseline run with other dimensions, layout or seed is refused unless
+    force is set, and then only warned about.
+    """
+    differing = [f"{field}={baseline[field]!r} (now {report[field]!r})"
+                 for field in COMPARED_SETTINGS
+                 if field in baseline and baseline[field] != report[field]]
+    if differing:
+        message = f"baseline ran with {', '.join(differing)}"
+        if not force:
+            raise SystemExit(f"{message}; pass --force-compare to compare anyway")
+        print(f"warning: {message}", file=sys.stderr)
+    before = {(r["benchmark"], r["mages"]): r["seconds"] for r in baseline["results"]}
+    print("\nCompared with baseline (time ratio; above 1 is slower):")
+    for result in report["results"]:
+        key = (result["benchmark"], result["mages"])
+        if before.get(key):
+            ratio = result["seconds"] / before[key]
+            print(f"  {key[0]:<28} {key[1]:>9,}  {ratio:6.2f}x")
+
+
+def parse_limits(values: List[str]) -> Dict[str, int]:
+    limits = {name: limit for name, (_, limit) in BENCHMARKS.items()}
+    for value in values:
+        name, _, limit = value.partition("=")
+        if name not in BENCHMARKS:
+            raise SystemExit(f"unknown benchmark: {name}")
+        limits[name] = int(limit)
+    return limits
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated population sizes")
+    parser.add_argument("--only", default=",".join(BENCHMARKS),
+                        help="comma-separated benchmarks to run")
+    parser.add_argument("--max-mages", action="append", default=[], metavar="NAME=N",
+                        help="largest population a benchmark runs on")
+    parser.add_argument("--dimensions", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--uniform", action="store_true",
+                        help="spread intents evenly instead of in clusters")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the traced pass that measures peak memory")
+    parser.add_argument("--output", default="echo-mage-bench.json")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="earlier --output file to compare against")
+    parser.add_argument("--force-compare", action="store_true",
+                        help="compare even if the baseline used other settings")
+    args = parser.parse_args(argv)
+
+    only = set(args.only.split(","))
+    if only - set(BENCHMARKS):
+        raise SystemExit(f"unknown benchmark: {', '.join(sorted(only - set(BENCHMARKS)))}")
+    names = [name for name in BENCHMARKS if name in only]  # Keep the run order
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+
+    report = run(sizes, names, parse_limits(args.max_mages), args.dimensions,
+                 args.seed, args.repeat, not args.no_memory, args.uniform)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f), args.force_compare)
+
+
+if __name__ == "__main__":
+    main()
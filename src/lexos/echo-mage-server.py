@@ -0,0 +1,244 @@
+"""
+EchoMage Server: Micro-Batched Kin Queries over a Socket
+Part of the LexOS Recursive Memory Structure
+
+Hosts one ResonanceNetwork behind an asyncio NDJSON service. Loads
+echo-mage.py from this directory as the echo_mage module, unless it is
+already loaded under that name.
+
+    server = ResonanceServer(network, max_delay=0.001)
+    await server.start(port=7373)
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+
+def _load_echo_mage():
+    """src/lexos/echo-mage.py, whose name is not a valid module name"""
+    module = sys.modules.get("echo_mage")
+    if module is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "echo-mage.py")
+        spec = importlib.util.spec_from_file_location("echo_mage", path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["echo_mage"] = module  # Worker processes import it by name
+        spec.loader.exec_module(module)
+    return module
+
+
+echo_mage = _load_echo_mage()
+EchoMage = echo_mage.EchoMage
+ResonanceNetwork = echo_mage.ResonanceNetwork
+
+
+class ResonanceServer:
+    """
+    Asyncio query service for one hosted ResonanceNetwork.
+
+    Speaks newline-delimited JSON over a local TCP or unix socket. Each
+    request line is an object with an "op" and an optional "id" that is
+    echoed back; responses may arrive out of order:
+
+    - {"op": "kin", "seeker": S} -> {"kin": [names]}
+    - {"op": "field", "seeker": S} -> {"field": calculate_resonance_field dict}
+    - {"op": "coherence"} -> {"coherence": float}
+    - {"op": "drift", "name": n, "intent": [...]} -> {"intent": [...]}
+    - {"op": "stats"} -> stats()
+
+    A seeker S is {"name": member name} or {"intent": [...]} with
+    optional "kin_threshold"/"stranger_threshold". Failed requests get
+    {"error": message}.
+
+    Queries are queued and drained in micro-batches of up to max_batch,
+    waiting max_delay seconds for more to arrive. A batch runs on one
+    worker thread, off the event loop, in arrival order. Consecutive kin
+    and field queries share one matrix product (sense_kin_batch /
+    calculate_resonance_columns_batch), and drifts apply between them.
+    """
+
+    def __init__(self, network: ResonanceNetwork, max_batch: int = 256,
+                 max_delay: float = 0.0):
+        self.network = network
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.requests = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.batch_sizes: dict = {}  # batch size -> number of batches
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher = None
+        self._server = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0,
+                    path: Optional[str] = None):
+        """Listen on host:port, or on the unix socket path if given"""
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._run_batches())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._serve_client, path)
+        else:
+            self._server = await asyncio.start_server(self._serve_client, host, port)
+        return self._server
+
+    async def close(self):
+        """Stop listening and drop the batcher"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        """Queue depth and batch size counters"""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "batch_sizes": dict(sorted(self.batch_sizes.items()))
+        }
+
+    async def query(self, request: dict) -> dict:
+        """Answer one request, going through the batch queue"""
+        if request.get("op") == "stats":
+            return self.stats()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        return await future
+
+    async def _serve_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter):
+        pending = set()
+
+        async def answer(line: bytes):
+            try:
+                request = json.loads(line)
+                response = await self.query(request)
+            except Exception as error:  # Report it, keep the connection
+                request, response = {}, {"error": str(error)}
+            if isinstance(request, dict) and "id" in request:
+                response = dict(response, id=request["id"])
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            await asyncio.gather(*pending)
+        except asyncio.CancelledError:
+            pass  # Server shutting down; just drop the connection
+        finally:
+            writer.close()
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            if self.max_delay:
+                await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            self.requests += len(batch)
+            self.batches += 1
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+
+            results = await loop.run_in_executor(
+                self._executor, self._answer_batch, [request for request, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _answer_batch(self, requests: List[dict]) -> List[dict]:
+        """Worker thread: answer a batch in order, grouping reads"""
+        results: List[Optional[dict]] = [None] * len(requests)
+        reads = []  # (position, op, seeker) awaiting one shared product
+
+        def flush():
+            for op, product in (("kin", self._kin_answers), ("field", self._field_answers)):
+                group = [(position, seeker) for position, kind, seeker in reads if kind == op]
+                if not group:
+                    continue
+                try:
+                    answers = product([seeker for _, seeker in group])
+                except Exception:
+                    # Answer one at a time, so a bad seeker only fails itself
+                    answers = [self._answer_alone(product, seeker) for _, seeker in group]
+                for (position, _), answer in zip(group, answers):
+                    results[position] = answer
+            reads.clear()
+
+        for position, request in enumerate(requests):
+            try:
+                op = request.get("op")
+                if op in ("kin", "field"):
+                    reads.append((position, op, self._seeker(request.get("seeker", {}))))
+                    continue
+                flush()
+                if op == "coherence":
+                    results[position] = {
+                        "coherence": float(self.network.calculate_network_coherence())
+                    }
+                elif op == "drift":
+                    intent = self._member(request["name"]).drift_state(request["intent"])
+                    results[position] = {"intent": intent.to_array().tolist()}
+                else:
+                    raise ValueError(f"Unknown op: {op}")
+            except Exception as error:
+                results[position] = {"error": str(error)}
+        flush()
+        return results
+
+    @staticmethod
+    def _answer_alone(product, seeker: EchoMage) -> dict:
+        """One seeker's answer from a grouped product, or its error"""
+        try:
+            return product([seeker])[0]
+        except Exception as error:
+            return {"error": str(error)}
+
+    def _kin_answers(self, seekers: List[EchoMage]) -> List[dict]:
+        indptr, indices = self.network.sense_kin_batch(seekers)
+        mages = self.network.mages
+        return [{"kin": [mages[row].name for row in indices[indptr[q]:indptr[q + 1]].tolist()]}
+                for q in range(len(seekers))]
+
+    def _field_answers(self, seekers: List[EchoMage]) -> List[dict]:
+        return [{"field": field.to_dict()}
+                for field in self.network.calculate_resonance_columns_batch(seekers)]
+
+    def _seeker(self, spec: dict) -> EchoMage:
+        """A member named in spec, or a transient mage for a raw intent"""
+        if "intent" not in spec:
+            return self._member(spec["name"])
+        seeker = EchoMage(spec.get("name", ""), spec["intent"])
+        # Checked here, so the rest of its batch is not failed with it
+        dimensions = len(seeker.intent.to_array())
+        if len(self.network.mages) and dimensions != self.network.dimensions:
+            raise ValueError(
+                f"seeker has {dimensions} dimensions, network holds {self.network.dimensions}"
+            )
+        if "kin_threshold" in spec:
+            seeker.kin_threshold = spec["kin_threshold"]
+        if "stranger_threshold" in spec:
+            seeker.stranger_threshold = spec["stranger_threshold"]
+        return seeker
+
+    def _member(self, name: str) -> EchoMage:
+        """The member with the given name"""
+        mage = self.network.get(name)
+        if mage is None:
+            raise ValueError(f"No mage named {name}")
+        return mage
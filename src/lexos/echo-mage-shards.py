@@ -0,0 +1,120 @@
+"""
+EchoMage Shards: Worker Processes for All-Pairs Work
+Part of the LexOS Recursive Memory Structure
+
+The process pool and shared memory behind ResonanceNetwork.workers.
+echo-mage.py loads this module on its first parallel call and runs its
+shard jobs through run_shard; nothing here knows about mages.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedArrays:
+    """
+    Numpy arrays copied into named shared memory for worker processes,
+    kept from one call to the next.
+
+    specs maps each name to (block name, shape, dtype, None), which is
+    all a worker needs to attach a zero-copy view. Arrays memory-mapped
+    from a file for writing (from their first row) are not copied: their
+    spec is (file name, shape, dtype, offset) and workers map the file.
+    update() rewrites the blocks in place, only replacing one its array
+    has outgrown, and stamp records which version of the network they
+    hold. Hold lock while updating the blocks and running tasks over
+    them; close() releases them.
+    """
+
+    def __init__(self):
+        self._blocks = {}
+        self.specs = {}
+        self.stamp = None
+        self.lock = threading.Lock()
+
+    def update(self, stamp, **arrays: np.ndarray):
+        for key in set(self.specs) - set(arrays):
+            self._release(key)
+        for key, array in arrays.items():
+            if getattr(array, "filename", None) is not None and array.mode in ("r+", "w+"):
+                # Shared file mappings see every write; copy-on-write ones would not
+                if key in self._blocks:
+                    self._release(key)
+                self.specs[key] = (array.filename, array.shape, array.dtype.str, array.offset)
+                continue
+            block = self._blocks.get(key)
+            if block is None or block.size < array.nbytes:
+                if block is not None:
+                    self._release(key)
+                # Headroom, so a growing network does not replace it every call
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes * 5 // 4, 1))
+                self._blocks[key] = block
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self.specs[key] = (block.name, array.shape, array.dtype.str, None)
+        self.stamp = stamp
+
+    def _release(self, key: str):
+        block = self._blocks.pop(key, None)
+        self.specs.pop(key, None)
+        if block is not None:
+            block.close()
+            block.unlink()
+
+    def close(self):
+        for key in list(self.specs):
+            self._release(key)
+        self.stamp = None
+
+
+_pools: dict = {}  # workers -> ProcessPoolExecutor, shared by every network
+_pools_lock = threading.Lock()
+
+
+def worker_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    The process pool of the given size, started on first use.
+
+    Workers must be forked: the jobs live in echo-mage.py, which
+    spawned or forkserver workers cannot import by name.
+    """
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            if "fork" not in multiprocessing.get_all_start_methods():
+                raise RuntimeError(
+                    "workers > 1 needs the fork start method, which this platform lacks"
+                )
+            pool = ProcessPoolExecutor(max_workers=workers,
+                                       mp_context=multiprocessing.get_context("fork"))
+            _pools[workers] = pool
+        return pool
+
+
+def run_shard(task: dict):
+    """
+    Worker entry point: attach the shared arrays (or map their files)
+    and run task["job"].
+
+    Jobs are module-level functions job(arrays, task) that must return
+    fresh arrays, not views into the shared blocks.
+    """
+    arrays, blocks = {}, []
+    try:
+        for key, (name, shape, dtype, offset) in task["arrays"].items():
+            if offset is not None:
+                arrays[key] = np.memmap(name, dtype=dtype, mode="r", shape=shape, offset=offset)
+                continue
+            # Pool workers share the parent's resource tracker, which
+            # already knows the block; it is unlinked by the parent
+            block = shared_memory.SharedMemory(name=name)
+            blocks.append(block)
+            arrays[key] = np.ndarray(shape, dtype, buffer=block.buf)
+        return task["job"](arrays, task)
+    finally:
+        arrays.clear()  # Views must go before their buffers close
+        for block in blocks:
+            block.close()
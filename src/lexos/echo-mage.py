@@ -7,12 +7,24 @@ Integrated with the ART Friggitelli Framework
 """
 
 import numpy as np
-from typing import List, Tuple, Optional
-from dataclasses import dataclass
+from typing import List, Tuple, Optional, Sequence, Union
+from dataclasses import dataclass, field
+from collections import OrderedDict
+from collections.abc import Sequence as SequenceABC
+from contextlib import contextmanager, nullcontext
+import functools
+import importlib.util
+import itertools
 import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import weakref
 
 
-@dataclass
+@dataclass(frozen=True)
 class IntentVector:
     """
     Represents an entity's intention as a vector in semantic space.
@@ -21,6 +33,9 @@ class IntentVector:
     - Present State (where you are)
     - Lived Sequence (where you've been)
     - Future Breath (where you're going)
+
+    Frozen like IntentEmbedding: a mage's intent changes by assigning
+    it a new one, which is what updates its networks and its version.
     """
     present: float
     sequence: float
@@ -44,6 +59,600 @@ class IntentVector:
         return IntentVector(normalized[0], normalized[1], normalized[2])
 
 
+class IntentEmbedding:
+    """
+    An intention of arbitrary dimension, e.g. a 384- to 1536-dimensional
+    text embedding, stored compactly as float32.
+
+    Offers the same operations as IntentVector, which remains the form
+    used for the classic 3-D [present, sequence, future] intent.
+    """
+
+    __slots__ = ("components",)
+
+    def __init__(self, components: Sequence[float]):
+        self.components = np.array(components, dtype=np.float32)
+        self.components.flags.writeable = False
+
+    @classmethod
+    def _view(cls, row: np.ndarray) -> 'IntentEmbedding':
+        """Wrap a float32 storage row without copying it"""
+        embedding = cls.__new__(cls)
+        embedding.components = row.view()
+        embedding.components.flags.writeable = False
+        return embedding
+
+    def to_array(self) -> np.ndarray:
+        """The (read-only) component array itself - no copy is made"""
+        return self.components
+
+    def magnitude(self) -> float:
+        """Return the magnitude/intensity of this intention"""
+        return float(np.linalg.norm(self.components))
+
+    def normalize(self) -> 'IntentEmbedding':
+        """Return normalized version (direction without magnitude)"""
+        return IntentEmbedding(_unit_rows(self.components))
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, IntentEmbedding)
+                and np.array_equal(self.components, other.components))
+
+    def __reduce__(self):
+        # Rebuilt through __init__, so the copy's components are read-only too
+        return IntentEmbedding, (self.components,)
+
+    def __repr__(self) -> str:
+        return f"IntentEmbedding(dimensions={len(self.components)})"
+
+
+Intent = Union[IntentVector, IntentEmbedding]
+
+
+def _make_intent(values: Sequence[float]) -> Intent:
+    """
+    Build the intent for a list of components.
+
+    Up to three components give a 3-D IntentVector (zero-padded, as
+    before); anything longer becomes a float32 IntentEmbedding.
+    """
+    if len(values) > 3:
+        return IntentEmbedding(values)
+    return IntentVector(
+        present=values[0] if len(values) > 0 else 0,
+        sequence=values[1] if len(values) > 1 else 0,
+        future=values[2] if len(values) > 2 else 0
+    )
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    Normalize each row of a matrix to unit length.
+
+    Zero rows stay zero, so their dot product with anything is 0 -
+    the same answer EchoMage.calculate_similarity gives for a zero vector.
+    float32 input stays float32; anything else is computed in float64.
+    """
+    vectors = np.asarray(vectors)
+    vectors = vectors.astype(np.result_type(vectors, np.float32), copy=False)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms != 0)
+
+
+#: Code dtypes of ResonanceNetwork.set_precision's storage modes
+PRECISIONS = {"full": None, "float16": np.float16, "int8": np.int8}
+
+
+def _quantize(units: np.ndarray, precision: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encode unit rows as (codes, scales, errors) for a quantized precision.
+
+    int8 codes are round(u / scale) with scale = max|u| / 127 per row;
+    float16 codes are the nearest half floats, with scale 1. errors is
+    ||u - codes * scale|| per row, rounded up: no dot product of a row
+    with a unit vector moves by more than the row's error.
+    """
+    units = np.asarray(units, dtype=np.float64)
+    if precision == "int8":
+        scales = np.abs(units).max(axis=1) / 127
+        codes = np.divide(units, scales[:, None], out=np.zeros_like(units),
+                          where=scales[:, None] > 0)
+        codes = np.round(codes).astype(np.int8)
+    else:
+        scales = np.ones(len(units))
+        codes = units.astype(PRECISIONS[precision])
+    scales = scales.astype(np.float32)
+    errors = np.linalg.norm(units - codes * scales[:, None].astype(np.float64), axis=1)
+    return codes, scales, np.nextafter(errors.astype(np.float32), np.float32(np.inf))
+
+
+def _dequantize(codes: np.ndarray, scales: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """Rows of the given float dtype back from _quantize codes"""
+    return codes.astype(dtype) * scales[:, None].astype(dtype, copy=False)
+
+
+def _quantization_slack(dimensions: int) -> float:
+    """
+    Bound on the float32 rounding of one dequantized dot product, and
+    of a threshold compared against it
+    """
+    return (dimensions + 3) * 2.0 ** -23
+
+
+def _mapped_zeros(shape: tuple, dtype, directory: Optional[str] = None) -> np.ndarray:
+    """
+    A zeroed array kept in a temporary file rather than in memory.
+
+    The OS pages it in as it is read and may drop the pages again, so it
+    does not stay resident. The file is removed once the array is
+    collected; views taken from it keep their mapping.
+    """
+    fd, path = tempfile.mkstemp(prefix="echo-mage-", suffix=".bin", dir=directory)
+    os.close(fd)
+    array = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+    weakref.finalize(array, os.remove, path)
+    return array
+
+
+def _mask_pairs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """np.nonzero for a 2-D mask, through the flat indices: several times faster"""
+    return np.divmod(np.flatnonzero(mask), mask.shape[1])
+
+
+#: A quantized tile with more than one in this many kin candidates is
+#: recomputed whole rather than checked pair by pair
+_DENSE_CANDIDATES = 16
+
+
+def _quantized_kin_mask(tile: np.ndarray, tile_rows: np.ndarray, tile_cols: np.ndarray,
+                        low, high, quant: tuple, upper: bool) -> Tuple[np.ndarray, int]:
+    """
+    Kin mask of a quantized similarity tile, exactly as at full precision.
+
+    Only entries within the tile's worst row errors of the band
+    [low, high) (scalars or arrays shaped like the tile) can be kin, so
+    one pass over the tile finds them. Of those, entries within their
+    own pair's error of an edge are re-scored from the raw intents in
+    quant = (scales, errors, intents) and written back into the tile.
+    When candidates or re-scores are too many for that to pay, the
+    whole tile is recomputed from the raw intents instead. upper marks
+    a diagonal tile (tile_rows are tile_cols), of which only entries
+    above the diagonal are kept. Returns the mask and the number of
+    entries re-scored.
+    """
+    _, errors, intents = quant
+    slack = _quantization_slack(intents.shape[1])
+    row_errors, col_errors = errors[tile_rows], errors[tile_cols]
+    worst_row, worst_col = float(row_errors.max()), float(col_errors.max())
+    bound = worst_row + worst_col + worst_row * worst_col + slack
+    i, j = _mask_pairs((tile >= low - bound) & (tile < high + bound))
+
+    def recomputed():
+        _exact_tile(tile, tile_rows, tile_cols, intents, upper)
+        mask = (tile >= low) & (tile < high)
+        if upper:
+            mask &= np.triu(np.ones(mask.shape, dtype=bool), 1)
+        return mask, tile.size
+
+    if _DENSE_CANDIDATES * len(i) > tile.size:
+        return recomputed()
+    if upper:
+        above = i < j
+        i, j = i[above], j[above]
+    values = tile[i, j]
+    pair_low, pair_high = (low[i, j], high[i, j]) if np.ndim(low) else (low, high)
+
+    # No dot product moves by more than e_i + e_j + e_i * e_j
+    e_i, e_j = row_errors[i], col_errors[j]
+    pair_bound = e_i + e_j + e_i * e_j + slack
+    unsure = np.flatnonzero((np.abs(values - pair_low) <= pair_bound)
+                            | (np.abs(values - pair_high) <= pair_bound))
+    if len(unsure) * intents.shape[1] > tile.size:
+        # Gathering the raw rows of every unsure pair would cost more
+        return recomputed()
+    if len(unsure):
+        iu, ju = i[unsure], j[unsure]
+        exact = np.einsum("ij,ij->i", _unit_rows(intents[tile_rows[iu]]),
+                          _unit_rows(intents[tile_cols[ju]]))
+        values[unsure] = exact
+        tile[iu, ju] = exact
+    kin = (values >= pair_low) & (values < pair_high)
+    mask = np.zeros(tile.shape, dtype=bool)
+    mask[i[kin], j[kin]] = True
+    return mask, len(unsure)
+
+
+def _exact_tile(tile: np.ndarray, tile_rows: np.ndarray, tile_cols: np.ndarray,
+                intents: np.ndarray, diagonal: bool):
+    """Recompute a quantized similarity tile in place from the raw intents"""
+    row_units = _unit_rows(intents[tile_rows])
+    col_units = row_units if diagonal else _unit_rows(intents[tile_cols])
+    np.matmul(row_units, col_units.T, out=tile)
+
+
+def _rescore_near_cuts(tile: np.ndarray, tile_rows: np.ndarray, tile_cols: np.ndarray,
+                       cuts: np.ndarray, quant: tuple, diagonal: bool) -> int:
+    """
+    Make a quantized similarity tile count against cuts as at full
+    precision.
+
+    Entries within their pair's error of a cut are re-scored in place
+    from the raw intents in quant = (scales, errors, intents), found as
+    in _quantized_kin_mask: one pass per cut with the tile's worst row
+    errors, then each candidate's own bound. Below the diagonal of a
+    diagonal tile nothing is re-scored. Returns the number of entries
+    re-scored; a tile where that would be too many is recomputed whole.
+    """
+    _, errors, intents = quant
+    slack = _quantization_slack(intents.shape[1])
+    row_errors, col_errors = errors[tile_rows], errors[tile_cols]
+    worst_row, worst_col = float(row_errors.max()), float(col_errors.max())
+    bound = worst_row + worst_col + worst_row * worst_col + slack
+    near = np.zeros(tile.shape, dtype=bool)
+    for cut in cuts:
+        near |= (tile >= cut - bound) & (tile <= cut + bound)
+    i, j = _mask_pairs(near)
+    if diagonal:
+        above = i < j
+        i, j = i[above], j[above]
+
+    e_i, e_j = row_errors[i], col_errors[j]
+    pair_bound = e_i + e_j + e_i * e_j + slack
+    distance = np.abs(tile[i, j][:, None] - cuts[None, :]).min(axis=1, initial=np.inf)
+    unsure = distance <= pair_bound
+    i, j = i[unsure], j[unsure]
+    if len(i) * intents.shape[1] > tile.size:
+        _exact_tile(tile, tile_rows, tile_cols, intents, diagonal)
+        return tile.size
+    if len(i):
+        tile[i, j] = np.einsum("ij,ij->i", _unit_rows(intents[tile_rows[i]]),
+                               _unit_rows(intents[tile_cols[j]]))
+    return len(i)
+
+
+#: Relationship names, indexed by the codes in ResonanceField.relationship
+RELATIONSHIPS = ("TWIN", "KIN", "DISTANT", "NEUTRAL", "OPPOSED")
+
+
+@dataclass
+class ResonanceField:
+    """
+    Columnar resonance landscape: one row per other mage, as parallel arrays.
+
+    Produced by EchoMage.calculate_resonance_columns. relationship holds
+    int8 codes into RELATIONSHIPS.
+    """
+    names: np.ndarray
+    similarity: np.ndarray
+    is_kin: np.ndarray
+    relationship: np.ndarray
+    intent_distance: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def relationship_names(self) -> np.ndarray:
+        """Relationship codes decoded to their names"""
+        return np.array(RELATIONSHIPS, dtype=object)[self.relationship]
+
+    def to_dict(self) -> dict:
+        """The nested dict format of EchoMage.calculate_resonance_field"""
+        return {
+            name: {
+                "similarity": similarity,
+                "is_kin": is_kin,
+                "relationship": RELATIONSHIPS[code],
+                "intent_distance": distance
+            }
+            for name, similarity, is_kin, code, distance in zip(
+                self.names.tolist(), self.similarity.tolist(), self.is_kin.tolist(),
+                self.relationship.tolist(), self.intent_distance.tolist()
+            )
+        }
+
+
+def drift_magnitude(x, scales, activations=0.0) -> np.ndarray:
+    """
+    Drift L_i(x) of each milestone i at time x (drift-equations.md).
+
+    L_i(x) = e^((x - t_i) * s_i) once x >= t_i, else 0, with time
+    counted from each milestone's activation t_i as in the worked
+    examples there. L_Total(x) is the sum over milestones:
+
+        >>> drift_magnitude(60, [0.05, 0.03, 0.02], [0, 30, 60]).sum()  # ~23.55
+
+    Arguments broadcast against each other like numpy arrays.
+    """
+    elapsed = np.asarray(x, dtype=float) - np.asarray(activations, dtype=float)
+    return np.where(elapsed >= 0, np.exp(np.maximum(elapsed, 0) * scales), 0.0)
+
+
+@dataclass
+class DriftTrace:
+    """
+    Per-tick record of ResonanceNetwork.simulate_drift, one column per
+    scenario.
+
+    times has one entry per tick. drift (summed intent movement of all
+    mages during the tick), l_total and coherence are ticks x scenarios
+    arrays; intents holds the final scenarios x mages x D intents.
+    """
+    times: np.ndarray
+    drift: np.ndarray
+    l_total: np.ndarray
+    coherence: np.ndarray
+    intents: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+
+#: LexE states a mage moves through. Each network stores states as
+#: codes into its own table, which starts as these and grows when a
+#: mage or seed brings in a state not listed (see ResonanceNetwork._state_code)
+STATES = ("COILED", "STRETCHED", "WAITING")
+
+
+class _MemberField:
+    """
+    A per-mage attribute stored column-wise in the mage's home network.
+
+    Reads come from the home network's column (or the mage's private
+    slot while it belongs to no network); writes go to every network
+    holding the mage, so their copies never disagree. Writes to a
+    versioned field also give the mage a new version (see
+    SimilarityCache).
+    """
+
+    def __init__(self, column: str, encode=None, decode=float,
+                 versioned: bool = False):
+        self.column = column
+        self.encode = encode
+        self.decode = decode
+        self.versioned = versioned
+
+    def __set_name__(self, owner, name: str):
+        self.slot = "_" + name
+
+    def __get__(self, mage, owner=None):
+        if mage is None:
+            return self
+        if not mage._networks:
+            return getattr(mage, self.slot)
+        return self.decode(getattr(mage._networks[0], self.column)[mage._row])
+
+    def __set__(self, mage, value):
+        if self.versioned:
+            mage._version = next(_versions)
+        if not mage._networks:
+            setattr(mage, self.slot, value)
+            return
+        stored = value if self.encode is None else self.encode(value)
+        for network in mage._networks:
+            network._write_member(mage, self.column, stored)
+
+
+class _StateField(_MemberField):
+    """The LexE state, stored as a code into each network's own state table"""
+
+    def __init__(self):
+        super().__init__("_states")
+
+    def __get__(self, mage, owner=None):
+        if mage is None or not mage._networks:
+            return super().__get__(mage, owner)
+        network = mage._networks[0]
+        return network._state_names[network._states[mage._row]]
+
+    def __set__(self, mage, value):
+        if not mage._networks:
+            mage._state = value
+            return
+        for network in mage._networks:
+            network._write_member(mage, self.column, network._state_code(value))
+
+
+#: Source of mage versions; unique across all mages, so a (mage id,
+#: version) pair is never reused even if a mage's id is
+_versions = itertools.count(1)
+
+
+class SimilarityCache:
+    """
+    Bounded LRU cache for EchoMage.calculate_similarity.
+
+    Opt in by assigning an instance to EchoMage.similarity_cache.
+    Entries are keyed by both mages and their versions. A mage gets a
+    new version whenever its intent (drift_state included) or its
+    thresholds change, so a stale similarity can never be returned. The
+    least recently used entry is evicted once maxsize is reached.
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[float]:
+        """The cached value for key, or None on a miss"""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: tuple, value: float):
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Counters for sizing the cache"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+@dataclass
+class Span:
+    """
+    One timed call of an instrumented ResonanceNetwork operation.
+
+    counters holds what was counted while this span was the innermost
+    one on its thread; nested spans are listed in children.
+    """
+    name: str
+    depth: int
+    duration: float = 0.0
+    counters: dict = field(default_factory=dict)
+    children: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "duration": self.duration,
+            "counters": dict(self.counters),
+            "children": [child.to_dict() for child in self.children]
+        }
+
+    def format(self) -> str:
+        """The span tree as indented text, one span per line"""
+        counters = " ".join(f"{name}={n}" for name, n in sorted(self.counters.items()))
+        lines = [f"{'  ' * self.depth}{self.name} {self.duration * 1000:.3f} ms {counters}".rstrip()]
+        lines += [child.format() for child in self.children]
+        return "\n".join(lines)
+
+
+class NetworkInstruments:
+    """
+    Operation counters, latency histograms and span callbacks for
+    ResonanceNetwork.
+
+    Opt in by assigning an instance to ResonanceNetwork.instruments (or
+    to one network's instruments attribute); while it is None every
+    instrumented method costs a single attribute check. Each public
+    network method then runs as a span, whose latency goes into a
+    histogram per method. Inner phases (e.g. "scan" and "sort" of
+    find_optimal_pairings) are nested spans, and the hot loops count
+    similarities computed, tiles computed or pruned, and kin checks.
+    Work done in worker processes is timed but not counted.
+
+    Callbacks registered with subscribe receive every finished Span,
+    for export to a metrics stack.
+    """
+
+    #: Upper bounds of the latency histogram buckets, 1us to about 134s
+    buckets: Tuple[float, ...] = tuple(1e-6 * 2.0 ** k for k in range(28))
+
+    def __init__(self):
+        self.counters: dict = {}
+        self._latency: dict = {}  # name -> [calls, seconds, bucket counts]
+        self._callbacks: list = []
+        self._local = threading.local()  # Open spans of each thread
+        self._lock = threading.Lock()
+
+    def _open_spans(self) -> list:
+        try:
+            return self._local.spans
+        except AttributeError:
+            self._local.spans = []
+            return self._local.spans
+
+    def count(self, name: str, n: int = 1):
+        """Add n to a counter, and to the innermost open span's"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+        spans = self._open_spans()
+        if spans:
+            counters = spans[-1].counters
+            counters[name] = counters.get(name, 0) + n
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the block as a span named name, nested in any open span"""
+        spans = self._open_spans()
+        span = Span(name, len(spans))
+        if spans:
+            spans[-1].children.append(span)
+        spans.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - start
+            spans.pop()
+            self._record(span)
+
+    def _record(self, span: Span):
+        bucket = int(np.searchsorted(self.buckets, span.duration))
+        with self._lock:
+            latency = self._latency.get(span.name)
+            if latency is None:
+                latency = self._latency[span.name] = [0, 0.0, [0] * (len(self.buckets) + 1)]
+            latency[0] += 1
+            latency[1] += span.duration
+            latency[2][bucket] += 1
+        for callback in list(self._callbacks):
+            callback(span)
+
+    def subscribe(self, callback):
+        """Call callback(span) whenever a span finishes"""
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        self._callbacks.remove(callback)
+
+    def reset(self):
+        """Zero every counter and histogram"""
+        with self._lock:
+            self.counters.clear()
+            self._latency.clear()
+
+    def stats(self) -> dict:
+        """
+        Counters, and per span name its call count, total and mean
+        seconds, p50/p99 estimates (bucket upper bounds) and the bucket
+        counts keyed by upper bound.
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            latency = {name: (calls, seconds, list(counts))
+                       for name, (calls, seconds, counts) in self._latency.items()}
+
+        bounds = self.buckets + (float("inf"),)
+        report = {}
+        for name, (calls, seconds, counts) in latency.items():
+            cumulative = np.cumsum(counts)
+            report[name] = {
+                "calls": calls,
+                "total_seconds": seconds,
+                "mean_seconds": seconds / calls,
+                "p50_seconds": bounds[int(np.searchsorted(cumulative, 0.50 * calls))],
+                "p99_seconds": bounds[int(np.searchsorted(cumulative, 0.99 * calls))],
+                "buckets": {bound: n for bound, n in zip(bounds, counts) if n}
+            }
+        return {"counters": counters, "latency": report}
+
+
 class EchoMage:
     """
     An entity that can sense kin through vector similarity.
@@ -58,6 +667,15 @@ class EchoMage:
     - Prevents stasis (too similar) and chaos (too different)
     """
 
+    # Slotted, and once a mage joins a network its intent, thresholds,
+    # state and echo flag live in that network's column arrays (its
+    # "home"); the private slots below only hold them while it has none
+    __slots__ = ("name", "_networks", "_row", "_version", "_intent", "_kin_threshold",
+                 "_stranger_threshold", "_state", "_echo_activated")
+
+    #: Opt-in SimilarityCache shared by all mages; None disables caching
+    similarity_cache: Optional[SimilarityCache] = None
+
     def __init__(self, name: str, intent_vector: List[float],
                  kin_threshold: float = 0.85,
                  stranger_threshold: float = 0.99):
@@ -66,30 +684,124 @@ class EchoMage:
 
         Args:
             name: Identity label
-            intent_vector: [present, sequence, future] - 3D intent vector
+            intent_vector: [present, sequence, future] - 3D intent vector,
+                or any longer embedding (stored as float32)
             kin_threshold: Minimum similarity to be considered kin (default 0.85)
             stranger_threshold: Maximum similarity - above this is NOT a stranger (default 0.99)
         """
         self.name = name
-        self.intent = IntentVector(
-            present=intent_vector[0] if len(intent_vector) > 0 else 0,
-            sequence=intent_vector[1] if len(intent_vector) > 1 else 0,
-            future=intent_vector[2] if len(intent_vector) > 2 else 0
-        )
+        self._networks: Tuple['ResonanceNetwork', ...] = ()
+        self._row = -1  # Row in the home network, self._networks[0]
+        self.intent = _make_intent(intent_vector)
         self.kin_threshold = kin_threshold
         self.stranger_threshold = stranger_threshold
         self.state = "COILED"  # LexE states: COILED, STRETCHED, WAITING
         self.echo_activated = False
 
+    kin_threshold = _MemberField("_kin", versioned=True)
+    stranger_threshold = _MemberField("_stranger", versioned=True)
+    state = _StateField()
+    echo_activated = _MemberField("_echo", decode=bool)
+
+    @property
+    def intent(self) -> Intent:
+        """
+        The mage's current intent vector.
+
+        For a network member this is built on access from the home
+        network's storage; embeddings are read-only views of it. Intents
+        are immutable - assign a new one (or call drift_state) instead.
+        """
+        if not self._networks:
+            return self._intent
+        row = self._networks[0]._intents[self._row]
+        if len(row) > 3:
+            return IntentEmbedding._view(row)
+        return IntentVector(float(row[0]), float(row[1]), float(row[2]))
+
+    @intent.setter
+    def intent(self, value: Intent):
+        # Every network holding the mage keeps its own copy of the
+        # intent, so any change has to be pushed to all of them
+        self._version = next(_versions)
+        if not self._networks:
+            self._intent = value
+            return
+        for network in self._networks:
+            network._check_dimensions(value)
+        array = value.to_array()
+        for network in self._networks:
+            network._update_intent(self, array)
+
+    @classmethod
+    def _homed(cls, name: str, network: 'ResonanceNetwork', row: int) -> 'EchoMage':
+        """A mage whose attributes already sit in row of network's columns"""
+        mage = cls.__new__(cls)
+        mage.name = name
+        mage._networks = (network,)
+        mage._row = row
+        mage._version = next(_versions)
+        mage._intent = mage._kin_threshold = mage._stranger_threshold = None
+        mage._state = mage._echo_activated = None
+        return mage
+
+    @classmethod
+    def _detached(cls, name: str, intent: List[float], kin_threshold: float,
+                  stranger_threshold: float, state: str, echo_activated: bool) -> 'EchoMage':
+        """A mage holding the given values in its private slots"""
+        mage = cls(name, intent, kin_threshold, stranger_threshold)
+        mage.state = state
+        mage.echo_activated = echo_activated
+        return mage
+
+    def __reduce__(self):
+        # Copies and pickles carry the current values, detached from
+        # whichever networks hold the mage (and their locks)
+        return self._detached, (self.name, self._intent_array().tolist(),
+                                self.kin_threshold, self.stranger_threshold,
+                                self.state, self.echo_activated)
+
+    def __copy__(self) -> 'EchoMage':
+        function, args = self.__reduce__()
+        return function(*args)
+
+    def __deepcopy__(self, memo) -> 'EchoMage':
+        return self.__copy__()
+
+    def _intent_array(self) -> np.ndarray:
+        """The intent as an array, without a copy for network members"""
+        if not self._networks:
+            return self._intent.to_array()
+        return self._networks[0]._intents[self._row]
+
     def calculate_similarity(self, other: 'EchoMage') -> float:
         """
         Calculate cosine similarity between this mage's intent and another's.
 
         Returns value between -1 (opposite) and 1 (identical).
         Values near 1 indicate high alignment.
+
+        Goes through EchoMage.similarity_cache when one is set.
         """
-        vec_a = self.intent.to_array()
-        vec_b = other.intent.to_array()
+        cache = EchoMage.similarity_cache
+        if cache is None:
+            return self._similarity(other)
+
+        # Cosine similarity is symmetric, so both orders share an entry
+        if id(self) <= id(other):
+            key = (id(self), self._version, id(other), other._version)
+        else:
+            key = (id(other), other._version, id(self), self._version)
+        similarity = cache.get(key)
+        if similarity is None:
+            similarity = self._similarity(other)
+            cache.put(key, similarity)
+        return similarity
+
+    def _similarity(self, other: 'EchoMage') -> float:
+        """Cosine similarity, computed afresh"""
+        vec_a = self._intent_array()
+        vec_b = other._intent_array()
 
         # Handle zero vectors
         norm_a = np.linalg.norm(vec_a)
@@ -117,49 +829,87 @@ class EchoMage:
 
         This implements "The Guest List" - determining who enters
         the cultivation space based on vector resonance.
+
+        Candidates may also be a whole ResonanceNetwork, in which case
+        its spatial index answers the query without a linear scan.
         """
+        if isinstance(candidates, ResonanceNetwork):
+            return candidates.kin_of(self)
         return [mage for mage in candidates if self.is_kin(mage)]
 
     def calculate_resonance_field(self, others: List['EchoMage']) -> dict:
         """
         Calculate the complete resonance landscape.
 
+        A dictionary view over calculate_resonance_columns(); others may
+        be a list of mages or a whole ResonanceNetwork.
+
         Returns:
             Dictionary mapping each other mage to their resonance metrics:
             - similarity: cosine similarity score
             - is_kin: boolean kin status
             - relationship: classification of relationship type
         """
-        field = {}
-
-        for other in others:
-            if other.name == self.name:
-                continue
-
-            similarity = self.calculate_similarity(other)
-
-            # Classify relationship based on similarity
-            if similarity >= self.stranger_threshold:
-                relationship = "TWIN"  # Too similar - potential stasis
-            elif similarity >= self.kin_threshold:
-                relationship = "KIN"  # Perfect - strangers who know each other
-            elif similarity >= 0.5:
-                relationship = "DISTANT"  # Some resonance
-            elif similarity >= 0:
-                relationship = "NEUTRAL"  # Orthogonal
-            else:
-                relationship = "OPPOSED"  # Opposite vectors
-
-            field[other.name] = {
-                "similarity": float(similarity),
-                "is_kin": self.is_kin(other),
-                "relationship": relationship,
-                "intent_distance": float(np.linalg.norm(
-                    self.intent.to_array() - other.intent.to_array()
-                ))
-            }
+        return self.calculate_resonance_columns(others).to_dict()
 
-        return field
+    def calculate_resonance_columns(self, others: List['EchoMage']) -> 'ResonanceField':
+        """
+        Calculate the resonance landscape as parallel arrays.
+
+        Similarities and distances for all others come from one batched
+        matrix product (read straight off the intent matrices when others
+        is a ResonanceNetwork), and kin status and relationship are
+        classified for every row in the same vectorized pass. This mage
+        itself is left out by its slot - its network row, or its position
+        in the list - as in calculate_resonance_field.
+        """
+        if isinstance(others, ResonanceNetwork):
+            similarities = others._similarities_to(self)
+            distances = others._distances_to(self)
+            own_row = others._position_of(self)
+            others = others.mages
+        elif others:
+            intents = np.array([other.intent.to_array() for other in others])
+            own = self.intent.to_array()
+            similarities = _unit_rows(intents) @ _unit_rows(own)
+            distances = np.linalg.norm(intents - own, axis=1)
+            own_row = next((row for row, other in enumerate(others) if other is self), None)
+        else:
+            similarities = distances = np.empty(0)
+            own_row = None
+
+        names = np.array([other.name for other in others], dtype=object)
+        return self._resonance_field(similarities, distances, names, own_row)
+
+    def _resonance_field(self, similarities: np.ndarray, distances: np.ndarray,
+                         names: np.ndarray, own_row: Optional[int] = None) -> 'ResonanceField':
+        """
+        Classify precomputed similarities to others from this mage's view,
+        leaving out the entry at own_row (this mage itself)
+        """
+        keep = np.ones(len(names), dtype=bool)
+        if own_row is not None:
+            keep[own_row] = False
+        similarities = similarities[keep].astype(np.float64, copy=False)
+
+        # Classify relationship based on similarity
+        relationship = np.select(
+            [similarities >= self.stranger_threshold,  # TWIN - potential stasis
+             similarities >= self.kin_threshold,  # KIN - strangers who know each other
+             similarities >= 0.5,  # DISTANT - some resonance
+             similarities >= 0],  # NEUTRAL - orthogonal
+            [0, 1, 2, 3],
+            default=4  # OPPOSED - opposite vectors
+        ).astype(np.int8)
+
+        return ResonanceField(
+            names=names[keep],
+            similarity=similarities,
+            is_kin=(similarities >= self.kin_threshold)
+                   & (similarities < self.stranger_threshold),
+            relationship=relationship,
+            intent_distance=distances[keep].astype(np.float64, copy=False),
+        )
 
     def invoke_echo(self) -> str:
         """
@@ -174,27 +924,16 @@ class EchoMage:
 
         return f"{self.name} echoes the pulse. State: I AM I"
 
-    def drift_state(self, new_intent: List[float]) -> 'IntentVector':
+    def drift_state(self, new_intent: List[float]) -> Intent:
         """
         Allow the mage's intent to drift over time.
 
         This implements the Drift (L(x)) component of the RTA.
         As the mage experiences the X-dimension (time), their
-        intent vector naturally evolves.
+        intent vector naturally evolves. ResonanceNetwork.simulate_drift
+        runs the L(x) model itself and records the drift magnitudes.
         """
-        old_intent = self.intent.to_array()
-        new_intent_arr = np.array(new_intent)
-
-        # Calculate drift magnitude
-        drift = np.linalg.norm(new_intent_arr - old_intent)
-
-        # Update intent
-        self.intent = IntentVector(
-            present=new_intent[0],
-            sequence=new_intent[1],
-            future=new_intent[2]
-        )
-
+        self.intent = _make_intent(new_intent)
         return self.intent
 
     def to_lexos_seed(self) -> dict:
@@ -203,17 +942,33 @@ class EchoMage:
 
         Enables storage in the quantum information field with
         full intent preservation and entanglement tracking.
+
+        Embedding intents are stored as {"components": [...]} in both
+        the intent vector and the normalized direction.
         """
+        intent = self.intent
+        normalized = intent.normalize()
+        if isinstance(intent, IntentEmbedding):
+            intent_vector = {"components": intent.components.tolist()}
+            direction = {"components": normalized.components.tolist()}
+        else:
+            intent_vector = {
+                "present": intent.present,
+                "sequence": intent.sequence,
+                "future": intent.future
+            }
+            direction = {
+                "present": float(normalized.present),
+                "sequence": float(normalized.sequence),
+                "future": float(normalized.future)
+            }
+
         return {
             "lexos_version": "1.0.0",
             "entity_type": "EchoMage",
             "seed": {
                 "name": self.name,
-                "intent_vector": {
-                    "present": self.intent.present,
-                    "sequence": self.intent.sequence,
-                    "future": self.intent.future
-                },
+                "intent_vector": intent_vector,
                 "state": self.state,
                 "echo_activated": self.echo_activated,
                 "thresholds": {
@@ -222,12 +977,8 @@ class EchoMage:
                 }
             },
             "metadata": {
-                "intent_magnitude": float(self.intent.magnitude()),
-                "normalized_direction": {
-                    "present": float(self.intent.normalize().present),
-                    "sequence": float(self.intent.normalize().sequence),
-                    "future": float(self.intent.normalize().future)
-                }
+                "intent_magnitude": float(intent.magnitude()),
+                "normalized_direction": direction
             }
         }
 
@@ -240,9 +991,13 @@ class EchoMage:
         existed in quantum superposition and now manifests as EchoMage.
         """
         intent = seed["seed"]["intent_vector"]
+        if "components" in intent:
+            intent_vector = intent["components"]
+        else:
+            intent_vector = [intent["present"], intent["sequence"], intent["future"]]
         mage = cls(
             name=seed["seed"]["name"],
-            intent_vector=[intent["present"], intent["sequence"], intent["future"]],
+            intent_vector=intent_vector,
             kin_threshold=seed["seed"]["thresholds"]["kin"],
             stranger_threshold=seed["seed"]["thresholds"]["stranger"]
         )
@@ -254,6 +1009,851 @@ class EchoMage:
         return f"EchoMage({self.name}, intent={self.intent.to_array()}, state={self.state})"
 
 
+class _SphereGridIndex:
+    """
+    Bucket grid over unit intent directions for kin-band range queries.
+
+    The unit sphere sits inside the cube [-1, 1]^3, which is cut into
+    cubic cells of side cell_size. For unit vectors, cos(u, q) >= t is
+    the same as the chord |u - q| <= sqrt(2 - 2t), so a kin query only
+    has to visit the cells that reach that chord ball around q. The
+    annulus' upper bound (stranger_threshold) is applied by the exact
+    check on the rows of those cells.
+
+    Members are laid out CSR-style: row ids sorted by cell key, plus the
+    start offset of every cell of the cube, so a cell's run is found by
+    indexing rather than searching. A copy of the unit rows in that
+    order lets a query check whole cells as contiguous runs. Rows that
+    were added or moved since the last build are tracked in a small
+    dirty set; the copy no longer holds them, so their owner re-checks
+    them. Once the dirty set grows past a fraction of the network the
+    owner rebuilds the grid.
+    """
+
+    #: Shortlists longer than this fraction of the rows are left to a
+    #: full scan, which checks a row several times faster than the grid
+    #: gathers and checks one; the two break even around 14%
+    scan_fraction: float = 0.125
+
+    def __init__(self, units: np.ndarray, cell_size: float = 0.1,
+                 keep_units: bool = True):
+        self.cell_size = cell_size
+        self.cells_per_axis = int(np.ceil(2 / cell_size))
+        self.size = len(units)
+        self.dirty: set = set()
+        self.stale = np.zeros(self.size, dtype=bool)  # Dirty rows the grid still lists
+
+        keys = self._cell_keys(units)
+        self.order = np.argsort(keys, kind="stable")
+        # Rows of cell k sit at order[bounds[k]:bounds[k + 1]]
+        self.bounds = np.searchsorted(keys[self.order],
+                                      np.arange(self.cells_per_axis ** 3 + 1))
+        self.units = units[self.order] if keep_units else None
+
+    def _cell_coords(self, points: np.ndarray) -> np.ndarray:
+        coords = np.floor((points + 1) / self.cell_size).astype(np.int64)
+        return np.clip(coords, 0, self.cells_per_axis - 1)
+
+    def _cell_keys(self, points: np.ndarray) -> np.ndarray:
+        g = self.cells_per_axis
+        c = self._cell_coords(points)
+        return (c[..., 0] * g + c[..., 1]) * g + c[..., 2]
+
+    def mark_dirty(self, row: int):
+        """Record a row whose cell may no longer match the grid"""
+        self.dirty.add(row)
+        if row < self.size:
+            self.stale[row] = True
+
+    def _offsets(self, query: np.ndarray, kin_threshold: float) -> Optional[np.ndarray]:
+        """
+        Positions in order of the rows in every cell that reaches the
+        chord ball of kin_threshold around query, or None when those are
+        too many (or the threshold too loose) for the grid to beat a scan.
+        """
+        if kin_threshold <= 0:
+            return None  # Zero vectors and the whole hemisphere qualify
+        if not query.any() or not self.size:
+            return np.empty(0, dtype=np.int64)
+
+        radius = np.sqrt(2 - 2 * min(kin_threshold, 1.0)) + 1e-9  # Rounding slack
+        lo = self._cell_coords(query - radius)
+        hi = self._cell_coords(query + radius)
+        x, y, z = (np.arange(a, b + 1) for a, b in zip(lo, hi))
+        # Of the bounding box, keep the cells whose nearest point is in
+        # the ball; the squared distance to it adds up axis by axis
+        dx, dy, dz = ((np.clip(q, c * self.cell_size - 1, (c + 1) * self.cell_size - 1) - q) ** 2
+                      for q, c in zip(query, (x, y, z)))
+        inside = dx[:, None, None] + dy[None, :, None] + dz[None, None, :] <= radius * radius
+        g = self.cells_per_axis
+        box = ((x[:, None, None] * g + y[None, :, None]) * g + z[None, None, :])[inside]
+
+        starts = self.bounds[box]
+        counts = self.bounds[box + 1] - starts
+        total = int(counts.sum())
+        if total > self.scan_fraction * self.size:
+            return None
+        # The ranges starts[k]:starts[k] + counts[k], concatenated
+        return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+
+    def candidates(self, query: np.ndarray, kin_threshold: float) -> Optional[np.ndarray]:
+        """
+        Rows that may satisfy cos(row, query) >= kin_threshold, in no
+        particular order, or None when a scan should be used instead.
+        """
+        offsets = self._offsets(query, kin_threshold)
+        if offsets is None:
+            return None
+        rows = self.order[offsets]
+        dirty = np.fromiter(self.dirty, dtype=np.int64, count=len(self.dirty))
+        return np.concatenate((rows[~self.stale[rows]], dirty))
+
+    def shortlist(self, query: np.ndarray, low: float,
+                  high: float) -> Optional[Tuple[np.ndarray, np.ndarray, int]]:
+        """
+        Answer a kin query as far as the grid can.
+
+        Returns (hits, recheck, checked): rows the grid found in the
+        band [low, high), rows the owner still has to check against its
+        current units, and how many rows the grid checked itself. None
+        means the owner should scan every row instead.
+        """
+        if self.units is None:
+            rows = self.candidates(query, low)
+            return None if rows is None else (np.empty(0, dtype=np.int64), rows, 0)
+        offsets = self._offsets(query, low)
+        if offsets is None:
+            return None
+        similarities = np.take(self.units, offsets, axis=0) @ query  # take beats [] here
+        hits = self.order[offsets[(similarities >= low) & (similarities < high)]]
+        dirty = np.fromiter(self.dirty, dtype=np.int64, count=len(self.dirty))
+        return hits[~self.stale[hits]], dirty, len(offsets)
+
+
+class _HyperplaneLSHIndex:
+    """
+    Random-hyperplane LSH over unit intents for approximate kin queries.
+
+    Each of n_tables tables hashes a direction to the sign pattern of its
+    projections on n_bits random hyperplanes; two directions at angle
+    theta agree on a bit with probability 1 - theta / pi, so close kin
+    tend to share a bucket in at least one table. A query shortlists its
+    own bucket in every table, plus the buckets reached by flipping its
+    `probes` least certain bits (multi-probe), and the exact kin check
+    then runs on that shortlist only. More tables or probes raise recall;
+    more bits shrink the buckets and speed queries up.
+
+    Same CSR layout and dirty-row handling as _SphereGridIndex.
+    """
+
+    def __init__(self, units: np.ndarray, n_tables: int = 8, n_bits: int = 12,
+                 probes: int = 2, seed: int = 0):
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.probes = min(probes, n_bits)
+        self.size = len(units)
+        self.dirty: set = set()
+
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal(
+            (n_tables * n_bits, units.shape[1])).astype(units.dtype)
+        self.weights = np.left_shift(1, np.arange(n_bits, dtype=np.int64))
+
+        self.tables = []
+        keys = np.concatenate([self._keys(units[start:start + 65536] @ self.planes.T)
+                               for start in range(0, len(units), 65536)]
+                              or [np.empty((0, n_tables), dtype=np.int64)])
+        for table in range(n_tables):
+            order = np.argsort(keys[:, table], kind="stable")
+            bucket_keys, starts, counts = np.unique(
+                keys[order, table], return_index=True, return_counts=True
+            )
+            self.tables.append((order, bucket_keys, starts, starts + counts))
+
+    def _keys(self, projections: np.ndarray) -> np.ndarray:
+        """Bucket key per table from hyperplane projections (... x T*B)"""
+        bits = (projections > 0).reshape(*projections.shape[:-1], self.n_tables, self.n_bits)
+        return bits @ self.weights
+
+    def mark_dirty(self, row: int):
+        """Record a row whose buckets may no longer match the tables"""
+        self.dirty.add(row)
+
+    def candidates(self, query: np.ndarray, kin_threshold: float) -> Optional[np.ndarray]:
+        """
+        Rows sharing a probed bucket with the query, in network order.
+
+        An approximation: kin outside every probed bucket are missed.
+        Returns None when the threshold is too loose for hashing to help.
+        """
+        if kin_threshold <= 0:
+            return None
+        if not query.any():
+            return np.empty(0, dtype=np.int64)
+
+        projections = (query @ self.planes.T).reshape(self.n_tables, self.n_bits)
+        keys = self._keys(projections.ravel())
+        parts = [np.fromiter(self.dirty, dtype=np.int64, count=len(self.dirty))]
+        for table, (order, bucket_keys, starts, ends) in enumerate(self.tables):
+            flips = np.argsort(np.abs(projections[table]))[:self.probes]
+            probed = np.concatenate(([keys[table]], keys[table] ^ self.weights[flips]))
+            pos = np.searchsorted(bucket_keys, probed)
+            pos = pos[pos < len(bucket_keys)]
+            pos = pos[np.isin(bucket_keys[pos], probed)]
+            parts.extend(order[starts[p]:ends[p]] for p in pos)
+        return np.unique(np.concatenate(parts))
+
+    def shortlist(self, query: np.ndarray, low: float,
+                  high: float) -> Optional[Tuple[np.ndarray, np.ndarray, int]]:
+        """As _SphereGridIndex.shortlist; the owner checks every candidate"""
+        rows = self.candidates(query, low)
+        return None if rows is None else (np.empty(0, dtype=np.int64), rows, 0)
+
+
+def _block_cone(units: np.ndarray) -> Tuple[Optional[np.ndarray], float]:
+    """
+    Cone around a block's mean direction that holds every nonzero row.
+
+    Returns (axis, half_angle), or (None, 0) for a block of zero rows.
+    Rows whose directions cancel out get a cone covering the whole sphere.
+    """
+    live = units[units.any(axis=1)]
+    axis = _unit_rows(live.sum(axis=0))
+    if not axis.any():
+        return (None, 0.0) if not len(live) else (live[0], np.pi)
+    return axis, float(np.arccos(np.clip((live @ axis).min(), -1.0, 1.0)))
+
+
+def _locality_order(units: np.ndarray, block: int) -> np.ndarray:
+    """
+    Permutation that groups nearby directions into the same block.
+
+    Recursively splits the rows at a block-aligned position along the
+    coordinate with the widest spread (a k-d tree build), so every run
+    of `block` consecutive rows covers a compact patch of the sphere
+    and its bounding cone stays narrow.
+    """
+    order = np.arange(len(units))
+    pending = [(0, len(units))]
+    while pending:
+        lo, hi = pending.pop()
+        if hi - lo <= block:
+            continue
+        segment = order[lo:hi]
+        points = units[segment]
+        axis = np.argmax(points.max(axis=0) - points.min(axis=0))
+        mid = block * -(-(hi - lo) // (2 * block))
+        order[lo:hi] = segment[np.argpartition(points[:, axis], mid)]
+        pending += [(lo, lo + mid), (lo + mid, hi)]
+    return order
+
+
+def _similarity_tiles(units: np.ndarray, rows: np.ndarray, block: int,
+                      floors: Optional[np.ndarray] = None,
+                      diagonal: Optional[bool] = None,
+                      shard: Optional[Tuple[int, int]] = None,
+                      tally=None, quant: Optional[tuple] = None):
+    """
+    Walk the upper triangle of the cosine similarity matrix of units.
+
+    Yields (tile_rows, tile_cols, tile, diagonal): tile holds the
+    similarities of the rows tile_rows against tile_cols (row ids into
+    units). Diagonal tiles (tile_rows is tile_cols) still contain the
+    self and lower-triangle entries; callers mask those out.
+
+    rows restricts the walk to those rows, in the order given.
+    floors gives, per row, the similarity a pair must reach to matter
+    to that row; tiles where no pair can reach the floor of either side
+    are skipped. Every block is bounded by a cone around its mean
+    direction, and two cones further apart than their radii plus
+    arccos(floor) cannot produce such a pair. floors is read lazily, so
+    callers may raise it while the walk progresses. Pass rows in a
+    spatially coherent order (see _locality_order) to make the pruning
+    bite. diagonal=True/False restricts the walk to diagonal/off-diagonal
+    tiles. shard=(index, count) keeps only every count-th block row,
+    starting at index, so count shards together cover every tile once.
+    tally, if given, is called as tally(counter, n) for the tiles and
+    similarities computed and the tiles pruned.
+
+    With quant = (scales, errors, intents), units holds quantized codes
+    (see _quantize). Each block is then dequantized to the dtype of the
+    raw intents as the walk reaches it, tiles hold approximate
+    similarities, and pruning allows for the rows' errors.
+    """
+    units = units[rows]
+    starts = range(0, len(rows), block)
+    if quant is None:
+        def block_of(r0):
+            return units[r0:r0 + block]
+    else:
+        scales, errors = quant[0][rows], quant[1][rows]
+        slack = _quantization_slack(units.shape[1])
+        dtype = quant[2].dtype  # That of the raw intents, as at full precision
+
+        def block_of(r0):
+            return _dequantize(units[r0:r0 + block], scales[r0:r0 + block], dtype)
+
+    if floors is not None:
+        # Zero rows never reach a positive similarity, so they are
+        # left out of the cones; an all-zero block is skipped outright
+        cones = [_block_cone(block_of(r0)) for r0 in starts]
+        if quant is not None:
+            block_errors = [float(errors[r0:r0 + block].max()) for r0 in starts]
+
+    for bi, r0 in enumerate(starts):
+        if shard is not None and bi % shard[1] != shard[0]:
+            continue
+        block_rows = block_of(r0)
+        for bj, c0 in enumerate(starts[bi:], bi):
+            if diagonal is not None and diagonal != (bi == bj):
+                continue
+            if floors is not None:
+                floor = min(floors[rows[r0:r0 + block]].min(),
+                            floors[rows[c0:c0 + block]].min())
+                if quant is not None:
+                    ei, ej = block_errors[bi], block_errors[bj]
+                    floor -= ei + ej + ei * ej + slack
+                (ci, ri), (cj, rj) = cones[bi], cones[bj]
+                if floor > 0:
+                    if ci is None or cj is None:
+                        continue
+                    gap = np.arccos(np.clip(ci @ cj, -1.0, 1.0))
+                    if gap - ri - rj > np.arccos(min(floor, 1.0)):
+                        if tally is not None:
+                            tally("tiles_pruned", 1)
+                        continue
+            tile = block_rows @ (block_rows if bi == bj else block_of(c0)).T
+            if tally is not None:
+                tally("tiles", 1)
+                tally("similarities", tile.size)
+            yield rows[r0:r0 + block], rows[c0:c0 + block], tile, bi == bj
+
+
+def _kin_mask_tiles(units: np.ndarray, kin: np.ndarray, stranger: np.ndarray,
+                    rows: np.ndarray, block: int,
+                    diagonal: Optional[bool] = None,
+                    floors: Optional[np.ndarray] = None,
+                    shard: Optional[Tuple[int, int]] = None,
+                    tally=None, quant: Optional[tuple] = None):
+    """
+    Like _similarity_tiles, with each tile's kin mask attached.
+
+    Yields (tile_rows, tile_cols, tile, mask) where mask marks each
+    unordered pair once when it falls in the kin band of whichever of
+    the two rows comes first. diagonal, floors (default: the kin
+    thresholds), shard, tally and quant are passed through to
+    _similarity_tiles. Quantized tiles are re-scored around the kin and
+    stranger thresholds while masking (see _quantized_kin_mask), so the
+    mask matches full precision exactly.
+    """
+    # With one pair of thresholds for every row, tiles compare against
+    # scalars instead of building per-pair threshold matrices
+    uniform = not len(rows) or all(t[rows].min() == t[rows].max() for t in (kin, stranger))
+
+    for tile_rows, tile_cols, tile, on_diagonal in _similarity_tiles(
+            units, rows, block, kin if floors is None else floors, diagonal, shard,
+            tally, quant):
+        # Kinship is judged by the first mage's thresholds
+        if uniform:
+            low, high = kin[tile_rows[0]], stranger[tile_rows[0]]
+        else:
+            first = tile_rows[:, None] < tile_cols[None, :]
+            low = np.where(first, kin[tile_rows, None], kin[None, tile_cols])
+            high = np.where(first, stranger[tile_rows, None], stranger[None, tile_cols])
+        if quant is not None:
+            mask, rescored = _quantized_kin_mask(tile, tile_rows, tile_cols, low, high,
+                                                 quant, on_diagonal)
+            if tally is not None:
+                tally("rescored", rescored)
+        else:
+            mask = (tile >= low) & (tile < high)
+            if on_diagonal:
+                mask &= np.triu(np.ones(mask.shape, dtype=bool), 1)
+        yield tile_rows, tile_cols, tile, mask
+
+
+def _kin_pair_tiles(units: np.ndarray, kin: np.ndarray, stranger: np.ndarray,
+                    rows: np.ndarray, block: int,
+                    floors: Optional[np.ndarray] = None,
+                    shard: Optional[Tuple[int, int]] = None,
+                    tally=None, quant: Optional[tuple] = None):
+    """
+    Yield the kin pairs of each similarity tile as parallel arrays.
+
+    Each item is (rows, cols, similarities) for kin pairs with
+    rows < cols. floors, shard, tally and quant are passed through to
+    _kin_mask_tiles.
+    """
+    for tile_rows, tile_cols, tile, mask in _kin_mask_tiles(
+            units, kin, stranger, rows, block, floors=floors, shard=shard,
+            tally=tally, quant=quant):
+        i, j = _mask_pairs(mask)
+        a, b = tile_rows[i], tile_cols[j]
+        yield np.minimum(a, b), np.maximum(a, b), tile[i, j]
+
+
+def _top_kin_pairs(tiles, kin: np.ndarray, floors: np.ndarray,
+                   k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The k best pairs streamed from kin pair tiles, best first.
+
+    Each tile's pairs are first cut against the current k-th best
+    similarity, then merged and trimmed back to k. Once the buffer is
+    full, floors (which the tiles read lazily) is raised to the k-th
+    best so tiles that cannot beat it are skipped without being computed.
+    """
+    rows = cols = np.empty(0, dtype=np.int64)
+    sims = np.empty(0)
+    for tile_rows, tile_cols, tile_sims in tiles:
+        if len(sims) == k:
+            keep = tile_sims >= sims[-1]
+            tile_rows, tile_cols, tile_sims = (
+                tile_rows[keep], tile_cols[keep], tile_sims[keep]
+            )
+        if not len(tile_sims):
+            continue
+
+        rows = np.concatenate((rows, tile_rows))
+        cols = np.concatenate((cols, tile_cols))
+        sims = np.concatenate((sims, tile_sims))
+        best = np.lexsort((cols, rows, -sims))[:k]
+        rows, cols, sims = rows[best], cols[best], sims[best]
+        if len(sims) == k:
+            np.maximum(kin, sims[-1], out=floors)
+    return rows, cols, sims
+
+
+def _sibling(name: str, filename: str):
+    """
+    A module kept next to this file, such as echo-mage-shards.py, whose
+    file name is not a valid module name. Loaded once, then found by
+    name - also in forked worker processes.
+    """
+    module = sys.modules.get(name)
+    if module is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def _shared_quant(arrays: dict) -> Optional[tuple]:
+    """The quantization arrays a job was given, if the units are quantized"""
+    if "scales" not in arrays:
+        return None
+    return arrays["scales"], arrays["errors"], arrays["intents"]
+
+
+def _pairing_shard(arrays: dict, task: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Job: the kin pairs of one shard, or its k best if task["k"] is set"""
+    kin = arrays["kin"]
+    floors = kin.copy() if task["k"] is not None else None
+    tiles = _kin_pair_tiles(arrays["units"], kin, arrays["stranger"], arrays["rows"],
+                            task["block"], floors, task["shard"], quant=_shared_quant(arrays))
+    if task["k"] is not None:
+        return _top_kin_pairs(tiles, kin, floors, task["k"])
+    tiles = list(tiles)
+    if not tiles:
+        return (np.empty(0, dtype=np.int64),) * 2 + (np.empty(0),)
+    return tuple(np.concatenate(a) for a in zip(*tiles))
+
+
+def _roots(parent: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Union-find roots of the elements x, compressing their paths"""
+    roots = parent[x]
+    while True:
+        up = parent[roots]
+        if (up == roots).all():
+            break
+        roots = up
+    parent[x] = roots
+    return roots
+
+
+def _union_pairs(parent: np.ndarray, a: np.ndarray, b: np.ndarray):
+    """
+    Merge the sets of every pair (a[k], b[k]) in a union-find forest.
+
+    Roots are always hooked under the smaller root, so each set's root
+    is its smallest element. Hooks that collide in one vectorized write
+    simply go round again.
+    """
+    while len(a):
+        a, b = _roots(parent, a), _roots(parent, b)
+        differ = a != b
+        a, b = np.minimum(a[differ], b[differ]), np.maximum(a[differ], b[differ])
+        parent[b] = a
+
+
+def _clan_forest(tiles, n: int) -> np.ndarray:
+    """Union-find parents of n rows joined by every pair in kin pair tiles"""
+    parent = np.arange(n)
+    for rows, cols, _ in tiles:
+        _union_pairs(parent, rows, cols)
+    return parent
+
+
+def _clan_shard(arrays: dict, task: dict) -> np.ndarray:
+    """Job: the union-find forest of one shard's kin pairs"""
+    tiles = _kin_pair_tiles(arrays["units"], arrays["kin"], arrays["stranger"],
+                            arrays["rows"], task["block"], shard=task["shard"],
+                            quant=_shared_quant(arrays))
+    return _clan_forest(tiles, len(arrays["units"]))
+
+
+def _first_seen_labels(labels: np.ndarray) -> np.ndarray:
+    """Renumber labels 0, 1, ... in order of first appearance"""
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    return np.argsort(np.argsort(first))[inverse.ravel()]
+
+
+def _propagate_labels(rows: np.ndarray, cols: np.ndarray, sims: np.ndarray,
+                      n: int, max_rounds: int) -> np.ndarray:
+    """
+    Weighted label propagation over an undirected link list.
+
+    Every mage starts in its own community and repeatedly adopts the
+    label with the largest summed similarity among its links, keeping
+    its own label on ties and otherwise preferring the smaller one.
+    Even and odd rows update in alternate half-rounds, which keeps the
+    synchronous updates from oscillating.
+    """
+    labels = np.arange(n)
+    if not len(sims):
+        return labels  # No links: everyone stays in its own community
+    src = np.concatenate((rows, cols))
+    dst = np.concatenate((cols, rows))
+    weights = np.concatenate((sims, sims))
+    for round_ in range(2 * max_rounds):
+        keys, inverse = np.unique(src * n + labels[dst], return_inverse=True)
+        scores = np.bincount(inverse.ravel(), weights)
+        node, label = keys // n, keys % n
+        order = np.lexsort((label, label != labels[node], -scores, node))
+        best = order[np.r_[True, node[order][1:] != node[order][:-1]]]
+
+        update = node[best] % 2 == round_ % 2
+        changed = labels[node[best][update]] != label[best][update]
+        labels[node[best][update]] = label[best][update]
+        if not changed.any() and round_ % 2:
+            break
+    return labels
+
+
+def _similarity_counts(tiles, cuts: np.ndarray, sketch_bins: int,
+                       bins: Optional[int] = None, quant: Optional[tuple] = None,
+                       tally=None):
+    """
+    Stream upper-triangle similarity tiles into pair counts.
+
+    Returns (pairs, pairs with similarity >= each cut, sketch_bins-bin
+    histogram over [-1, 1], sum of all similarities, bins-bin histogram
+    or None). Diagonal tiles only contribute their strict upper triangle.
+    Quantized tiles (quant as in _similarity_tiles) are re-scored around
+    the cuts first, so the counts against them are exact.
+    """
+    pairs = 0
+    at_least = np.zeros(len(cuts), dtype=np.int64)
+    sketch = np.zeros(sketch_bins, dtype=np.int64)
+    histogram = np.zeros(bins, dtype=np.int64) if bins else None
+    total = 0.0
+    for tile_rows, tile_cols, tile, on_diagonal in tiles:
+        if quant is not None:
+            rescored = _rescore_near_cuts(tile, tile_rows, tile_cols, cuts, quant, on_diagonal)
+            if tally is not None:
+                tally("rescored", rescored)
+        values = tile[np.triu_indices(len(tile), 1)] if on_diagonal else tile.ravel()
+        values = values.astype(np.float64, copy=False)
+        pairs += len(values)
+        at_least += [np.count_nonzero(values >= cut) for cut in cuts]
+        for counts in (sketch, histogram):
+            if counts is not None:
+                index = ((values + 1) * (len(counts) / 2)).astype(np.int64)
+                counts += np.bincount(np.clip(index, 0, len(counts) - 1),
+                                      minlength=len(counts))
+        total += float(values.sum())
+    return pairs, at_least, sketch, total, histogram
+
+
+def _similarity_counts_shard(arrays: dict, task: dict):
+    """Job: _similarity_counts over one shard's tiles"""
+    quant = _shared_quant(arrays)
+    tiles = _similarity_tiles(arrays["units"], arrays["rows"], task["block"],
+                              shard=task["shard"], quant=quant)
+    return _similarity_counts(tiles, task["cuts"], task["sketch_bins"], task["bins"], quant)
+
+
+def _batch_kin_hits(queries: np.ndarray, kin: np.ndarray, stranger: np.ndarray, pool,
+                    block: int, tally=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The kin of each seeker - a unit query row with its thresholds -
+    among the unit rows of pool (an array or _RowReader), computed
+    block x block tiles at a time. Returns (seeker positions, pool
+    positions), in order of seeker block, then pool block.
+    """
+    hits_q, hits_c = [], []
+    for q0 in range(0, len(queries), block):
+        low = kin[q0:q0 + block, None]
+        high = stranger[q0:q0 + block, None]
+        for c0 in range(0, len(pool), block):
+            tile = queries[q0:q0 + block] @ pool[c0:c0 + block].T
+            if tally is not None:
+                tally("similarities", tile.size)
+            i, j = _mask_pairs((tile >= low) & (tile < high))
+            hits_q.append(i + q0)
+            hits_c.append(j + c0)
+    if not hits_q:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(hits_q), np.concatenate(hits_c)
+
+
+def _batch_resonance(queries: np.ndarray, own: np.ndarray,
+                     units, intents) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Similarities of unit query rows to every row of the units reader,
+    and distances of the seekers' own intents to every row of intents
+    """
+    tile = np.empty((len(queries), len(units)), dtype=np.result_type(queries.dtype, units.dtype))
+    distances = np.empty((len(queries), len(units)))
+    # Members are read a chunk at a time, for every seeker
+    for start, rows in units.chunks():
+        tile[:, start:start + len(rows)] = queries @ rows.T
+    for start, rows in intents.chunks():
+        for distance, intent in zip(distances, own):
+            distance[start:start + len(rows)] = np.linalg.norm(rows - intent, axis=1)
+    return tile, distances
+
+
+def _shared_reader(arrays: dict, column: str, chunk: int) -> '_RowReader':
+    """
+    A shard job's view of the live members, in network order: their
+    full-precision unit rows, or with column "intents" their raw intents
+    """
+    rows = np.sort(arrays["rows"])  # The live rows, in locality order
+    if column == "intents":
+        read = arrays["intents"].__getitem__
+    elif "scales" in arrays:
+        def read(positions):
+            return _unit_rows(arrays["intents"][positions])
+    else:
+        read = arrays["units"].__getitem__
+    source = arrays.get("intents", arrays["units"])
+    return _RowReader(read, rows, len(rows), source.shape[1], source.dtype, chunk)
+
+
+def _sense_kin_shard(arrays: dict, task: dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Job: _batch_kin_hits of one part of the seekers among the members"""
+    pool = _shared_reader(arrays, "units", task["chunk"])
+    seekers, candidates = _batch_kin_hits(task["queries"], task["kin"], task["stranger"],
+                                          pool, task["tile"])
+    return seekers + task["start"], candidates
+
+
+def _resonance_columns_shard(arrays: dict, task: dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Job: _batch_resonance of one part of the seekers against the members"""
+    return _batch_resonance(task["queries"], task["own"],
+                            _shared_reader(arrays, "units", task["chunk"]),
+                            _shared_reader(arrays, "intents", task["chunk"]))
+
+
+def _top_links_per_vertex(rows: np.ndarray, cols: np.ndarray, sims: np.ndarray,
+                          per_vertex: int, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep the links that are among the per_vertex best of either endpoint.
+
+    Returns (keep, cutoff): a mask over the links, and for each of the n
+    vertices the similarity of its per_vertex-th best link (-inf while it
+    has fewer). A new link can only matter to a vertex if it beats that.
+    """
+    ends = np.concatenate((rows, cols))
+    links = np.tile(np.arange(len(sims)), 2)
+    # Group by vertex, best first: sort by similarity, then by vertex on
+    # unique integer keys, which orders like a lexsort in far less time
+    order = np.argsort(-sims[links], kind="stable")
+    order = order[np.argsort(ends[order] * len(order) + np.arange(len(order)))]
+    grouped = ends[order]
+    starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+    rank = np.arange(len(grouped)) - np.repeat(starts, np.diff(np.r_[starts, len(grouped)]))
+
+    keep = np.zeros(len(sims), dtype=bool)
+    keep[links[order[rank < per_vertex]]] = True
+    cutoff = np.full(n, -np.inf)
+    last = order[rank == per_vertex - 1]
+    cutoff[ends[last]] = sims[links[last]]
+    return keep, cutoff
+
+
+def _prune_links(rows: np.ndarray, cols: np.ndarray, sims: np.ndarray,
+                 pending: list, per_vertex: int, n: int, cutoff: np.ndarray):
+    """
+    Merge pending (rows, cols, sims) chunks into a link buffer and prune it
+    with _top_links_per_vertex, updating cutoff in place.
+    """
+    chunks = list(zip(*pending)) or [(), (), ()]
+    rows, cols, sims = (np.concatenate((old, *new))
+                        for old, new in zip((rows, cols, sims), chunks))
+    # Links below the cutoff of both endpoints are out whatever else
+    # the buffer holds; dropping them first keeps the sort small
+    alive = (sims >= cutoff[rows]) | (sims >= cutoff[cols])
+    rows, cols, sims = rows[alive], cols[alive], sims[alive]
+    keep, cutoff[:] = _top_links_per_vertex(rows, cols, sims, per_vertex, n)
+    return rows[keep], cols[keep], sims[keep]
+
+
+def _greedy_matching(rows: np.ndarray, cols: np.ndarray, sims: np.ndarray) -> np.ndarray:
+    """
+    Greedy one-to-one matching: take links strongest first (ties in row,
+    column order) while both endpoints are free. Returns chosen link ids.
+    """
+    order = np.lexsort((cols, rows, -sims))
+    taken = set()
+    chosen = []
+    for link, i, j in zip(order.tolist(), rows[order].tolist(), cols[order].tolist()):
+        if i not in taken and j not in taken:
+            taken.add(i)
+            taken.add(j)
+            chosen.append(link)
+    return np.array(chosen, dtype=np.int64)
+
+
+class _LazyMageList:
+    """
+    Read-only stand-in for ResonanceNetwork.mages after opening a snapshot.
+
+    Names sit in one UTF-8 blob with offsets; an EchoMage is only built
+    (homed on the network's existing row) the first time it is accessed,
+    and then cached so every access returns the same object. The network
+    swaps it for a plain list before its membership changes.
+    """
+
+    def __init__(self, network: 'ResonanceNetwork', name_blob: np.ndarray,
+                 name_offsets: np.ndarray):
+        self._network = network
+        self._blob = name_blob
+        self._offsets = name_offsets
+        self._cache: List[Optional[EchoMage]] = [None] * (len(name_offsets) - 1)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[row] for row in range(*index.indices(len(self)))]
+        row = range(len(self))[index]
+        mage = self._cache[row]
+        if mage is None:
+            mage = self._cache[row] = EchoMage._homed(self._name(row), self._network, row)
+        return mage
+
+    def peek(self, row: int) -> EchoMage:
+        """The mage at row, built without caching it if not yet accessed"""
+        mage = self._cache[row]
+        if mage is None:
+            mage = EchoMage._homed(self._name(row), self._network, row)
+        return mage
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+    def _name(self, row: int) -> str:
+        return self._blob[self._offsets[row]:self._offsets[row + 1]].tobytes().decode()
+
+    def names(self) -> List[str]:
+        """Every member's name, without building the mages themselves"""
+        return [self._name(row) if mage is None else mage.name
+                for row, mage in enumerate(self._cache)]
+
+
+class _MemberView(SequenceABC):
+    """
+    Read-only view of some entries (a range or array of rows) of a member
+    list, or of all of them - however many there are - with rows None
+    """
+
+    def __init__(self, members, rows=None):
+        self._members = members
+        self._rows = rows if rows is None or isinstance(rows, range) else rows.tolist()
+
+    def __len__(self) -> int:
+        return len(self._members if self._rows is None else self._rows)
+
+    def __getitem__(self, index):
+        if self._rows is None:
+            if isinstance(index, slice):
+                return list(self._members[index])
+            return self._members[index]
+        if isinstance(index, slice):
+            return [self._members[row] for row in self._rows[index]]
+        return self._members[self._rows[index]]
+
+    def __iter__(self):
+        if self._rows is None:
+            return iter(self._members)
+        return (self._members[row] for row in self._rows)
+
+
+class _RowReader:
+    """
+    Array-like access to rows of a network that need not sit in memory
+    as one matrix, such as the full-precision units of a quantized
+    network, recomputed from its memory-mapped raw intents.
+
+    Slicing by position reads just those rows with read(rows), taking
+    rows from the given index array (None: every used row, in order).
+    chunks() walks all of them chunk rows at a time.
+    """
+
+    def __init__(self, read, rows: Optional[np.ndarray], count: int,
+                 dimensions: int, dtype, chunk: int):
+        self._read = read
+        self._rows = rows
+        self.shape = (count, dimensions)
+        self.dtype = np.dtype(dtype)
+        self.chunk = chunk
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, positions: slice) -> np.ndarray:
+        positions = slice(*positions.indices(len(self)))
+        return self._read(positions if self._rows is None else self._rows[positions])
+
+    def chunks(self):
+        """Yield (start, rows) for consecutive runs of chunk rows"""
+        for start in range(0, len(self), self.chunk):
+            yield start, self[start:start + self.chunk]
+
+    def map(self, function) -> np.ndarray:
+        """function(rows) of every chunk, concatenated"""
+        parts = [function(rows) for _, rows in self.chunks()]
+        return np.concatenate(parts) if parts else np.empty(0)
+
+
+def _instrumented(method):
+    """Run a public ResonanceNetwork method as a span when instrumented"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instruments = self.instruments
+        if instruments is None:
+            return method(self, *args, **kwargs)
+        with instruments.span(name):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _locked(method):
+    """Run a ResonanceNetwork mutator under the network's write lock"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class ResonanceNetwork:
     """
     Manages the complete network of EchoMages.
@@ -261,16 +1861,1022 @@ class ResonanceNetwork:
     This is the "Continuous Party" - all entities in resonance,
     with the system managing their interactions according to
     the Friggitelli Framework principles.
+
+    Every member's intent direction is mirrored into one contiguous
+    N x D matrix of unit rows, so all-pairs work runs as blocked
+    matrix products instead of per-pair Python calls. The running sum
+    of those rows is kept alongside, which makes coherence an O(1) read.
+
+    D is fixed by the first mage added: 3-D intents are held in float64,
+    longer embeddings in float32. All members must share it.
+
+    Members' thresholds, states and echo flags are held struct-of-arrays
+    style too. A mage's first network is its home: the slotted EchoMage
+    then only keeps its name and row, and its attributes are views into
+    these columns.
     """
 
-    def __init__(self):
-        self.mages: List[EchoMage] = []
+    #: Rows per tile in blocked all-pairs computations
+    block_size: int = 512
+
+    #: Cell side of the spatial kin index over unit intents
+    index_cell_size: float = 0.1
+
+    #: Fraction of tombstoned rows at which remove_mage squeezes them out
+    compact_ratio: float = 0.25
+
+    #: Directory for the file-backed raw intents of quantized networks;
+    #: None uses the system temp directory
+    intents_dir: Optional[str] = None
+
+    #: Processes sharing blocked all-pairs work; 1 keeps it in-process
+    workers: int = 1
+
+    #: Counters, latency histograms and spans; None disables them
+    instruments: Optional[NetworkInstruments] = None
+
+    def __init__(self, block_size: Optional[int] = None,
+                 workers: Optional[int] = None):
+        self.mages: List[EchoMage] = []  # Also resets the name index
         self.entanglements: dict = {}  # Track which mages have resonated
+        if block_size is not None:
+            self.block_size = block_size
+        if workers is not None:
+            self.workers = workers
+
+        self._guest_rows: dict = {}  # id(mage) -> row, for mages homed elsewhere
+        self._subscribers: list = []  # Entanglement change callbacks
+        self._tracking = False  # Whether entanglements follows the kin graph
+        self._index = None  # Kin index, built on first query
+        self._kin_search: Tuple[str, dict] = ("exact", {})
+        self._precision = "full"
+        self._allocate(3)
+
+        self._version = 0  # Of the last published snapshot
+        self._published: Optional[NetworkSnapshot] = None
+        self._shared = set()  # Columns (and "_members") a snapshot may still read
+        self._batch_depth = 0
+        self._write_lock = threading.RLock()
+        self._changes = 0  # Bumped by every write; stamps the shared shard arrays
+        self._shards = None  # SharedArrays of the worker processes, made on first use
+
+    def _allocate(self, dimensions: int):
+        """Reset the (empty) storage for intents of the given dimension"""
+        dtype = np.float64 if dimensions <= 3 else np.float32
+        self._intents = self._zeros("_intents", (16, dimensions), dtype)  # Grows by doubling
+        self._units = np.zeros((16, dimensions), dtype=PRECISIONS[self._precision] or dtype)
+        if self._precision != "full":
+            self._unit_scales = np.zeros(16, dtype=np.float32)
+            self._unit_errors = np.zeros(16, dtype=np.float32)
+        self._kin = np.zeros(16)
+        self._stranger = np.zeros(16)
+        self._states = np.zeros(16, dtype=np.int8)  # Codes into _state_names
+        self._state_names = list(STATES)
+        self._state_codes = {state: code for code, state in enumerate(STATES)}
+        self._echo = np.zeros(16, dtype=bool)
+        self._alive = np.zeros(16, dtype=bool)  # False for unused and tombstoned rows
+
+        # |sum(u)|^2 = sum(|u|^2) + 2 * sum_{i<j} cos_ij, so these two
+        # aggregates are all coherence needs
+        self._unit_sum = np.zeros(dimensions)
+        self._unit_sq_sum = 0.0
+        self._updates_since_resync = 0
+
+    def _reset(self, dimensions: int):
+        """Start an emptied network over with storage for another dimension"""
+        self.mages = []  # The old rows' tombstones go too
+        self._index = None
+        self._allocate(dimensions)
+
+    @_locked
+    def _state_code(self, state: str) -> int:
+        """
+        Code of a LexE state in this network's table, registering unknown
+        states; the codes column widens once they outgrow its dtype.
+        """
+        code = self._state_codes.get(state)
+        if code is None:
+            code = self._state_codes[state] = len(self._state_names)
+            self._state_names.append(state)
+            if code > np.iinfo(self._states.dtype).max:
+                # A new array, so snapshots keep reading the old one
+                self._states = self._states.astype(np.int16 if code <= 32767 else np.int32)
+                self._shared.discard("_states")
+        return code
+
+    @property
+    def dimensions(self) -> int:
+        """Number of components in every member's intent"""
+        return self._units.shape[1]
+
+    def _check_dimensions(self, intent: Intent):
+        """Raise ValueError unless the intent fits this network's storage"""
+        dimensions = len(intent.to_array())
+        if dimensions != self.dimensions:
+            raise ValueError(
+                f"intent has {dimensions} dimensions, network holds {self.dimensions}"
+            )
+
+    @property
+    def mages(self) -> Sequence[EchoMage]:
+        """
+        The members, in network order, as a read-only sequence.
+
+        Removed members leave tombstoned rows behind until they make up
+        compact_ratio of the rows; the view skips them. It is kept until
+        the membership next changes, so repeated access is O(1).
+        """
+        view = self._view
+        if view is None or view._members is not self._members:
+            rows = self._live_rows() if self._tombstones else None
+            view = self._view = _MemberView(self._members, rows)
+        return view
+
+    @mages.setter
+    def mages(self, members: List[EchoMage]):
+        self._members = members
+        self._names: Optional[dict] = None  # name -> row, built on first use
+        self._tombstones = 0
+        self._members_changed()
+
+    def _members_changed(self):
+        """Drop the cached views of the membership after it changed"""
+        self._view: Optional[_MemberView] = None
+        self._live_cache: Optional[np.ndarray] = None
+
+    def get(self, name: str, default: Optional[EchoMage] = None) -> Optional[EchoMage]:
+        """The member with the given name, or default; O(1)"""
+        row = self._name_index().get(name)
+        return default if row is None else self._members[row]
+
+    def contains(self, mage: Union[EchoMage, str]) -> bool:
+        """Whether a mage, or a mage of the given name, is a member; O(1)"""
+        if isinstance(mage, str):
+            return mage in self._name_index()
+        return self._row_of(mage) is not None
+
+    __contains__ = contains
+
+    def _live_count(self) -> int:
+        """Number of members, not counting tombstoned rows"""
+        return len(self._members) - self._tombstones
+
+    def _live_rows(self) -> np.ndarray:
+        """Rows of the members in network order, skipping tombstones (read-only)"""
+        rows = self._live_cache
+        if rows is None:
+            if not self._tombstones:
+                rows = np.arange(len(self._members))
+            else:
+                rows = np.flatnonzero(self._alive[:len(self._members)])
+            rows.flags.writeable = False
+            self._live_cache = rows
+        return rows
+
+    def _live(self):
+        """
+        Index picking the members' rows out of the used ones: a plain
+        slice while nothing is tombstoned, so no copy is made
+        """
+        return slice(None) if not self._tombstones else self._live_rows()
+
+    def _position_of(self, mage: EchoMage) -> Optional[int]:
+        """The mage's position in mages: its row, less the tombstones before it"""
+        row = self._row_of(mage)
+        if row is None or not self._tombstones:
+            return row
+        return int(np.searchsorted(self._live_rows(), row))
+
+    def _name_index(self) -> dict:
+        """name -> row of every live member, built on first use"""
+        if self._names is None:
+            members = self._members
+            if isinstance(members, _LazyMageList):
+                names = members.names()
+            else:
+                names = [None if mage is None else mage.name for mage in members]
+            self._names = {}
+            for row, name in enumerate(names):
+                if name is not None:
+                    self._names.setdefault(name, row)
+        return self._names
+
+    def _compact(self):
+        """
+        Squeeze tombstoned rows out of the columns, keeping member order.
 
+        Survivors are renumbered and the kin index is dropped, so one
+        compaction costs O(N) however many removals it absorbs;
+        remove_mage only runs it once compact_ratio of the rows are
+        tombstones.
+        """
+        members = self._members
+        keep = self._live_rows()
+        n = len(keep)
+        self._before_write()
+        for column in self._COLUMNS:
+            column = getattr(self, column)
+            column[:n] = column[keep]
+            column[n:len(members)] = 0
+
+        self._members = [members[row] for row in keep.tolist()]
+        self._tombstones = 0
+        self._members_changed()
+        self._names = {}
+        for row, member in enumerate(self._members):
+            if member._networks[0] is self:
+                member._row = row
+            else:
+                self._guest_rows[id(member)] = row
+            self._names.setdefault(member.name, row)
+        self._index = None
+
+    @_instrumented
+    @_locked
     def add_mage(self, mage: EchoMage):
-        """Add a mage to the network"""
-        self.mages.append(mage)
+        """
+        Add a mage to the network.
+
+        Raises ValueError if the mage, or another mage with the same
+        name, is already a member.
+        """
+        self._before_write(in_place=False)  # New rows lie beyond any snapshot
+        if not self._live_count() and len(mage.intent.to_array()) != self.dimensions:
+            self._reset(len(mage.intent.to_array()))
+        self._check_dimensions(mage.intent)
+
+        if self._row_of(mage) is not None:
+            raise ValueError(f"{mage.name} is already in the network")
+        names = self._name_index()
+        if mage.name in names:
+            raise ValueError(f"A mage named {mage.name} is already in the network")
+        self._thaw_mages()
+
+        row = len(self._members)
+        self._reserve(row + 1)
+
+        self._members.append(mage)
+        self._members_changed()
+        self._name_index()[mage.name] = row
+        self._intents[row] = mage._intent_array()
+        unit = _unit_rows(self._intents[row])
+        self._store_units(row, unit)
+        self._kin[row] = mage.kin_threshold
+        self._stranger[row] = mage.stranger_threshold
+        self._states[row] = self._state_code(mage.state)
+        self._echo[row] = mage.echo_activated
+        self._alive[row] = True
+        self._accumulate(unit, 1)
+        if self._index is not None:
+            self._index.mark_dirty(row)
+        if self._tracking:
+            self._entangle_rows(np.array([row]))
+
+        if mage._networks:
+            self._guest_rows[id(mage)] = row
+        else:
+            # This network becomes the mage's home; its private copies go
+            mage._row = row
+            mage._intent = mage._kin_threshold = mage._stranger_threshold = None
+            mage._state = mage._echo_activated = None
+        mage._networks += (self,)
+
+    #: Per-member column arrays, all indexed by row
+    _COLUMNS = ("_intents", "_units", "_kin", "_stranger", "_states", "_echo", "_alive")
+
+    #: Extra columns of quantized precisions: per-row scale and error
+    _QUANTIZED_COLUMNS = ("_unit_scales", "_unit_errors")
+
+    #: Columns written by an intent change
+    _INTENT_COLUMNS = ("_intents", "_units") + _QUANTIZED_COLUMNS
+
+    @_locked
+    def set_precision(self, mode: str = "full"):
+        """
+        Choose how unit intents are stored for all-pairs scans.
+
+        - "full": the intents' own dtype (float64 for 3-D, float32 beyond)
+        - "float16": half floats, a quarter of the float64 size
+        - "int8": 8-bit codes with a per-row scale, an eighth of float64
+
+        Raw intents stay at full precision either way, but a quantized
+        network keeps them in a temporary file (see intents_dir) that
+        is only read for re-scoring, so they do not stay resident. The
+        tile walks of find_optimal_pairings, match_pairings, find_clans
+        and similarity_report dequantize one block at a time, and kin_of
+        scans the codes in float32 one chunk of rows at a time. Every pair or member that lands
+        within its quantization error of a kin or stranger threshold is
+        re-scored from the raw intents, so kin decisions are exactly
+        those of "full"; a tile where that would touch too many pairs
+        is recomputed whole instead, which costs about one more tile.
+        Reported similarities of pairs away from the thresholds, and
+        similarity_report's histogram and quantiles, carry the
+        quantization error (about 1e-3 for int8); its threshold counts
+        are re-scored the same way and stay exact. Other queries read full-precision units
+        recomputed from the raw intents, also a chunk at a time, so no
+        query builds an N x D float matrix.
+        """
+        if mode not in PRECISIONS:
+            raise ValueError(f"Unknown precision: {mode}")
+        self._before_write()
+        capacity = len(self._units)
+        self._precision = mode
+        self._intents = self._copied("_intents")  # Into memory or out to a file
+        if mode == "full":
+            self._COLUMNS = ResonanceNetwork._COLUMNS
+            for column in self._QUANTIZED_COLUMNS:
+                vars(self).pop(column, None)
+        else:
+            self._COLUMNS = ResonanceNetwork._COLUMNS + self._QUANTIZED_COLUMNS
+            self._unit_scales = np.zeros(capacity, dtype=np.float32)
+            self._unit_errors = np.zeros(capacity, dtype=np.float32)
+        self._units = np.zeros((capacity, self.dimensions),
+                               dtype=PRECISIONS[mode] or self._intents.dtype)
+        intents = self._reader("intents", live=False)
+        for start, rows in intents.chunks():
+            self._store_units(slice(start, start + len(rows)), _unit_rows(rows))
+
+    @property
+    def precision(self) -> str:
+        """The storage mode chosen with set_precision"""
+        return self._precision
+
+    def _store_units(self, rows, units: np.ndarray):
+        """Write full-precision unit rows into the (maybe quantized) units column"""
+        if self._precision == "full":
+            self._units[rows] = units
+            return
+        codes, scales, errors = _quantize(np.atleast_2d(units), self._precision)
+        if units.ndim == 1:
+            codes, scales, errors = codes[0], scales[0], errors[0]
+        self._units[rows] = codes
+        self._unit_scales[rows] = scales
+        self._unit_errors[rows] = errors
+
+    def _exact_units(self, rows) -> np.ndarray:
+        """Full-precision unit rows, whatever the storage precision"""
+        if self._precision == "full":
+            return self._units[rows]
+        return _unit_rows(self._intents[rows])
+
+    def _approx_units(self, rows) -> np.ndarray:
+        """Unit rows as stored: dequantized to float32 when quantized"""
+        if self._precision == "full":
+            return self._units[rows]
+        return _dequantize(self._units[rows], self._unit_scales[rows])
+
+    def _reader(self, column: str = "units", live: bool = True) -> _RowReader:
+        """
+        The members' full-precision unit rows (or raw "intents"), in
+        network order, or with live=False every used row, tombstones
+        included. Read a chunk at a time, they never add up to a whole
+        N x D matrix in memory.
+        """
+        read = self._exact_units if column == "units" else self._intents.__getitem__
+        rows = self._live_rows() if live and self._tombstones else None
+        count = len(self._members) if rows is None else len(rows)
+        return _RowReader(read, rows, count, self.dimensions, self._intents.dtype,
+                          self._chunk_rows())
+
+    def _chunk_rows(self) -> int:
+        """Rows per chunk when streaming over members: about one block_size^2 tile"""
+        return max(self.block_size, self.block_size ** 2 // self.dimensions)
+
+    def _quant(self) -> Optional[tuple]:
+        """The quant argument of the tile walks, None at full precision"""
+        if self._precision == "full":
+            return None
+        n = len(self._members)
+        return self._unit_scales[:n], self._unit_errors[:n], self._intents[:n]
+
+    def _reserve(self, rows: int):
+        """Grow every column until it can hold the given number of rows"""
+        while len(self._units) < rows:
+            for column in self._COLUMNS:
+                setattr(self, column, self._copied(column, 2))
+                self._shared.discard(column)  # Snapshots keep the old array
+
+    def _zeros(self, column: str, shape: tuple, dtype) -> np.ndarray:
+        """
+        Zeroed storage for a column. Quantized networks only read their
+        raw intents to re-score, so those live in a file (see intents_dir).
+        """
+        if column == "_intents" and self._precision != "full":
+            return _mapped_zeros(shape, dtype, self.intents_dir)
+        return np.zeros(shape, dtype=dtype)
+
+    def _copied(self, column: str, growth: int = 1) -> np.ndarray:
+        """Copy of a column array, with growth times its capacity"""
+        array = getattr(self, column)
+        copy = self._zeros(column, (max(growth * len(array), 16),) + array.shape[1:], array.dtype)
+        copy[:len(array)] = array
+        return copy
+
+    def _count(self, name: str, n: int = 1):
+        if self.instruments is not None:
+            self.instruments.count(name, n)
+
+    def _span(self, name: str):
+        """A span for an inner phase, or a no-op when not instrumented"""
+        if self.instruments is None:
+            return nullcontext()
+        return self.instruments.span(name)
+
+    def _tally(self):
+        """The counter callback for tile walks, or None when not instrumented"""
+        return None if self.instruments is None else self.instruments.count
+
+    @contextmanager
+    def profile(self):
+        """
+        Capture a per-call profile of the network operations in the block.
+
+        Yields a list that receives one Span tree per top-level call made
+        on this thread, with nested phases, timings and counters. When
+        the network is not instrumented, a private NetworkInstruments is
+        attached for the duration of the block.
+        """
+        attached = "instruments" in vars(self)
+        previous = self.instruments
+        instruments = previous or NetworkInstruments()
+        self.instruments = instruments
+
+        calls = []
+        thread = threading.get_ident()
+
+        def collect(span: Span):
+            if span.depth == 0 and threading.get_ident() == thread:
+                calls.append(span)
+
+        instruments.subscribe(collect)
+        try:
+            yield calls
+        finally:
+            instruments.unsubscribe(collect)
+            if attached:
+                self.instruments = previous
+            else:
+                del self.instruments
+
+    def snapshot(self) -> 'NetworkSnapshot':
+        """
+        The current published version of the network, as an immutable
+        NetworkSnapshot that reader threads can query freely.
+
+        Taking one is O(1): its arrays are shared with the network until
+        the network next changes a row in place, which copies them first
+        (copy-on-write). Publishing a new version waits for the write
+        lock, so a snapshot never catches a change halfway. Inside
+        batch_updates this keeps returning the version from before the
+        batch.
+        """
+        published = self._published
+        if published is None:
+            with self._write_lock:
+                published = self._published or self._publish()
+        return published
+
+    @contextmanager
+    def batch_updates(self):
+        """
+        Group changes - drifts, additions, removals - into one version.
+
+        The batch holds the write lock that every single change also
+        takes, so writers are serialized. Readers calling snapshot()
+        meanwhile keep the previous version, and the new one replaces it
+        in a single assignment when the outermost batch ends.
+        """
+        with self._write_lock:
+            if not self._batch_depth:
+                self.snapshot()  # Pin the version readers see meanwhile
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._publish()
+
+    def _publish(self) -> 'NetworkSnapshot':
+        self._version += 1
+        self._shared = set(self._COLUMNS) | {"_members"}
+        self._published = NetworkSnapshot(self, self._version)
+        return self._published
+
+    def _before_write(self, in_place: bool = True, columns: Optional[Tuple[str, ...]] = None):
+        """
+        Prepare the storage for a change.
+
+        Outside a batch, the published snapshot goes stale. Changes to
+        existing rows (in_place) first copy whichever of the columns
+        they write a snapshot may still be reading - all of them, and
+        the member list, unless columns names the only ones written.
+        Appended rows lie beyond every snapshot's end.
+        """
+        self._changes += 1
+        if not self._batch_depth:
+            self._published = None
+        if in_place and self._shared:
+            for column in self._COLUMNS if columns is None else columns:
+                if column in self._shared:
+                    setattr(self, column, self._copied(column))
+                    self._shared.discard(column)
+            if columns is None and "_members" in self._shared:
+                if isinstance(self._members, list):
+                    self._members = list(self._members)
+                self._shared.discard("_members")
+
+    def _thaw_mages(self):
+        """Turn a snapshot's lazy member list into a plain, mutable one"""
+        if not isinstance(self._members, list):
+            self._members = list(self._members)
+
+    def _row_of(self, mage: EchoMage) -> Optional[int]:
+        """The mage's row in this network, or None if it is not a member"""
+        if mage._networks and mage._networks[0] is self:
+            return mage._row
+        return self._guest_rows.get(id(mage))
+
+    @_locked
+    def _write_member(self, mage: EchoMage, column: str, value):
+        """Store one attribute of a member in its column"""
+        self._before_write(columns=(column,))
+        row = self._row_of(mage)
+        getattr(self, column)[row] = value
+        if self._tracking and column in ("_kin", "_stranger"):
+            self._entangle_rows(np.array([row]))
+
+    @_instrumented
+    @_locked
+    def remove_mage(self, mage: Union[EchoMage, str]):
+        """
+        Remove a mage, or the mage with the given name, from the network.
+
+        Its row is zeroed and tombstoned in O(1), and the kin index only
+        learns to skip it. Once compact_ratio of the rows are tombstones
+        they are squeezed out in one pass, later members shifting down
+        to keep network order. Raises ValueError if the mage is not a
+        member.
+        """
+        if isinstance(mage, str):
+            name, mage = mage, self.get(mage)
+            if mage is None:
+                raise ValueError(f"{name} is not in the network")
+        row = self._row_of(mage)
+        if row is None:
+            raise ValueError(f"{mage.name} is not in the network")
+        self._before_write()
+        self._thaw_mages()
+        if self._tracking:
+            for other, similarity in list(self.entanglements.get(mage.name, {}).items()):
+                self._unlink(mage.name, other, similarity)
+
+        if mage._networks[0] is self:
+            # Moving out of its home: the next network takes over, or
+            # the mage gets its private copies back
+            if len(mage._networks) > 1:
+                mage._row = mage._networks[1]._guest_rows.pop(id(mage))
+            else:
+                mage._intent = _make_intent(self._intents[row].tolist())
+                mage._kin_threshold = float(self._kin[row])
+                mage._stranger_threshold = float(self._stranger[row])
+                mage._state = self._state_names[self._states[row]]
+                mage._echo_activated = bool(self._echo[row])
+                mage._row = -1
+        else:
+            del self._guest_rows[id(mage)]
+        mage._networks = tuple(network for network in mage._networks
+                               if network is not self)
+
+        del self._name_index()[mage.name]  # Before the row reads as a tombstone
+        unit = self._exact_units(row).copy()  # Not a view of the row zeroed below
+        for column in self._COLUMNS:
+            getattr(self, column)[row] = 0
+        self._members[row] = None
+        self._tombstones += 1
+        self._members_changed()
+        self._accumulate(unit, -1)
+        if self._tombstones > self.compact_ratio * len(self._members):
+            self._compact()  # Drops the kin index too: row ids shift
+        elif self._index is not None:
+            self._index.mark_dirty(row)
+
+    @_locked
+    def _update_intent(self, mage: EchoMage, intent: np.ndarray):
+        """Store the new intent of a member and refresh its direction"""
+        self._before_write(columns=self._INTENT_COLUMNS)
+        row = self._row_of(mage)
+        unit = _unit_rows(intent)
+        replaced = self._exact_units(row).copy()  # Not a view of the row overwritten below
+        self._intents[row] = intent
+        self._store_units(row, unit)
+        self._accumulate(unit, 1, replaces=replaced)
+        if self._index is not None:
+            self._index.mark_dirty(row)
+        if self._tracking:
+            self._entangle_rows(np.array([row]))
+
+    @_locked
+    def track_entanglements(self):
+        """
+        Keep entanglements equal to the kin graph from now on.
+
+        entanglements becomes {name: {kin name: similarity}}, holding an
+        edge for every pair find_optimal_pairings would report; mages
+        without kin are left out. It is built once with the blocked tile
+        walk, then maintained incrementally: adding a mage or changing
+        its intent or thresholds only recomputes that mage's row, and
+        removal only drops its edges.
+        """
+        self.entanglements = {}
+        for rows, cols, sims in self._iter_kin_pair_tiles():
+            for a, b, similarity in zip(rows.tolist(), cols.tolist(), sims.tolist()):
+                self._link(self._members[a].name, self._members[b].name, similarity,
+                           notify=False)
+        self._tracking = True
+
+    def subscribe(self, callback):
+        """
+        Call callback(event, name_a, name_b, similarity) on every
+        entanglement change, with event "edge-added" or "edge-removed".
+
+        Starts tracking the kin graph (see track_entanglements) if it
+        is not tracked yet.
+        """
+        if not self._tracking:
+            self.track_entanglements()
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stop sending entanglement changes to callback"""
+        self._subscribers.remove(callback)
+
+    def _link(self, a: str, b: str, similarity: float, notify: bool = True):
+        self.entanglements.setdefault(a, {})[b] = similarity
+        self.entanglements.setdefault(b, {})[a] = similarity
+        if notify:
+            for callback in self._subscribers:
+                callback("edge-added", a, b, similarity)
+
+    def _unlink(self, a: str, b: str, similarity: float):
+        for x, y in ((a, b), (b, a)):
+            del self.entanglements[x][y]
+            if not self.entanglements[x]:
+                del self.entanglements[x]
+        for callback in self._subscribers:
+            callback("edge-removed", a, b, similarity)
+
+    def _entangle_rows(self, rows: np.ndarray):
+        """
+        Bring the edges of the given members up to date.
+
+        Each row's similarities to all members are recomputed; the kin
+        rule is that of the pairings, judged by the thresholds of
+        whichever mage comes first in the network. Rows are processed in
+        chunks so a chunk's similarities fit in one block_size^2 tile.
+        Tombstoned rows are skipped.
+        """
+        n = len(self._members)
+        units = self._reader(live=False)
+        kin, stranger = self._thresholds()
+        chunk = max(1, self.block_size ** 2 // max(n, 1))
+        for c0 in range(0, len(rows), chunk):
+            part = rows[c0:c0 + chunk]
+            queries = self._exact_units(part)
+            tiles = np.concatenate([queries @ block.T for _, block in units.chunks()], axis=1)
+            self._count("similarities", tiles.size)
+            for row, sims in zip(part.tolist(), tiles):
+                before = np.arange(n) < row
+                low = np.where(before, kin, kin[row])
+                high = np.where(before, stranger, stranger[row])
+                hits = np.flatnonzero((sims >= low) & (sims < high))
+                hits = hits[(hits != row) & self._alive[hits]]
+
+                name = self._members[row].name
+                old = self.entanglements.get(name, {})
+                new = {self._members[j].name: float(sims[j]) for j in hits.tolist()}
+                for other in [other for other in old if other not in new]:
+                    self._unlink(name, other, old[other])
+                for other, similarity in new.items():
+                    if other in old:
+                        self._link(name, other, similarity, notify=False)
+                    else:
+                        self._link(name, other, similarity)
+
+    def _accumulate(self, unit: np.ndarray, sign: int,
+                    replaces: Optional[np.ndarray] = None):
+        """
+        Add (sign=1) or retract (sign=-1) a unit row from the aggregates,
+        once the rows are stored. An intent change adds its new unit and
+        retracts the one it replaces in the same call, so a resync never
+        sees the aggregates halfway through it.
+        """
+        self._unit_sum += sign * unit
+        self._unit_sq_sum += sign * float(unit @ unit)
+        if replaces is not None:
+            self._unit_sum -= replaces
+            self._unit_sq_sum -= float(replaces @ replaces)
+
+        # Incremental updates slowly accumulate rounding error; resumming
+        # once per N updates keeps the cost amortized O(1)
+        self._updates_since_resync += 1
+        if self._updates_since_resync > max(1024, len(self._members)):
+            self._resync_aggregates()
+
+    def _resync_aggregates(self):
+        """Recompute the coherence aggregates exactly, a chunk of rows at a time"""
+        unit_sum = np.zeros(self.dimensions)
+        unit_sq_sum = 0.0
+        # Tombstoned rows are zeroed, so they add nothing
+        for _, units in self._reader(live=False).chunks():
+            unit_sum += units.sum(axis=0, dtype=np.float64)
+            unit_sq_sum += float(np.einsum("ij,ij->", units, units, dtype=np.float64))
+        self._unit_sum = unit_sum
+        self._unit_sq_sum = unit_sq_sum
+        self._updates_since_resync = 0
+
+    def _unit_matrix(self) -> np.ndarray:
+        """
+        The N x D matrix of full-precision unit intent rows, one per used
+        row; tombstoned rows are zero
+        """
+        return self._exact_units(slice(0, len(self._members)))
+
+    def _similarities_to(self, mage: EchoMage) -> np.ndarray:
+        """Cosine similarity of every member to the given mage, in network order"""
+        self._check_dimensions(mage.intent)
+        query = _unit_rows(mage.intent.to_array())
+        return self._reader().map(lambda units: units @ query)
+
+    def _distances_to(self, mage: EchoMage) -> np.ndarray:
+        """Euclidean intent distance of every member to the given mage, in network order"""
+        own = mage.intent.to_array()
+        return self._reader("intents").map(lambda intents: np.linalg.norm(intents - own, axis=1))
+
+    def set_kin_search(self, mode: str = "exact", **options):
+        """
+        Choose how kin_of (and so sense_kin on this network) searches.
+
+        - "exact": every kin is found. 3-D networks use the sphere grid
+          index, higher dimensions one matrix-vector product.
+        - "lsh": approximate random-hyperplane LSH, for high-dimensional
+          intents where exact indexes stop helping. Options are n_tables
+          (default 8), n_bits (12), probes (2) and seed (0); more tables
+          or probes trade speed for recall. Shortlisted members still
+          pass the exact kin_threshold/stranger_threshold check, so
+          results may miss kin but never include non-kin.
+
+        Use measure_kin_recall() to see what a setting costs in recall.
+        """
+        if mode not in ("exact", "lsh"):
+            raise ValueError(f"unknown kin search mode: {mode}")
+        if mode == "exact" and options:
+            raise TypeError("exact kin search takes no options")
+        self._kin_search = (mode, options)
+        self._index = None
+
+    def _kin_index(self):
+        """
+        The kin index for the configured search, rebuilt when too many
+        rows moved since the last build. None means a full scan: grid
+        buckets only pay off on the 3-D sphere, so exact search in other
+        dimensions is one matrix product.
+        """
+        mode, options = self._kin_search
+        if mode == "exact" and self.dimensions != 3:
+            return None
+        index = self._index
+        if index is None or len(index.dirty) > max(64, index.size // 16):
+            if mode == "lsh":
+                index = _HyperplaneLSHIndex(self._reader(live=False), **options)
+            else:
+                # Quantized networks keep no full-precision copy in the grid
+                index = _SphereGridIndex(self._unit_matrix(), self.index_cell_size,
+                                         keep_units=self._precision == "full")
+            self._index = index
+        return index
+
+    def _kin_rows(self, mage: EchoMage, index=None) -> np.ndarray:
+        """Rows in the kin band of the mage, shortlisted through index"""
+        self._check_dimensions(mage.intent)
+        query = _unit_rows(mage.intent.to_array())
+        low, high = mage.kin_threshold, mage.stranger_threshold
+        found = index.shortlist(query, low, high) if index else None
+        if found is None:
+            rows = self._kin_scan(query, low, high)
+        else:
+            hits, recheck, checked = found
+            self._count("kin_checks", checked)
+            # Grid hits come cell by cell; members are returned in network order
+            rows = np.sort(np.concatenate((hits, self._kin_scan(query, low, high, recheck))))
+        # Tombstoned rows are zero, so only a kin band around 0 takes them in
+        return rows[self._alive[rows]] if self._tombstones else rows
+
+    def _kin_scan(self, query: np.ndarray, low: float, high: float,
+                  rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """The given rows (default: all) whose similarity to query is in [low, high)"""
+        # A full scan reads the rows through a slice; fancy indexing
+        # would copy the whole matrix on every query
+        selected = slice(0, len(self._members)) if rows is None else rows
+
+        if self._precision == "full":
+            similarities = self._units[selected] @ query
+            self._count("kin_checks", len(similarities))
+            hits = np.flatnonzero((similarities >= low) & (similarities < high))
+            return hits if rows is None else rows[hits]
+
+        # Scan the codes chunk by chunk for rows within the worst row
+        # error of the band, then re-score only those that could sit on
+        # either side of a threshold; the query itself is exact
+        count = len(self._members) if rows is None else len(rows)
+        size = self._chunk_rows()
+        query32 = query.astype(np.float32)
+        slack = _quantization_slack(self.dimensions)
+        found = []
+        for start in range(0, count, size):
+            selected = (slice(start, min(start + size, count)) if rows is None
+                        else rows[start:start + size])
+            # Scaling the dot products instead of the codes keeps the
+            # float32 temporary to one chunk of codes
+            similarities = ((self._units[selected].astype(np.float32) @ query32)
+                            * self._unit_scales[selected])
+            self._count("kin_checks", len(similarities))
+            errors = self._unit_errors[selected]
+            bound = float(errors.max(initial=0)) + slack
+            positions = np.flatnonzero((similarities >= low - bound)
+                                       & (similarities < high + bound))
+            values = similarities[positions].astype(np.float64)
+            pair_bound = errors[positions] + slack
+            unsure = (np.abs(values - low) <= pair_bound) | (np.abs(values - high) <= pair_bound)
+            candidates = positions + start if rows is None else selected[positions]
+            values[unsure] = self._exact_units(candidates[unsure]) @ query
+            self._count("rescored", int(unsure.sum()))
+            found.append(candidates[(values >= low) & (values < high)])
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    @_instrumented
+    def kin_of(self, mage: EchoMage) -> List[EchoMage]:
+        """
+        All members within the kin band of the given mage.
+
+        Uses the mage's own thresholds, exactly like mage.is_kin, and
+        returns members in network order. For 3-D intents only the grid
+        cells around the mage's direction are examined, unless they hold
+        so many members that one scan of all is faster; see
+        set_kin_search for the approximate mode.
+        """
+        members = self._members
+        return [members[row] for row in self._kin_rows(mage, self._kin_index()).tolist()]
 
+    @_instrumented
+    def sense_kin_batch(self, seekers, candidates=None,
+                        block_size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        sense_kin for many seekers against one candidate pool at once.
+
+        seekers and candidates may be lists of mages or networks;
+        candidates defaults to this network's members. Each seeker's own
+        kin_threshold/stranger_threshold applies, as in mage.sense_kin.
+        The Q x M similarities are computed block_size x block_size
+        (default: block_size of the network) tiles at a time. Against
+        this network's members, more than one block of seekers is split
+        over the worker processes when workers is set.
+
+        Returns CSR-style (indptr, indices): the kin of seeker q are
+        candidates indices[indptr[q]:indptr[q + 1]], in candidate order.
+        """
+        block = block_size or self.block_size
+        queries, kin, stranger = self._batch_columns(seekers)
+        pool = self._batch_columns(self if candidates is None else candidates)[0]
+        if len(queries) and len(pool) and queries.shape[1] != pool.shape[1]:
+            raise ValueError(
+                f"seekers have {queries.shape[1]} dimensions, candidates {pool.shape[1]}"
+            )
+
+        if (candidates is None or candidates is self) and self._parallel_batch(len(queries)):
+            parts = self._seeker_parts(len(queries), queries=queries, kin=kin, stranger=stranger)
+            results = self._sharded(_sense_kin_shard, parts, tile=block, chunk=self._chunk_rows())
+            seeker_rows, indices = (np.concatenate(a) for a in zip(*results))
+            self._count("similarities", len(queries) * len(pool))
+        else:
+            seeker_rows, indices = _batch_kin_hits(queries, kin, stranger, pool, block,
+                                                   self._tally())
+        # Tiles come seeker block by candidate block, so a stable sort on
+        # the seeker keeps every seeker's kin in candidate order
+        indices = indices[np.argsort(seeker_rows, kind="stable")]
+        indptr = np.zeros(len(queries) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(seeker_rows, minlength=len(queries)), out=indptr[1:])
+        return indptr, indices
+
+    @_instrumented
+    def calculate_resonance_columns_batch(self, seekers: List[EchoMage]) -> List[ResonanceField]:
+        """
+        calculate_resonance_columns(network) for many seekers at once.
+
+        The similarities of a block_size batch of seekers to every member
+        come from one matrix product; each seeker's own thresholds then
+        classify its row. More than one block of seekers is split over
+        the worker processes when workers is set.
+        """
+        queries = self._batch_columns(seekers)[0]
+        if len(queries) and queries.shape[1] != self.dimensions:
+            raise ValueError(
+                f"seekers have {queries.shape[1]} dimensions, network holds {self.dimensions}"
+            )
+        names = np.array([mage.name for mage in self.mages], dtype=object)
+        own = np.array([seeker._intent_array() for seeker in seekers])
+        if self._parallel_batch(len(queries)):
+            parts = self._seeker_parts(len(queries), queries=queries, own=own)
+            results = self._sharded(_resonance_columns_shard, parts, intents=True,
+                                    chunk=self._chunk_rows())
+            batches = ((seekers[part["start"]:part["start"] + len(tile)], tile, distances)
+                       for part, (tile, distances) in zip(parts, results))
+        else:
+            units, intents = self._reader(), self._reader("intents")
+            block = self.block_size
+            batches = ((seekers[q0:q0 + block],
+                        *_batch_resonance(queries[q0:q0 + block], own[q0:q0 + block],
+                                          units, intents))
+                       for q0 in range(0, len(seekers), block))
+        fields = []
+        for batch, tile, distances in batches:
+            self._count("similarities", tile.size)
+            for seeker, similarities, distance in zip(batch, tile, distances):
+                fields.append(seeker._resonance_field(similarities, distance, names,
+                                                      self._position_of(seeker)))
+        return fields
+
+    @staticmethod
+    def _batch_columns(mages) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Unit rows and kin/stranger thresholds of a network or mage list.
+        A network's unit rows come as a _RowReader, to be sliced a block
+        at a time.
+        """
+        if isinstance(mages, ResonanceNetwork):
+            live = mages._live()
+            kin, stranger = mages._thresholds()
+            return mages._reader(), kin[live], stranger[live]
+        if not mages:
+            return np.empty((0, 3)), np.empty(0), np.empty(0)
+        units = _unit_rows(np.array([mage._intent_array() for mage in mages]))
+        kin = np.fromiter((mage.kin_threshold for mage in mages), dtype=float, count=len(mages))
+        stranger = np.fromiter((mage.stranger_threshold for mage in mages),
+                               dtype=float, count=len(mages))
+        return units, kin, stranger
+
+    def measure_kin_recall(self, queries: Optional[List[EchoMage]] = None,
+                           sample: int = 100, seed: int = 0) -> dict:
+        """
+        Compare the configured kin search against an exact scan.
+
+        Runs kin_of for the given query mages (default: a seeded random
+        sample of members) both ways and reports:
+        - recall: fraction of exact kin the configured search found
+        - candidates_per_query: mean shortlist size of the index
+        - exact_seconds / search_seconds: total time of each path
+        """
+        n = self._live_count()
+        if queries is None:
+            rng = np.random.default_rng(seed)
+            mages = self.mages
+            queries = [mages[row] for row in rng.choice(n, min(sample, n), replace=False)]
+
+        index = self._kin_index()
+        expected = found = shortlisted = 0
+        exact_seconds = search_seconds = 0.0
+        for mage in queries:
+            start = time.perf_counter()
+            exact = self._kin_rows(mage)
+            exact_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            hits = self._kin_rows(mage, index)
+            search_seconds += time.perf_counter() - start
+
+            expected += len(exact)
+            found += np.isin(exact, hits).sum()
+            if index is not None:
+                candidates = index.candidates(
+                    _unit_rows(mage.intent.to_array()), mage.kin_threshold)
+                shortlisted += n if candidates is None else len(candidates)
+            else:
+                shortlisted += n
+
+        return {
+            "queries": len(queries),
+            "recall": float(found / expected) if expected else 1.0,
+            "candidates_per_query": shortlisted / max(1, len(queries)),
+            "exact_seconds": exact_seconds,
+            "search_seconds": search_seconds,
+        }
+
+    def _thresholds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Kin and stranger thresholds of every used row as arrays"""
+        n = len(self._members)
+        return self._kin[:n], self._stranger[:n]
+
+    @_instrumented
     def calculate_network_coherence(self) -> float:
         """
         Calculate overall network coherence.
@@ -280,42 +2886,554 @@ class ResonanceNetwork:
         - Not too different (chaos)
         - Maximum productive tension
         """
-        if len(self.mages) < 2:
+        n = self._live_count()
+        if n < 2:
             return 0.0
 
-        similarities = []
-        for i, mage_a in enumerate(self.mages):
-            for mage_b in self.mages[i+1:]:
-                similarities.append(mage_a.calculate_similarity(mage_b))
+        # Mean pairwise cosine from the running sum of unit intents
+        pair_total = (self._unit_sum @ self._unit_sum - self._unit_sq_sum) / 2
 
         # Ideal similarity is around 0.90 - strangers who know each other
         # Calculate how close the average is to this ideal
-        avg_similarity = np.mean(similarities)
+        avg_similarity = pair_total / (n * (n - 1) / 2)
         ideal = 0.90
         coherence = 1 - abs(avg_similarity - ideal)
 
         return max(0.0, coherence)
 
-    def find_optimal_pairings(self) -> List[Tuple[EchoMage, EchoMage, float]]:
+    @_instrumented
+    def simulate_drift(self, ticks: int, dt: float = 1.0, scales=0.05,
+                       activations=0.0, directions=None, start: float = 0.0,
+                       apply: bool = False) -> DriftTrace:
+        """
+        Run the L(x) drift model over every member, tick by tick.
+
+        Each mage is a milestone with a scale factor s_i and activation
+        time t_i (scalars, or arrays over mages). Its intent moves along
+        its drift direction by however much L_i grew during the tick, so
+        at time x it sits L_i(x) - L_i(start) past its starting intent
+        (see drift_magnitude). directions default to the Sequence +
+        Future diagonal for 3-D intents and must be given otherwise, as
+        one vector or one per mage.
+
+        scales, activations and directions may carry a leading scenario
+        axis to run many independent what-ifs at once; every tick is one
+        array update over scenarios x mages x D. Members are not touched
+        unless apply is set, which requires a single scenario and writes
+        its final intents back.
+        """
+        # Applying writes back the rows read here: no writer may come between
+        with self._write_lock if apply else nullcontext():
+            rows = self._live_rows()
+            n = len(rows)
+            if directions is None:
+                if self.dimensions != 3:
+                    raise ValueError("directions are required for intents beyond 3-D")
+                directions = np.array([0.0, 1.0, 1.0]) / np.sqrt(2)
+            directions = np.asarray(directions, dtype=float)
+            if directions.shape[-1] != self.dimensions:
+                raise ValueError(
+                    f"directions have {directions.shape[-1]} dimensions, network holds {self.dimensions}"
+                )
+
+            # Everything broadcasts to scenarios x mages (x D)
+            scales = np.asarray(scales, dtype=float)
+            activations = np.asarray(activations, dtype=float)
+            stacked = [a for a in (scales, activations) if a.ndim == 2]
+            if directions.ndim == 3:
+                stacked.append(directions)
+            shape = (max((len(a) for a in stacked), default=1), n)
+            scales = np.broadcast_to(scales, shape)
+            activations = np.broadcast_to(activations, shape)
+            directions = np.broadcast_to(directions, shape + (self.dimensions,))
+            if apply and shape[0] != 1:
+                raise ValueError("apply needs a single scenario")
+
+            intents = np.repeat(self._intents[rows][None].astype(float), shape[0], axis=0)
+            reach = np.linalg.norm(directions, axis=-1)  # Movement per unit of L
+            previous = drift_magnitude(start, scales, activations)
+            times = start + dt * np.arange(1, ticks + 1)
+            drift = np.empty((ticks, shape[0]))
+            l_total = np.empty((ticks, shape[0]))
+            coherence = np.empty((ticks, shape[0]))
+
+            for tick, x in enumerate(times):
+                current = drift_magnitude(x, scales, activations)
+                step = current - previous
+                intents += step[..., None] * directions
+                previous = current
+                drift[tick] = np.einsum("sn,sn->s", np.abs(step), reach)
+                l_total[tick] = current.sum(axis=1)
+                coherence[tick] = self._coherence_of(intents)
+
+            if apply:
+                self._before_write(columns=self._INTENT_COLUMNS)
+                self._intents[rows] = intents[0]
+                self._store_units(rows, _unit_rows(self._intents[rows]))
+                self._resync_aggregates()
+                self._index = None
+                members = self._members
+                built = members._cache if isinstance(members, _LazyMageList) else members
+                for row, mage in enumerate(built):
+                    if mage is None:
+                        continue
+                    if len(mage._networks) > 1:
+                        # Other networks hold their own copy of the intent
+                        mage.intent = _make_intent(self._intents[row].tolist())
+                    else:
+                        mage._version = next(_versions)
+                if self._tracking:
+                    self._entangle_rows(rows)
+            return DriftTrace(times, drift, l_total, coherence, intents)
+
+    @staticmethod
+    def _coherence_of(intents: np.ndarray) -> np.ndarray:
+        """calculate_network_coherence for a stack of intent matrices"""
+        n = intents.shape[1]
+        if n < 2:
+            return np.zeros(len(intents))
+        units = _unit_rows(intents)
+        unit_sum = units.sum(axis=1)
+        pair_total = (np.einsum("sd,sd->s", unit_sum, unit_sum)
+                      - np.einsum("snd,snd->s", units, units)) / 2
+        avg_similarity = pair_total / (n * (n - 1) / 2)
+        return np.maximum(0.0, 1 - np.abs(avg_similarity - 0.90))
+
+    #: Bins of the fine histogram similarity_report reads quantiles from;
+    #: divisible by the usual histogram sizes so those are read off it too
+    sketch_bins: int = 64000
+
+    @_instrumented
+    def similarity_report(self, threshold_sets: Sequence[Tuple[float, float]] = ((0.85, 0.99),),
+                          bins: int = 40,
+                          quantiles: Sequence[float] = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99),
+                          ideals: Sequence[float] = (0.90,)) -> dict:
+        """
+        Distribution of all pairwise similarities, for threshold tuning.
+
+        One blocked pass over the upper triangle streams every tile into
+        counts; the pairs themselves are never kept. Reports:
+
+        - histogram: pair counts in bins equal-width bins over [-1, 1]
+        - quantiles: read off a sketch_bins-bin histogram, so exact to
+          within one sketch bin (2 / sketch_bins)
+        - threshold_sets: for each (kin, stranger) candidate, how many
+          pairs would be TWIN/KIN/DISTANT/NEUTRAL/OPPOSED, counted
+          exactly with the rules of calculate_resonance_field
+        - coherence: calculate_network_coherence's score for each
+          candidate ideal similarity, from the mean similarity
+
+        At a quantized precision (see set_precision), pairs within their
+        quantization error of a threshold are re-scored from the raw
+        intents, so threshold_sets stay exact; the histogram, quantiles
+        and mean carry the quantization error. Shards over worker
+        processes when workers is set.
+        """
+        cuts = np.unique([0.0, 0.5] + [t for pair in threshold_sets for t in pair])
+        extra_bins = bins if self.sketch_bins % bins else None
+        if self._parallel():
+            parts = self._sharded(_similarity_counts_shard, cuts=cuts, bins=extra_bins,
+                                  sketch_bins=self.sketch_bins)
+            pairs, at_least, sketch, total = (sum(part[i] for part in parts) for i in range(4))
+            histogram = sum(part[4] for part in parts) if extra_bins else None
+        else:
+            pairs, at_least, sketch, total, histogram = _similarity_counts(
+                self._iter_similarity_tiles(), cuts, self.sketch_bins, extra_bins,
+                self._quant(), self._tally())
+        if histogram is None:
+            histogram = sketch.reshape(bins, -1).sum(axis=1)
+        mean = total / pairs if pairs else 0.0
+
+        def above(threshold: float) -> int:
+            return int(at_least[np.searchsorted(cuts, threshold)])
+
+        sets = []
+        for kin, stranger in threshold_sets:
+            twin = above(stranger)
+            kin_count = max(above(kin) - twin, 0)
+            distant = max(above(0.5) - twin - kin_count, 0)
+            neutral = max(above(0.0) - twin - kin_count - distant, 0)
+            sets.append({
+                "kin_threshold": kin,
+                "stranger_threshold": stranger,
+                "TWIN": twin,
+                "KIN": kin_count,
+                "DISTANT": distant,
+                "NEUTRAL": neutral,
+                "OPPOSED": pairs - twin - kin_count - distant - neutral
+            })
+
+        # Quantiles interpolate linearly inside the sketch bin they hit
+        cumulative = np.concatenate(([0], sketch.cumsum()))
+        edges = np.linspace(-1.0, 1.0, len(sketch) + 1)
+        quantile_values = {
+            q: float(np.interp(q * pairs, cumulative, edges)) if pairs else None
+            for q in quantiles
+        }
+
+        return {
+            "pairs": pairs,
+            "mean_similarity": mean,
+            "histogram": {
+                "edges": np.linspace(-1.0, 1.0, bins + 1).tolist(),
+                "counts": histogram.tolist()
+            },
+            "quantiles": quantile_values,
+            "threshold_sets": sets,
+            "coherence": {ideal: max(0.0, 1 - abs(mean - ideal)) if pairs else 0.0
+                          for ideal in ideals}
+        }
+
+    def _iter_similarity_tiles(self, rows: Optional[np.ndarray] = None,
+                               floors: Optional[np.ndarray] = None,
+                               diagonal: Optional[bool] = None):
+        """
+        Walk the upper triangle of the N x N cosine similarity matrix.
+
+        See _similarity_tiles; rows defaults to every member.
+        """
+        if rows is None:
+            rows = self._live_rows()
+        return _similarity_tiles(self._units, rows, self.block_size, floors, diagonal,
+                                 tally=self._tally(), quant=self._quant())
+
+    def _kin_order(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Member rows (default: all) in a spatially coherent order"""
+        if rows is None:
+            rows = self._live_rows()
+        return rows[_locality_order(self._approx_units(rows), self.block_size)]
+
+    def _iter_kin_mask_tiles(self, rows: Optional[np.ndarray] = None,
+                             diagonal: Optional[bool] = None,
+                             floors: Optional[np.ndarray] = None):
+        """
+        Like _iter_similarity_tiles, with each tile's kin mask attached.
+
+        See _kin_mask_tiles. Members are visited in a spatially coherent
+        order so distant blocks are skipped.
+        """
+        kin, stranger = self._thresholds()
+        return _kin_mask_tiles(self._units, kin, stranger, self._kin_order(rows),
+                               self.block_size, diagonal, floors, tally=self._tally(),
+                               quant=self._quant())
+
+    def _iter_kin_pair_tiles(self, floors: Optional[np.ndarray] = None):
+        """
+        Yield the kin pairs of each similarity tile as parallel arrays.
+
+        See _kin_pair_tiles.
+        """
+        kin, stranger = self._thresholds()
+        return _kin_pair_tiles(self._units, kin, stranger, self._kin_order(),
+                               self.block_size, floors, tally=self._tally(),
+                               quant=self._quant())
+
+    def _sharded(self, job, parts: Optional[List[dict]] = None, intents: bool = False,
+                 **params) -> list:
+        """
+        Run job over every shard of the kin tile walk in a process pool.
+
+        The pool (from echo-mage-shards.py, loaded on first use) is
+        forked once per worker count and shared by every network. Unit rows, thresholds and the locality order sit in
+        shared memory that the network keeps between calls, rewritten
+        only after it changed; so do the raw intents once a job asked
+        for them with intents=True. Each task only carries their names,
+        its shard and params, and returns plain arrays. With parts, one
+        task runs per part, which adds its own params (see
+        _seeker_parts). Results come back in shard order, whatever order
+        the workers finish in.
+        """
+        workers = _sibling("echo_mage_shards", "echo-mage-shards.py")
+        pool = workers.worker_pool(self.workers)
+        with self._write_lock:
+            if self._shards is None:
+                self._shards = workers.SharedArrays()
+                weakref.finalize(self, self._shards.close)
+        shared = self._shards
+        if parts is None:
+            parts = [{}] * (4 * self.workers)  # Several per worker evens out pruning
+        with shared.lock:
+            stamp = (self._changes, self.block_size)
+            intents = intents or "intents" in shared.specs  # Once shared, kept up to date
+            if shared.stamp != stamp or "intents" not in shared.specs and intents:
+                n = len(self._members)
+                kin, stranger = self._thresholds()
+                arrays = dict(units=self._units[:n], kin=kin, stranger=stranger,
+                              rows=self._kin_order())
+                if self._precision != "full":
+                    arrays.update(zip(("scales", "errors", "intents"), self._quant()))
+                elif intents:
+                    arrays["intents"] = self._intents[:n]
+                shared.update(stamp, **arrays)
+            tasks = [dict(params, **part, job=job, arrays=shared.specs, block=self.block_size,
+                          shard=(index, len(parts))) for index, part in enumerate(parts)]
+            return list(pool.map(workers.run_shard, tasks))
+
+    def _seeker_parts(self, count: int, **columns: np.ndarray) -> List[dict]:
+        """
+        Split per-seeker arrays into _sharded parts of whole blocks of
+        seekers, one part per shard; each part's start is the position
+        of its first seeker
+        """
+        blocks = -(-count // self.block_size)
+        bounds = np.linspace(0, blocks, min(4 * self.workers, blocks) + 1).astype(int)
+        bounds = np.minimum(bounds * self.block_size, count).tolist()
+        return [dict({name: array[start:stop] for name, array in columns.items()}, start=start)
+                for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    def _parallel(self) -> bool:
+        """Whether all-pairs work should be spread over worker processes"""
+        return self.workers > 1 and self._live_count() > 2 * self.block_size
+
+    def _parallel_batch(self, seekers: int) -> bool:
+        """Whether a batch of seekers against every member should be split over workers"""
+        return self._parallel() and seekers > self.block_size
+
+    def _pairing_tuples(self, rows: np.ndarray, cols: np.ndarray,
+                        sims: np.ndarray, limit: Optional[int] = None):
+        """Sort pair arrays by similarity descending, ties in network order"""
+        order = np.lexsort((cols, rows, -sims))[:limit]
+        members = self._members
+        return [(members[rows[k]], members[cols[k]], float(sims[k])) for k in order]
+
+    @_instrumented
+    def find_optimal_pairings(self, k: Optional[int] = None) -> List[Tuple[EchoMage, EchoMage, float]]:
         """
         Find the optimal kin pairings in the network.
 
         Returns list of (mage1, mage2, similarity) tuples sorted by
         how well they embody "Strangers Who Know Each Other"
+
+        With k set, only the k best pairings are kept while scanning
+        (see iter_optimal_pairings), so memory no longer grows with the
+        total number of kin pairs.
+        """
+        if k is not None:
+            return list(self.iter_optimal_pairings(k))
+
+        with self._span("scan"):
+            if self._parallel():
+                tiles = self._sharded(_pairing_shard, k=None)
+            else:
+                tiles = list(self._iter_kin_pair_tiles())
+            if not tiles:
+                return []
+            rows, cols, sims = (np.concatenate(a) for a in zip(*tiles))
+            self._count("kin_pairs", len(sims))
+        with self._span("sort"):
+            return self._pairing_tuples(rows, cols, sims)
+
+    def iter_optimal_pairings(self, k: int):
+        """
+        Yield the k best kin pairings in descending similarity order.
+
+        Pairs are streamed tile by tile into a bounded top-k buffer: each
+        tile's pairs are first cut against the current k-th best
+        similarity, then merged and trimmed back to k. Peak memory is
+        therefore k pairs plus one tile, however dense the kin graph is.
+        Once the buffer is full, tiles that cannot beat the k-th best are
+        skipped without being computed. Ordering and ties match
+        find_optimal_pairings().
+        """
+        if k <= 0:
+            return
+        with self._span("scan"):
+            if self._parallel():
+                # Every shard keeps its own k best; the global k best
+                # are among them
+                parts = self._sharded(_pairing_shard, k=k)
+                rows, cols, sims = (np.concatenate(a) for a in zip(*parts))
+            else:
+                kin, _ = self._thresholds()
+                floors = kin.copy()
+                rows, cols, sims = _top_kin_pairs(self._iter_kin_pair_tiles(floors),
+                                                  kin, floors, k)
+        with self._span("sort"):
+            pairings = self._pairing_tuples(rows, cols, sims, k)
+        yield from pairings
+
+    @_instrumented
+    def match_pairings(self, exact: bool = False,
+                       candidates_per_mage: int = 8) -> List[Tuple[EchoMage, EchoMage, float]]:
         """
-        pairings = []
+        Seat every mage with at most one kin partner ("The Guest List").
 
-        for i, mage_a in enumerate(self.mages):
-            for mage_b in self.mages[i+1:]:
-                similarity = mage_a.calculate_similarity(mage_b)
-                # Score based on proximity to ideal "stranger who knows" range
-                if mage_a.is_kin(mage_b):
-                    pairings.append((mage_a, mage_b, similarity))
+        Uses the same kin rule as find_optimal_pairings, but each mage
+        appears in at most one returned pairing.
+
+        The default matcher is greedy: a blocked pass keeps each mage's
+        candidates_per_mage strongest kin links, and the links are taken
+        strongest first whenever both mages are still free. Mages left
+        unseated after all of their kept links were taken get another
+        round restricted to the remaining free mages. Memory stays
+        around N * candidates_per_mage links.
+
+        With exact=True the seating maximizes the total similarity over
+        the full kin graph instead (maximum-weight matching). That needs
+        networkx and every kin pair in memory, so keep it to small N.
+
+        Returns list of (mage1, mage2, similarity) tuples sorted like
+        find_optimal_pairings.
+        """
+        if exact:
+            return self._match_pairings_exact()
+
+        n = len(self._members)
+        free = self._live_rows()
+        rows, cols, sims = [], [], []
+        while len(free) > 1:
+            with self._span("scan"):
+                links = self._kin_candidate_links(free, candidates_per_mage)
+            with self._span("match"):
+                seated = _greedy_matching(*links)
+            if not len(seated):
+                break
+            link_rows, link_cols, link_sims = (a[seated] for a in links)
+            rows.append(link_rows)
+            cols.append(link_cols)
+            sims.append(link_sims)
+
+            # Only mages whose kept links were all taken can still have
+            # unseen kin among the free mages
+            degree = np.bincount(np.concatenate(links[:2]), minlength=n)
+            taken = np.zeros(n, dtype=bool)
+            taken[link_rows] = taken[link_cols] = True
+            free = free[~taken[free]]
+            if not (degree[free] >= candidates_per_mage).any():
+                break
+
+        if not sims:
+            return []
+        with self._span("sort"):
+            return self._pairing_tuples(*(np.concatenate(a) for a in (rows, cols, sims)))
+
+    def _kin_candidate_links(self, subset: np.ndarray, per_mage: int):
+        """
+        The strongest kin links of each mage within a subset of rows.
+
+        Returns (rows, cols, similarities) in network row ids, holding
+        every link that is among the per_mage best of either endpoint.
+        """
+        n = len(self._members)
+        kin, _ = self._thresholds()
+        cutoff = np.full(n, -np.inf)
+        rows, cols, sims = [], [], []
+
+        # Diagonal tiles first: each mage's best links inside its own
+        # block set a cutoff that any other link has to beat
+        for tile_rows, _, tile, mask in self._iter_kin_mask_tiles(subset, diagonal=True):
+            scores = np.where(mask | mask.T, tile, -np.inf)
+            m = min(per_mage, len(tile))
+            best = np.argpartition(-scores, m - 1, axis=1)[:, :m]
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            if m == per_mage:
+                cutoff[tile_rows] = best_scores.min(axis=1)
+
+            i = np.repeat(np.arange(len(tile)), m)
+            j = best.ravel()
+            valid = np.isfinite(best_scores.ravel())
+            a, b = tile_rows[i[valid]], tile_rows[j[valid]]
+            rows.append(np.minimum(a, b))
+            cols.append(np.maximum(a, b))
+            sims.append(tile[i[valid], j[valid]])
+
+        if not sims:
+            return (np.empty(0, dtype=np.int64),) * 2 + (np.empty(0),)
+        rows, cols, sims = (np.concatenate(x) for x in (rows, cols, sims))
+        _, first = np.unique(rows * n + cols, return_index=True)
+        rows, cols, sims = rows[first], cols[first], sims[first]
+        pruned_size = len(sims)
+
+        # Tiles that cannot beat the cutoff on either side are skipped;
+        # the walk reads floors lazily, so it tightens as cutoffs rise
+        floors = np.maximum(kin, cutoff)
+        pending, pending_size = [], 0
+        for tile_rows, tile_cols, tile, mask in self._iter_kin_mask_tiles(
+                subset, diagonal=False, floors=floors):
+            # Only links that beat an endpoint's current cutoff (so the
+            # lower of the two) can still make it into the final set
+            mask &= tile > np.minimum(cutoff[tile_rows, None], cutoff[None, tile_cols])
+            if (min(tile.shape) > per_mage
+                    and np.count_nonzero(mask) > per_mage * sum(tile.shape)):
+                # A dense tile: a link among the per_mage best of an
+                # endpoint is among its per_mage best in this tile too,
+                # and the per_mage-th best here already bounds its cutoff
+                scores = np.where(mask, tile, -np.inf)
+                row_best = np.partition(scores, -per_mage, axis=1)[:, -per_mage]
+                # Partitioning a contiguous copy beats striding down columns
+                col_best = np.partition(np.ascontiguousarray(scores.T), -per_mage,
+                                        axis=1)[:, -per_mage]
+                mask &= (scores >= row_best[:, None]) | (scores >= col_best[None, :])
+                for ends, best in ((tile_rows, row_best), (tile_cols, col_best)):
+                    cutoff[ends] = np.maximum(cutoff[ends], best)
+                    floors[ends] = np.maximum(kin[ends], cutoff[ends])
+            i, j = _mask_pairs(mask)
+            a, b = tile_rows[i], tile_cols[j]
+            pending.append((np.minimum(a, b), np.maximum(a, b), tile[i, j]))
+            pending_size += len(i)
+
+            # Prune whenever the buffer has doubled, so it stays O(N * per_mage)
+            if pending_size > max(pruned_size, per_mage * self.block_size):
+                rows, cols, sims = _prune_links(rows, cols, sims, pending, per_mage, n, cutoff)
+                pending, pending_size, pruned_size = [], 0, len(sims)
+                np.maximum(kin, cutoff, out=floors)
+
+        return _prune_links(rows, cols, sims, pending, per_mage, n, cutoff)
+
+    @_instrumented
+    def find_clans(self, communities: bool = False, links_per_mage: int = 8,
+                   max_rounds: int = 20) -> np.ndarray:
+        """
+        Label every mage with its clan: its connected group in the kin graph.
 
-        # Sort by similarity descending
-        pairings.sort(key=lambda x: x[2], reverse=True)
-        return pairings
+        The kin graph is that of find_optimal_pairings. It is never
+        materialized: the blocked similarity pass feeds each tile's pairs
+        straight into an array-based union-find (sharded over workers
+        when configured). Returns one int label per mage in network
+        order, numbered 0, 1, ... by each clan's first member.
 
+        With communities set, clans are further split into denser
+        communities by label propagation over each mage's links_per_mage
+        strongest kin links (the candidate links of match_pairings).
+        """
+        n = len(self._members)
+        live = self._live_rows()
+        if communities:
+            rows, cols, sims = self._kin_candidate_links(live, links_per_mage)
+            # Propagation alternates even and odd members, so it runs on
+            # positions in network order rather than on raw rows
+            rows, cols = np.searchsorted(live, rows), np.searchsorted(live, cols)
+            return _first_seen_labels(_propagate_labels(rows, cols, sims, len(live), max_rounds))
+
+        if self._parallel():
+            parent = np.arange(n)
+            for shard_parent in self._sharded(_clan_shard):
+                _union_pairs(parent, np.arange(n), shard_parent)
+        else:
+            parent = _clan_forest(self._iter_kin_pair_tiles(), n)
+        return _first_seen_labels(_roots(parent, live))
+
+    def _match_pairings_exact(self) -> List[Tuple[EchoMage, EchoMage, float]]:
+        """Maximum-weight matching over the complete kin graph"""
+        try:
+            import networkx as nx
+        except ImportError as exc:
+            raise ImportError(
+                "exact matching requires networkx (pip install networkx)"
+            ) from exc
+
+        graph = nx.Graph()
+        for rows, cols, sims in self._iter_kin_pair_tiles():
+            graph.add_weighted_edges_from(zip(rows.tolist(), cols.tolist(), sims.tolist()))
+
+        matching = [sorted(edge) for edge in nx.max_weight_matching(graph)]
+        if not matching:
+            return []
+        rows, cols = np.array(matching).T
+        sims = np.array([graph[i][j]["weight"] for i, j in matching])
+        return self._pairing_tuples(rows, cols, sims)
+
+    @_instrumented
     def broadcast_echo_pulse(self) -> dict:
         """
         All mages invoke echo simultaneously.
@@ -328,6 +3446,7 @@ class ResonanceNetwork:
             results[mage.name] = mage.invoke_echo()
         return results
 
+    @_instrumented
     def export_network_state(self) -> dict:
         """
         Export the complete network state as LexOS-compatible structure.
@@ -343,6 +3462,343 @@ class ResonanceNetwork:
             }
         }
 
+    @classmethod
+    def from_network_state(cls, state: dict,
+                           block_size: Optional[int] = None) -> 'ResonanceNetwork':
+        """
+        Rebuild a network from an export_network_state document.
+        """
+        network = cls(block_size=block_size)
+        network.load_seeds(state["network"]["mages"])
+        network._restore_entanglements(state["network"]["entanglements"])
+        return network
+
+    def iter_seeds(self):
+        """
+        Yield every member's LexOS seed, one at a time.
+
+        Members of an opened snapshot that were never accessed are built
+        just for their seed and not kept, so memory stays flat.
+        """
+        members = self._members
+        if isinstance(members, _LazyMageList):
+            for row in range(len(members)):
+                yield members.peek(row).to_lexos_seed()
+        else:
+            for mage in self.mages:
+                yield mage.to_lexos_seed()
+
+    def iter_ndjson(self):
+        """
+        Yield the network state as NDJSON lines, written incrementally.
+
+        A header line is followed by one seed per mage; coherence and
+        entanglements close the stream, e.g.
+        ``f.writelines(network.iter_ndjson())``.
+        """
+        yield json.dumps({
+            "lexos_version": "1.0.0",
+            "entity_type": "ResonanceNetwork",
+            "timestamp": None,
+            "mages": len(self.mages)
+        }) + "\n"
+        for seed in self.iter_seeds():
+            yield json.dumps(seed) + "\n"
+        yield json.dumps({
+            "entity_type": "ResonanceNetworkSummary",
+            "coherence": float(self.calculate_network_coherence()),
+            "entanglements": self.entanglements
+        }) + "\n"
+
+    @_instrumented
+    def load_seeds(self, seeds, batch_size: int = 65536) -> int:
+        """
+        Add the mages described by a stream of LexOS seeds.
+
+        seeds may hold seed dicts or NDJSON lines, such as an open file
+        written from iter_ndjson; that stream's header is skipped and its
+        summary restores the entanglements. Seeds are parsed and appended
+        to the column arrays batch_size at a time, without going through
+        per-mage add_mage calls.
+
+        Restored entanglements are merged into the current ones; while
+        the kin graph is tracked they are ignored, as the graph already
+        covers the loaded mages.
+
+        Returns the number of mages added.
+        """
+        added = 0
+        batch = []
+        for seed in seeds:
+            if not isinstance(seed, dict):
+                if not seed.strip():
+                    continue
+                seed = json.loads(seed)
+            entity_type = seed.get("entity_type")
+            if entity_type == "ResonanceNetworkSummary":
+                self._restore_entanglements(seed["entanglements"])
+            elif entity_type == "EchoMage":
+                batch.append(seed["seed"])
+                if len(batch) == batch_size:
+                    added += self._append_seeds(batch)
+                    batch = []
+        if batch:
+            added += self._append_seeds(batch)
+        return added
+
+    @_locked
+    def _restore_entanglements(self, entanglements: dict):
+        """Merge saved entanglements in, unless the kin graph is tracked"""
+        if self._tracking:
+            return
+        for name, edges in entanglements.items():
+            current = self.entanglements.get(name)
+            if isinstance(current, dict) and isinstance(edges, dict):
+                current.update(edges)
+            else:
+                # Untracked entanglements are free-form; the saved entry wins
+                self.entanglements[name] = edges
+
+    @_locked
+    def _append_seeds(self, seeds: List[dict]) -> int:
+        """Write a batch of seed bodies straight into the column arrays"""
+        intents = []
+        for seed in seeds:
+            intent = seed["intent_vector"]
+            if "components" in intent:
+                intents.append(_make_intent(intent["components"]).to_array())
+            else:
+                intents.append((intent["present"], intent["sequence"], intent["future"]))
+        intents = np.array(intents)
+
+        self._before_write(in_place=False)
+        if not self._live_count() and intents.shape[1] != self.dimensions:
+            self._reset(intents.shape[1])
+        if intents.shape[1] != self.dimensions:
+            raise ValueError(
+                f"intent has {intents.shape[1]} dimensions, network holds {self.dimensions}"
+            )
+        names = [seed["name"] for seed in seeds]
+        index = self._name_index()
+        if len(set(names)) < len(names) or any(name in index for name in names):
+            seen = set(index)
+            duplicate = next(name for name in names if name in seen or seen.add(name))
+            raise ValueError(f"A mage named {duplicate} is already in the network")
+        self._thaw_mages()
+
+        start = len(self._members)
+        stop = start + len(seeds)
+        self._reserve(stop)
+        self._intents[start:stop] = intents
+        units = _unit_rows(self._intents[start:stop])
+        self._store_units(slice(start, stop), units)
+        self._kin[start:stop] = [seed["thresholds"]["kin"] for seed in seeds]
+        self._stranger[start:stop] = [seed["thresholds"]["stranger"] for seed in seeds]
+        self._states[start:stop] = [self._state_code(seed["state"]) for seed in seeds]
+        self._echo[start:stop] = [seed["echo_activated"] for seed in seeds]
+        self._alive[start:stop] = True
+        self._members.extend(EchoMage._homed(seed["name"], self, row)
+                             for row, seed in zip(range(start, stop), seeds))
+        self._members_changed()
+        index.update(zip(names, range(start, stop)))
+
+        self._unit_sum += units.sum(axis=0, dtype=np.float64)
+        self._unit_sq_sum += float(np.einsum("ij,ij->", units, units, dtype=np.float64))
+        self._index = None  # Cheaper to rebuild than to mark every row
+        if self._tracking:
+            self._entangle_rows(np.arange(start, stop))
+        return len(seeds)
+
+    #: Column arrays written to a snapshot directory, one .npy file each
+    _SNAPSHOT_COLUMNS = ("_intents", "_units", "_kin", "_stranger", "_states", "_echo")
+
+    @_instrumented
+    def save_snapshot(self, path: str):
+        """
+        Write the network as a binary snapshot directory.
+
+        Every column array goes to its own .npy file (live rows only),
+        names to a UTF-8 blob plus offsets, and the rest - states table,
+        coherence aggregates, entanglements - to snapshot.json. The
+        snapshot converts losslessly to and from the LexOS seed JSON of
+        export_network_state / from_network_state.
+        """
+        os.makedirs(path, exist_ok=True)
+        n = self._live_count()
+        used, live = len(self._members), self._live()
+        columns = self._SNAPSHOT_COLUMNS
+        if self._precision != "full":
+            columns += self._QUANTIZED_COLUMNS
+        for column in columns:
+            np.save(os.path.join(path, column.lstrip("_") + ".npy"),
+                    getattr(self, column)[:used][live])
+
+        if isinstance(self._members, _LazyMageList):
+            names = self._members.names()
+        else:
+            names = [mage.name for mage in self.mages]
+        encoded = [name.encode() for name in names]
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(name) for name in encoded], out=offsets[1:])
+        np.save(os.path.join(path, "names.npy"),
+                np.frombuffer(b"".join(encoded), dtype=np.uint8))
+        np.save(os.path.join(path, "name_offsets.npy"), offsets)
+
+        with open(os.path.join(path, "snapshot.json"), "w") as f:
+            json.dump({
+                "lexos_version": "1.0.0",
+                "entity_type": "ResonanceNetworkSnapshot",
+                "format": 1,
+                "mages": n,
+                "dimensions": self.dimensions,
+                "states": self._state_names,
+                "block_size": self.block_size,
+                "precision": self._precision,
+                "unit_sum": self._unit_sum.tolist(),
+                "unit_sq_sum": self._unit_sq_sum,
+                "entanglements": self.entanglements
+            }, f)
+
+    @classmethod
+    def open_snapshot(cls, path: str, mmap: bool = True) -> 'ResonanceNetwork':
+        """
+        Open a directory written by save_snapshot.
+
+        With mmap (the default) the column arrays are memory-mapped
+        copy-on-write, so intents are only read from disk when touched
+        and changes never reach the files. Members are built lazily on
+        first access; adding or removing one materializes them all.
+        """
+        mmap_mode = "c" if mmap else None
+        with open(os.path.join(path, "snapshot.json")) as f:
+            meta = json.load(f)
+        if meta.get("format") != 1:
+            raise ValueError(f"Unsupported snapshot format: {meta.get('format')}")
+
+        network = cls(block_size=meta["block_size"])
+        network.entanglements = meta["entanglements"]
+        columns = cls._SNAPSHOT_COLUMNS
+        network._precision = meta.get("precision", "full")
+        if network._precision != "full":
+            columns += cls._QUANTIZED_COLUMNS
+            network._COLUMNS = cls._COLUMNS + cls._QUANTIZED_COLUMNS
+        for column in columns:
+            setattr(network, column, np.load(
+                os.path.join(path, column.lstrip("_") + ".npy"), mmap_mode=mmap_mode))
+        if network._precision != "full" and not mmap:
+            network._intents = network._copied("_intents")
+        network._alive = np.ones(len(network._units), dtype=bool)
+        network._unit_sum = np.array(meta["unit_sum"])
+        network._unit_sq_sum = meta["unit_sq_sum"]
+
+        # State codes are only meaningful against the table they were
+        # written with, which becomes the network's own
+        network._state_names = list(meta["states"])
+        network._state_codes = {state: code for code, state in enumerate(network._state_names)}
+
+        network.mages = _LazyMageList(
+            network,
+            np.load(os.path.join(path, "names.npy"), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, "name_offsets.npy"), mmap_mode=mmap_mode))
+        return network
+
+    def memory_report(self) -> dict:
+        """
+        Bytes held by the network, split into column arrays and
+        per-mage Python objects.
+
+        Array figures count allocated capacity, not just live rows.
+        Memory-mapped columns - the raw intents of a quantized network,
+        the columns of an opened snapshot - are paged in and out by the
+        OS; they are listed under mapped and left out of the totals.
+        """
+        n = self._live_count()
+        columns, mapped = {}, {}
+        for name in self._COLUMNS:
+            array = getattr(self, name)
+            held = mapped if getattr(array, "filename", None) is not None else columns
+            held[name.lstrip("_")] = array.nbytes
+        members = mages = self._members
+        if isinstance(mages, _LazyMageList):
+            # Only the members built so far exist as objects
+            held = mapped if getattr(mages._blob, "filename", None) is not None else columns
+            held["names"] = mages._blob.nbytes + mages._offsets.nbytes
+            mages = mages._cache
+        object_bytes = sys.getsizeof(members) + sum(
+            sys.getsizeof(mage) + sys.getsizeof(mage.name) for mage in mages if mage is not None)
+        array_bytes = sum(columns.values())
+        total = array_bytes + object_bytes
+        return {
+            "mages": n,
+            "capacity": len(self._units),
+            "columns": columns,
+            "mapped": mapped,
+            "array_bytes": array_bytes,
+            "object_bytes": object_bytes,
+            "total_bytes": total,
+            "bytes_per_mage": total / n if n else 0.0
+        }
+
+
+class NetworkSnapshot(ResonanceNetwork):
+    """
+    An immutable, versioned view of a ResonanceNetwork.
+
+    Taken with ResonanceNetwork.snapshot(). It answers every read-only
+    query - pairings, matching, kin lookups, coherence, clans, reports -
+    from the network's arrays as they were at that version, while the
+    network goes on changing. Members are the live EchoMage objects, so
+    their attributes always show current values; entanglements are not
+    part of a snapshot. Any attempt to change it raises TypeError.
+    """
+
+    def __init__(self, network: ResonanceNetwork, version: int):
+        n = len(network._members)
+        self.version = version
+        self.mages = _MemberView(network._members, range(n))
+        self._tombstones = network._tombstones
+        self.entanglements = {}
+        self.block_size = network.block_size
+        self.workers = network.workers
+        self.instruments = network.instruments
+        self._precision = network._precision
+        self._COLUMNS = network._COLUMNS
+        for column in self._COLUMNS:
+            view = getattr(network, column)[:n]
+            view.flags.writeable = False
+            setattr(self, column, view)
+        self._state_names = list(network._state_names)
+        self._state_codes = dict(network._state_codes)
+        self._unit_sum = network._unit_sum.copy()
+        self._unit_sq_sum = network._unit_sq_sum
+        self._updates_since_resync = 0
+
+        self._guest_rows = {}
+        self._subscribers = []
+        self._tracking = False
+        self._index = None
+        self._kin_search = network._kin_search
+        self._version = version
+        self._published = self
+        self._shared = set()
+        self._batch_depth = 0
+        self._write_lock = threading.RLock()
+        self._changes = 0
+        self._shards = None
+
+    def _row_of(self, mage: EchoMage) -> Optional[int]:
+        """The mage's row at this version; rows shift as the network changes"""
+        if not self._guest_rows and self._live_count():
+            self._guest_rows = {id(member): row for row, member in enumerate(self._members)
+                                if member is not None}
+        return self._guest_rows.get(id(mage))
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("NetworkSnapshot is read-only")
+
+    add_mage = remove_mage = load_seeds = _read_only
+    track_entanglements = subscribe = batch_updates = _before_write = _read_only
+
 
 # Example usage demonstrating integration
 if __name__ == "__main__":
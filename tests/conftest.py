@@ -0,0 +1,28 @@
+"""Shared fixtures for the EchoMage tests"""
+
+import importlib.util
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ECHO_MAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "..", "src", "lexos", "echo-mage.py")
+
+
+@pytest.fixture(scope="session")
+def echo_mage():
+    """src/lexos/echo-mage.py, whose name is not a valid module name"""
+    module = sys.modules.get("echo_mage")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("echo_mage", ECHO_MAGE)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["echo_mage"] = module  # Worker processes import it by name
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
@@ -0,0 +1,87 @@
+"""The L(x) drift model: drift_magnitude and ResonanceNetwork.simulate_drift"""
+
+import numpy as np
+import pytest
+
+SCALES = [0.05, 0.03, 0.02]
+ACTIVATIONS = [0, 30, 60]
+
+
+@pytest.fixture
+def trio(echo_mage):
+    network = echo_mage.ResonanceNetwork()
+    for i, intent in enumerate([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.5, 0.5, 0.5]]):
+        network.add_mage(echo_mage.EchoMage(f"m{i}", intent))
+    return network
+
+
+def test_l_total_of_the_worked_example(echo_mage):
+    assert echo_mage.drift_magnitude(60, SCALES, ACTIVATIONS).sum() == pytest.approx(23.55, abs=5e-3)
+    assert echo_mage.drift_magnitude(60, SCALES, ACTIVATIONS).tolist() == pytest.approx(
+        [np.exp(3.0), np.exp(0.9), 1.0])
+    assert echo_mage.drift_magnitude(29, SCALES, ACTIVATIONS)[1:].tolist() == [0.0, 0.0]
+    times = np.arange(0, 61)[:, None]
+    assert echo_mage.drift_magnitude(times, SCALES, ACTIVATIONS).shape == (61, 3)
+
+
+def test_simulated_l_total_and_positions(trio):
+    start = trio._intents[:3].copy()
+    direction = np.array([0.0, 1.0, 1.0]) / np.sqrt(2)
+    trace = trio.simulate_drift(60, scales=SCALES, activations=ACTIVATIONS)
+
+    assert len(trace) == 60 and trace.times[-1] == 60
+    assert trace.l_total[-1, 0] == pytest.approx(23.55, abs=5e-3)
+    moved = np.array([np.exp(3.0) - 1, np.exp(0.9), 1.0])  # L_i(60) - L_i(0)
+    np.testing.assert_allclose(trace.intents[0], start + moved[:, None] * direction)
+    assert trace.drift[:, 0].sum() == pytest.approx(moved.sum())
+    np.testing.assert_array_equal(trio._intents[:3], start)  # Not applied
+
+
+def test_scenarios_broadcast(echo_mage, trio, rng):
+    scales = np.array([[0.01], [0.02], [0.05], [0.1]])  # 4 scenarios, shared by all mages
+    directions = rng.normal(size=(3, 3))  # One per mage, shared by all scenarios
+    trace = trio.simulate_drift(12, dt=0.5, scales=scales, activations=[0, 1, 2],
+                                directions=directions)
+    assert trace.times.shape == (12,)
+    assert trace.drift.shape == trace.l_total.shape == trace.coherence.shape == (12, 4)
+    assert trace.intents.shape == (4, 3, 3)
+    single = trio.simulate_drift(12, dt=0.5, scales=0.05, activations=[0, 1, 2],
+                                 directions=directions)
+    np.testing.assert_allclose(trace.intents[2], single.intents[0])
+    np.testing.assert_allclose(trace.coherence[:, 2], single.coherence[:, 0])
+
+    per_scenario = trio.simulate_drift(3, directions=rng.normal(size=(5, 3, 3)))
+    assert per_scenario.intents.shape == (5, 3, 3) and per_scenario.l_total.shape == (3, 5)
+    with pytest.raises(ValueError, match="single scenario"):
+        trio.simulate_drift(3, scales=scales, apply=True)
+    with pytest.raises(ValueError, match="dimensions"):
+        trio.simulate_drift(3, directions=[1.0, 0.0])
+
+
+def test_apply_writes_the_final_intents_back(echo_mage, rng):
+    network = echo_mage.ResonanceNetwork()
+    for i in range(30):
+        network.add_mage(echo_mage.EchoMage(f"m{i}", rng.normal(size=3).tolist(),
+                                            kin_threshold=0.8))
+    network.remove_mage("m4")
+    network.track_entanglements()
+    before = network.snapshot()
+    versions = [mage._version for mage in network.mages]
+
+    trace = network.simulate_drift(10, scales=0.1, apply=True)
+    np.testing.assert_allclose(network._intents[network._live_rows()], trace.intents[0])
+    assert network.calculate_network_coherence() == pytest.approx(trace.coherence[-1, 0])
+    assert network.snapshot().version > before.version
+    assert before.calculate_network_coherence() != pytest.approx(trace.coherence[-1, 0])
+    assert all(mage._version > version for mage, version in zip(network.mages, versions))
+
+    expected = {}
+    for a, b, similarity in network.find_optimal_pairings():
+        expected.setdefault(a.name, {})[b.name] = similarity
+        expected.setdefault(b.name, {})[a.name] = similarity
+    assert network.entanglements.keys() == expected.keys()
+    assert all(network.entanglements[name] == pytest.approx(edges)
+               for name, edges in expected.items())
+    for mage in network.mages[::7]:
+        assert [m.name for m in network.kin_of(mage)] == \
+            [m.name for m in mage.sense_kin(list(network.mages))]
@@ -0,0 +1,125 @@
+"""Tracked entanglements against the kin graph of find_optimal_pairings"""
+
+import json
+
+import numpy as np
+import pytest
+
+
+def pairing_graph(network):
+    graph = {}
+    for a, b, similarity in network.find_optimal_pairings():
+        graph.setdefault(a.name, {})[b.name] = similarity
+        graph.setdefault(b.name, {})[a.name] = similarity
+    return graph
+
+
+def assert_tracked(network, replayed):
+    expected = pairing_graph(network)
+    assert network.entanglements.keys() == expected.keys()
+    for name, edges in expected.items():
+        assert network.entanglements[name] == pytest.approx(edges)
+    assert {name: set(edges) for name, edges in replayed.items()} == \
+        {name: set(edges) for name, edges in expected.items()}
+
+
+@pytest.fixture
+def tracked(echo_mage, rng):
+    """A subscribed network and the graph rebuilt from its events"""
+    network = echo_mage.ResonanceNetwork(block_size=16)
+    for i in range(60):
+        network.add_mage(echo_mage.EchoMage(f"m{i}", rng.normal(size=3).tolist(),
+                                            kin_threshold=0.7))
+    network.track_entanglements()
+    replayed = {name: set(edges) for name, edges in network.entanglements.items()}
+
+    def replay(event, a, b, similarity):
+        for x, y in ((a, b), (b, a)):
+            if event == "edge-added":
+                assert y not in replayed.get(x, ())
+                replayed.setdefault(x, set()).add(y)
+            else:
+                replayed[x].remove(y)
+                if not replayed[x]:
+                    del replayed[x]
+
+    network.subscribe(replay)
+    return network, replayed
+
+
+def test_tracking_starts_at_the_pairings(tracked):
+    assert_tracked(*tracked)
+
+
+def test_add_drift_and_threshold_changes(echo_mage, rng, tracked):
+    network, replayed = tracked
+    for i in range(10):
+        network.add_mage(echo_mage.EchoMage(f"new{i}", rng.normal(size=3).tolist()))
+        assert_tracked(network, replayed)
+    for i in range(0, 70, 7):
+        network.mages[i].drift_state(rng.normal(size=3).tolist())
+        assert_tracked(network, replayed)
+    network.mages[3].kin_threshold = 0.2
+    network.mages[4].stranger_threshold = 0.8
+    assert_tracked(network, replayed)
+
+
+def test_removal_and_compaction(tracked):
+    network, replayed = tracked
+    compacted = False
+    for name in [f"m{i}" for i in range(0, 60, 3)]:
+        tombstones = network._tombstones
+        network.remove_mage(name)
+        compacted |= network._tombstones < tombstones
+        assert_tracked(network, replayed)
+    assert compacted
+    network.mages[0].drift_state([1.0, 0.5, 0.0])
+    assert_tracked(network, replayed)
+
+
+def test_simulate_drift_applied(tracked):
+    network, replayed = tracked
+    network.simulate_drift(5, scales=0.3, apply=True)
+    assert_tracked(network, replayed)
+
+
+def test_loaded_seeds_keep_the_live_graph(echo_mage, rng, tracked):
+    network, replayed = tracked
+    source = echo_mage.ResonanceNetwork()
+    for i in range(20):
+        source.add_mage(echo_mage.EchoMage(f"s{i}", rng.normal(size=3).tolist()))
+    source.entanglements = {"s0": {"m1": 1.0}, "m1": {"s0": 1.0}}  # Not the kin graph
+    network.load_seeds(source.iter_ndjson())
+    assert "s0" not in network.entanglements.get("m1", {}) or \
+        "s0" in pairing_graph(network)["m1"]
+    assert_tracked(network, replayed)
+
+
+def test_untracked_loads_merge_entanglements(echo_mage):
+    network = echo_mage.ResonanceNetwork()
+    network.add_mage(echo_mage.EchoMage("a", [1.0, 0.0, 0.0]))
+    network.entanglements = {"a": {"x": 0.5}}
+    state = {"network": {"mages": [echo_mage.EchoMage("b", [0.0, 1.0, 0.0]).to_lexos_seed()],
+                         "entanglements": {"b": {"y": 0.25}}}}
+    network.load_seeds([json.dumps(seed) for seed in state["network"]["mages"]]
+                       + [json.dumps({"entity_type": "ResonanceNetworkSummary",
+                                      "coherence": 0.0,
+                                      "entanglements": state["network"]["entanglements"]})])
+    assert network.entanglements == {"a": {"x": 0.5}, "b": {"y": 0.25}}
+
+    rebuilt = echo_mage.ResonanceNetwork.from_network_state(network.export_network_state())
+    assert rebuilt.entanglements == network.entanglements
+    assert [m.name for m in rebuilt.mages] == ["a", "b"]
+    assert np.allclose(rebuilt.mages[1].intent.to_array(), [0.0, 1.0, 0.0])
+
+
+def test_untracked_entanglements_may_hold_anything(echo_mage):
+    network = echo_mage.ResonanceNetwork()
+    network.add_mage(echo_mage.EchoMage("a", [1.0, 0.0, 0.0]))
+    network.entanglements = {"a": ["b"], "c": {"d": 0.5}}
+    state = network.export_network_state()
+    rebuilt = echo_mage.ResonanceNetwork.from_network_state(state)
+    assert rebuilt.entanglements == {"a": ["b"], "c": {"d": 0.5}}
+    network.load_seeds([{"entity_type": "ResonanceNetworkSummary",
+                         "entanglements": {"a": {"b": 1.0}, "c": {"e": 0.25}}}])
+    assert network.entanglements == {"a": {"b": 1.0}, "c": {"d": 0.5, "e": 0.25}}
@@ -0,0 +1,99 @@
+"""NetworkInstruments and ResonanceNetwork.profile"""
+
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def network(echo_mage, rng):
+    network = echo_mage.ResonanceNetwork(block_size=16)
+    for i in range(80):
+        network.add_mage(echo_mage.EchoMage(f"m{i}", rng.normal(size=3).tolist(),
+                                            kin_threshold=0.7))
+    return network
+
+
+def counted(span, name):
+    """A counter summed over a span tree"""
+    return span.counters.get(name, 0) + sum(counted(child, name) for child in span.children)
+
+
+def test_profile_records_span_trees(echo_mage, network):
+    with network.profile() as calls:
+        pairings = network.find_optimal_pairings()
+        network.export_network_state()
+        network.kin_of(network.mages[0])
+        instruments = network.instruments
+
+    assert [span.name for span in calls] == ["find_optimal_pairings", "export_network_state",
+                                             "kin_of"]
+    pairing, export, kin = calls
+    assert [child.name for child in pairing.children] == ["scan", "sort"]
+    scan = pairing.children[0]
+    assert scan.depth == 1 and scan.counters["kin_pairs"] == len(pairings)
+    assert scan.counters["tiles"] + scan.counters.get("tiles_pruned", 0) == 15  # 5 x 5 blocks
+    assert counted(pairing, "similarities") > 0
+    assert 0 <= sum(child.duration for child in pairing.children) <= pairing.duration
+    assert [child.name for child in export.children] == ["calculate_network_coherence"]
+    assert counted(kin, "kin_checks") > 0
+
+    total = sum(counted(span, "similarities") for span in calls)
+    assert instruments.counters["similarities"] == total
+    tree = pairing.to_dict()
+    assert tree["name"] == "find_optimal_pairings" and len(tree["children"]) == 2
+    lines = pairing.format().splitlines()
+    assert lines[0].startswith("find_optimal_pairings ") and lines[1].startswith("  scan ")
+
+
+def test_stats_histogram(echo_mage, network):
+    instruments = echo_mage.NetworkInstruments()
+    network.instruments = instruments
+    for _ in range(5):
+        network.calculate_network_coherence()
+    network.find_optimal_pairings()
+
+    stats = instruments.stats()
+    coherence = stats["latency"]["calculate_network_coherence"]
+    assert coherence["calls"] == 5
+    assert sum(coherence["buckets"].values()) == 5
+    assert coherence["mean_seconds"] == pytest.approx(coherence["total_seconds"] / 5)
+    assert coherence["p50_seconds"] <= coherence["p99_seconds"]
+    assert coherence["p99_seconds"] <= max(coherence["buckets"])
+    assert all(bound in instruments.buckets for bound in coherence["buckets"])
+    assert {"find_optimal_pairings", "scan", "sort"} <= set(stats["latency"])
+    assert stats["counters"] == instruments.counters
+
+    instruments.reset()
+    assert instruments.stats() == {"counters": {}, "latency": {}}
+
+
+@pytest.mark.parametrize("setup", ["none", "network", "class"])
+def test_profile_restores_instruments(echo_mage, network, monkeypatch, setup):
+    own = echo_mage.NetworkInstruments()
+    if setup == "network":
+        network.instruments = own
+    elif setup == "class":
+        monkeypatch.setattr(echo_mage.ResonanceNetwork, "instruments", own)
+    before = dict(vars(network))
+
+    with pytest.raises(RuntimeError):
+        with network.profile() as calls:
+            network.calculate_network_coherence()
+            raise RuntimeError("leave the block early")
+    assert [span.name for span in calls] == ["calculate_network_coherence"]
+    assert vars(network).keys() == before.keys()
+    assert network.instruments is (None if setup == "none" else own)
+    assert not own._callbacks
+
+    network.calculate_network_coherence()  # No longer collected
+    assert len(calls) == 1
+
+
+def test_profile_ignores_other_threads(network):
+    with network.profile() as calls:
+        thread = threading.Thread(target=network.calculate_network_coherence)
+        thread.start()
+        thread.join()
+        network.find_clans()
+    assert [span.name for span in calls] == ["find_clans"]
@@ -0,0 +1,82 @@
+"""Approximate (LSH) kin search against exact kin"""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def network(echo_mage, rng):
+    centers = rng.normal(size=(6, 64))
+    network = echo_mage.ResonanceNetwork()
+    for i in range(400):
+        intent = centers[i % 6] + 0.5 * rng.normal(size=64)
+        network.add_mage(echo_mage.EchoMage(f"m{i}", intent.tolist(), kin_threshold=0.6))
+    network.remove_mage("m9")
+    return network
+
+
+def exact_kin(network, mage):
+    return [m.name for m in mage.sense_kin(list(network.mages))]
+
+
+def names(mages):
+    return [m.name for m in mages]
+
+
+@pytest.mark.parametrize("options", [dict(), dict(n_tables=2, n_bits=16, probes=0, seed=5)])
+def test_lsh_results_are_exact_kin(echo_mage, rng, network, options):
+    network.set_kin_search("lsh", **options)
+    queries = list(network.mages)[::13] + [
+        echo_mage.EchoMage("outsider", rng.normal(size=64).tolist(), kin_threshold=0.1),
+        echo_mage.EchoMage("zero", [0.0] * 64)]
+    missed = 0
+    for mage in queries:
+        found, exact = names(network.kin_of(mage)), exact_kin(network, mage)
+        assert set(found) <= set(exact)
+        assert found == [name for name in exact if name in found]  # Network order
+        missed += len(exact) - len(found)
+    if options:
+        assert missed  # Two short tables without probing lose some kin
+
+    # Rows moved since the tables were built are still checked
+    near = network.get("m4").intent.to_array()
+    network.get("m3").drift_state((near + 0.3 * rng.normal(size=64)).tolist())
+    network.add_mage(echo_mage.EchoMage("late", (near + 0.3 * rng.normal(size=64)).tolist()))
+    assert {"m3", "late"} <= set(exact_kin(network, network.get("m4")))
+    found = names(network.kin_of(network.get("m4")))
+    assert {"m3", "late"} <= set(found) <= set(exact_kin(network, network.get("m4")))
+
+
+def test_loose_thresholds_scan_everything(echo_mage, network):
+    network.set_kin_search("lsh", n_tables=1, n_bits=20, probes=0)
+    mage = network.get("m0")
+    mage.kin_threshold = -0.5
+    assert names(network.kin_of(mage)) == exact_kin(network, mage)
+
+
+def test_measure_kin_recall(echo_mage, network):
+    exact = network.measure_kin_recall(sample=40)
+    assert exact["queries"] == 40 and exact["recall"] == 1.0
+    assert exact["candidates_per_query"] == len(network.mages)
+
+    network.set_kin_search("lsh", n_tables=3, n_bits=14, probes=1, seed=2)
+    report = network.measure_kin_recall(sample=40)
+    assert set(report) == {"queries", "recall", "candidates_per_query",
+                           "exact_seconds", "search_seconds"}
+    assert report["candidates_per_query"] < len(network.mages)
+    assert report["exact_seconds"] > 0 and report["search_seconds"] > 0
+
+    queries = list(network.mages)[:25]
+    report = network.measure_kin_recall(queries)
+    expected = sum(len(exact_kin(network, mage)) for mage in queries)
+    found = sum(len(network.kin_of(mage)) for mage in queries)
+    assert report["queries"] == 25
+    assert report["recall"] == pytest.approx(found / expected)
+    assert 0 < report["recall"] <= 1
+
+
+def test_kin_search_modes_are_checked(network):
+    with pytest.raises(ValueError, match="unknown"):
+        network.set_kin_search("annoy")
+    with pytest.raises(TypeError):
+        network.set_kin_search("exact", n_tables=4)
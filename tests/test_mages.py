@@ -0,0 +1,98 @@
+"""EchoMage values, in and out of networks"""
+
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def members(echo_mage, rng):
+    """A 3-D and an embedding member, each in two networks"""
+    mages = [echo_mage.EchoMage("vector", [0.5, -1.0, 2.0], kin_threshold=0.7),
+             echo_mage.EchoMage("embedding", rng.normal(size=16).tolist())]
+    for mage in mages:
+        for _ in range(2):
+            network = echo_mage.ResonanceNetwork()
+            network.add_mage(echo_mage.EchoMage("other", rng.normal(size=len(
+                mage.intent.to_array())).tolist()))
+            network.add_mage(mage)
+        mage.invoke_echo()
+    return mages
+
+
+@pytest.mark.parametrize("duplicate", [
+    lambda mage: pickle.loads(pickle.dumps(mage)),
+    copy.copy,
+    copy.deepcopy,
+], ids=["pickle", "copy", "deepcopy"])
+def test_copies_are_detached(echo_mage, members, duplicate):
+    for mage in members:
+        twin = duplicate(mage)
+        assert twin._networks == () and twin is not mage
+        assert twin.name == mage.name and twin.intent == mage.intent
+        assert type(twin.intent) is type(mage.intent)
+        assert (twin.kin_threshold, twin.stranger_threshold, twin.state, twin.echo_activated) == \
+            (mage.kin_threshold, mage.stranger_threshold, "STRETCHED", True)
+
+        twin.kin_threshold = 0.1
+        twin.drift_state([0.0] * len(mage.intent.to_array()))
+        assert mage.kin_threshold != 0.1
+        assert mage.intent.magnitude() > 0
+        for network in mage._networks:
+            assert network.get(mage.name) is mage
+
+
+def test_deepcopy_keeps_shared_references(members):
+    mage = members[0]
+    pair = copy.deepcopy([mage, mage])
+    assert pair[0] is pair[1] and pair[0] is not mage
+
+
+def test_pickled_embedding_stays_read_only(members):
+    intent = pickle.loads(pickle.dumps(members[1].intent))
+    assert intent == members[1].intent
+    assert not intent.to_array().flags.writeable
+    assert np.array_equal(intent.to_array(), members[1].intent.to_array())
+
+
+def test_intents_cannot_be_changed_in_place(echo_mage, members):
+    vector = members[0]
+    with pytest.raises(AttributeError):
+        vector.intent.present = 5.0
+    with pytest.raises(ValueError):
+        members[1].intent.to_array()[0] = 5.0
+
+    vector.intent = echo_mage.IntentVector(5.0, -1.0, 2.0)
+    for network in vector._networks:
+        assert network._intents[network._row_of(vector)].tolist() == [5.0, -1.0, 2.0]
+        assert network.get("vector").intent.present == 5.0
+
+
+def test_state_tables_are_per_network(echo_mage, tmp_path):
+    network = echo_mage.ResonanceNetwork()
+    other = echo_mage.ResonanceNetwork()
+    mages = [echo_mage.EchoMage(f"m{i}", [1.0, i, 0.0]) for i in range(300)]
+    for mage in mages[:150]:
+        network.add_mage(mage)
+    before = network.snapshot()
+    for i, mage in enumerate(mages[:150]):
+        mage.state = f"custom-{i}"  # Past the 127 codes an int8 holds
+    seeds = [m.to_lexos_seed() for m in mages[150:]]
+    network.load_seeds([dict(seed, seed=dict(seed["seed"], state=f"seeded-{i}"))
+                        for i, seed in enumerate(seeds)])
+    other.add_mage(mages[0])
+
+    assert network._states.dtype == np.int16
+    assert [m.state for m in network.mages[:150]] == [f"custom-{i}" for i in range(150)]
+    assert [m.state for m in network.mages[150:]] == [f"seeded-{i}" for i in range(150)]
+    assert other._state_names == list(echo_mage.STATES) + ["custom-0"]
+    assert echo_mage.STATES == ("COILED", "STRETCHED", "WAITING")
+    assert {before._state_names[code] for code in before._states} == {"COILED"}
+
+    network.save_snapshot(str(tmp_path))
+    opened = echo_mage.ResonanceNetwork.open_snapshot(str(tmp_path))
+    assert [m.state for m in opened.mages] == [m.state for m in network.mages]
+    network.remove_mage("m7")
+    assert mages[7].state == "custom-7"
@@ -0,0 +1,80 @@
+"""NDJSON streams from iter_ndjson, read back with load_seeds"""
+
+import io
+
+import numpy as np
+import pytest
+
+
+def seeded_network(echo_mage, rng, dimensions, n=40, prefix="m"):
+    network = echo_mage.ResonanceNetwork()
+    for i in range(n):
+        mage = echo_mage.EchoMage(f"{prefix}{i}", rng.normal(size=dimensions).tolist(),
+                                  kin_threshold=0.6, stranger_threshold=0.98)
+        network.add_mage(mage)
+        if i % 3 == 0:
+            mage.invoke_echo()
+    network.entanglements = {f"{prefix}0": {f"{prefix}1": 0.75}}
+    return network
+
+
+def ndjson(network):
+    stream = io.StringIO()
+    stream.writelines(network.iter_ndjson())
+    stream.seek(0)
+    return stream
+
+
+def seeds(network):
+    return [mage.to_lexos_seed() for mage in network.mages]
+
+
+@pytest.mark.parametrize("dimensions", [3, 16])
+@pytest.mark.parametrize("batch_size", [7, 65536])
+def test_stream_round_trip(echo_mage, rng, dimensions, batch_size):
+    network = seeded_network(echo_mage, rng, dimensions)
+    network.remove_mage("m4")  # Tombstones are not written out
+    loaded = echo_mage.ResonanceNetwork()
+    assert loaded.load_seeds(ndjson(network), batch_size=batch_size) == 39
+
+    assert seeds(loaded) == seeds(network)
+    assert loaded.entanglements == network.entanglements
+    assert loaded.calculate_network_coherence() == pytest.approx(
+        network.calculate_network_coherence())
+    reference = echo_mage.ResonanceNetwork.from_network_state(network.export_network_state())
+    assert seeds(loaded) == seeds(reference)
+    for mage in loaded.mages[::5]:
+        assert [m.name for m in loaded.kin_of(mage)] == \
+            [m.name for m in network.kin_of(network.get(mage.name))]
+
+
+def test_duplicate_names_in_one_batch_are_rejected(echo_mage, rng):
+    network = seeded_network(echo_mage, rng, 3, n=5)
+    lines = ndjson(network).readlines()
+    lines.insert(4, lines[2])  # m1 twice, in the same batch
+    loaded = echo_mage.ResonanceNetwork()
+    with pytest.raises(ValueError, match="m1"):
+        loaded.load_seeds(lines)
+    assert len(loaded.mages) == 0 and loaded.get("m0") is None
+
+
+def test_loading_into_a_non_empty_network(echo_mage, rng):
+    network = seeded_network(echo_mage, rng, 3, n=20)
+    other = seeded_network(echo_mage, rng, 3, n=30, prefix="o")
+    network.remove_mage("m2")
+    expected = seeds(network) + seeds(other)
+
+    assert network.load_seeds(ndjson(other), batch_size=8) == 30
+    assert seeds(network) == expected
+    assert network.entanglements == {"m0": {"m1": 0.75}, "o0": {"o1": 0.75}}
+    assert network.get("o29").name == "o29"
+    assert network.calculate_network_coherence() == pytest.approx(
+        echo_mage.ResonanceNetwork.from_network_state(
+            network.export_network_state()).calculate_network_coherence())
+
+    with pytest.raises(ValueError, match="named o0"):
+        network.load_seeds(ndjson(other))
+    assert len(network.mages) == 49
+    with pytest.raises(ValueError, match="dimensions"):
+        network.load_seeds([seeds(seeded_network(echo_mage, rng, 8, n=1, prefix="x"))[0]])
+    assert np.isfinite(network.calculate_network_coherence())
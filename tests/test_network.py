@@ -0,0 +1,224 @@
+"""ResonanceNetwork's array engine against the per-pair EchoMage reference"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+
+def clustered_mages(echo_mage, rng, n, dimensions, clusters=6):
+    """Mages around a few directions, with varied thresholds and some zero intents"""
+    centers = rng.normal(size=(clusters, dimensions))
+    mages = []
+    for i in range(n):
+        intent = centers[i % clusters] + 0.25 * rng.normal(size=dimensions)
+        if i % 41 == 0:
+            intent = np.zeros(dimensions)
+        mages.append(echo_mage.EchoMage(f"m{i}", intent.tolist(),
+                                        kin_threshold=0.85 + 0.01 * (i % 5),
+                                        stranger_threshold=0.99 if i % 7 else 0.995))
+    return mages
+
+
+def network_of(echo_mage, mages, **options):
+    precision = options.pop("precision", "full")
+    network = echo_mage.ResonanceNetwork(**options)
+    for mage in mages:
+        network.add_mage(mage)
+    network.set_precision(precision)
+    return network
+
+
+def reference_pairs(mages):
+    """Kin pairs as the per-pair code finds them: judged by the earlier mage"""
+    return {(a.name, b.name): a.calculate_similarity(b)
+            for a, b in itertools.combinations(mages, 2) if a.is_kin(b)}
+
+
+def reference_clans(mages):
+    """Connected groups of the reference kin graph, labelled by first member"""
+    position = {mage.name: i for i, mage in enumerate(mages)}
+    parent = list(range(len(mages)))
+
+    def root(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for a, b in reference_pairs(mages):
+        parent[root(position[b])] = root(position[a])
+    labels, first = [], {}
+    for i in range(len(mages)):
+        labels.append(first.setdefault(root(i), len(first)))
+    return labels
+
+
+def reference_coherence(mages):
+    if len(mages) < 2:
+        return 0.0
+    similarities = [a.calculate_similarity(b) for a, b in itertools.combinations(mages, 2)]
+    return max(0.0, 1 - abs(np.mean(similarities) - 0.90))
+
+
+def pairs_of(pairings):
+    return {(a.name, b.name): similarity for a, b, similarity in pairings}
+
+
+ENGINES = [
+    pytest.param(3, "full", 1, id="3d"),
+    pytest.param(3, "full", 2, id="3d-workers"),
+    pytest.param(16, "full", 1, id="16d"),
+    pytest.param(16, "full", 2, id="16d-workers"),
+    pytest.param(3, "float16", 1, id="3d-float16"),
+    pytest.param(16, "int8", 1, id="16d-int8"),
+    pytest.param(16, "int8", 2, id="16d-int8-workers"),
+]
+
+
+@pytest.mark.parametrize("dimensions, precision, workers", ENGINES)
+def test_matches_per_pair_reference(echo_mage, rng, dimensions, precision, workers):
+    mages = clustered_mages(echo_mage, rng, 300, dimensions)
+    network = network_of(echo_mage, mages, block_size=32, workers=workers,
+                         precision=precision)
+    # Embeddings are float32; quantized scans also report similarities
+    # with their quantization error
+    tolerance = 1e-6 if precision == "full" else 2e-2
+
+    expected = reference_pairs(mages)
+    pairings = network.find_optimal_pairings()
+    found = pairs_of(pairings)
+    assert found.keys() == expected.keys()
+    assert all(abs(found[pair] - expected[pair]) <= tolerance for pair in expected)
+    assert [s for _, _, s in pairings] == sorted((s for _, _, s in pairings), reverse=True)
+
+    top = network.find_optimal_pairings(k=25)
+    assert len(top) == 25 and pairs_of(top).keys() <= expected.keys()
+    assert network.find_clans().tolist() == reference_clans(mages)
+    assert network.calculate_network_coherence() == pytest.approx(reference_coherence(mages))
+
+    for mage in mages[::17]:
+        assert [m.name for m in network.kin_of(mage)] == [m.name for m in mage.sense_kin(mages)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_match_pairings_seats_each_mage_once(echo_mage, rng, workers):
+    mages = clustered_mages(echo_mage, rng, 300, 3)
+    network = network_of(echo_mage, mages, block_size=32, workers=workers)
+    expected = reference_pairs(mages)
+
+    matching = network.match_pairings(candidates_per_mage=2)
+    seated = [mage.name for pairing in matching for mage in pairing[:2]]
+    assert len(seated) == len(set(seated))
+    assert all(expected[a.name, b.name] == pytest.approx(s) for a, b, s in matching)
+    # Greedy, but maximal: no two unseated mages are left as kin
+    free = set(seated).symmetric_difference(mage.name for mage in mages)
+    assert not [pair for pair in expected if free.issuperset(pair)]
+
+
+@pytest.mark.parametrize("precision, workers", [("full", 1), ("int8", 1), ("full", 2),
+                                                ("int8", 2)])
+def test_resonance_columns_match_per_pair_reference(echo_mage, rng, precision, workers):
+    mages = clustered_mages(echo_mage, rng, 120, 16)
+    # Small blocks, so members are read in many chunks and seekers
+    # split over several shards
+    network = network_of(echo_mage, mages, block_size=16, precision=precision,
+                         workers=workers)
+    for mage in mages[5::31]:
+        network.remove_mage(mage)
+    members = list(network.mages)
+    seekers = members[::3]
+
+    indptr, indices = network.sense_kin_batch(seekers)
+    for q, mage in enumerate(seekers):
+        kin = [members[c].name for c in indices[indptr[q]:indptr[q + 1]]]
+        assert kin == [other.name for other in mage.sense_kin(members)]
+
+    for mage, batched in zip(seekers, network.calculate_resonance_columns_batch(seekers)):
+        others = [other for other in members if other is not mage]
+        similarities = [mage.calculate_similarity(o) for o in others]
+        distances = [np.linalg.norm(o.intent.to_array() - mage.intent.to_array()) for o in others]
+        for field in (mage.calculate_resonance_columns(network), batched):
+            assert field.names.tolist() == [other.name for other in others]
+            np.testing.assert_allclose(field.similarity, similarities, atol=1e-6)
+            assert field.is_kin.tolist() == [mage.is_kin(o) for o in others]
+            np.testing.assert_allclose(field.intent_distance, distances, rtol=1e-6)
+
+
+def test_empty_network(echo_mage):
+    network = echo_mage.ResonanceNetwork()
+    assert network.find_optimal_pairings() == []
+    assert network.find_optimal_pairings(k=3) == []
+    assert network.match_pairings() == []
+    assert network.find_clans().tolist() == []
+    assert network.calculate_network_coherence() == 0.0
+
+
+def test_single_mage_network(echo_mage):
+    mage = echo_mage.EchoMage("solo", [0.2, 0.5, 0.9])
+    network = network_of(echo_mage, [mage])
+    assert network.find_optimal_pairings() == []
+    assert network.match_pairings() == []
+    assert network.find_clans().tolist() == [0]
+    assert network.calculate_network_coherence() == 0.0
+    assert network.kin_of(mage) == []
+    assert len(mage.calculate_resonance_columns(network)) == 0
+
+
+@pytest.mark.parametrize("precision", ["full", "int8"])
+def test_network_without_kin(echo_mage, precision):
+    # Orthogonal intents: every similarity is 0, far below any kin threshold
+    mages = [echo_mage.EchoMage(f"m{i}", np.eye(8)[i].tolist()) for i in range(8)]
+    network = network_of(echo_mage, mages, precision=precision)
+    assert network.find_optimal_pairings() == []
+    assert network.match_pairings() == []
+    assert network.find_clans().tolist() == list(range(8))
+    assert network.calculate_network_coherence() == pytest.approx(reference_coherence(mages))
+    assert all(network.kin_of(mage) == [] for mage in mages)
+
+
+@pytest.mark.parametrize("precision", ["full", "int8"])
+def test_removal_churn_matches_per_pair_reference(echo_mage, rng, precision):
+    mages = clustered_mages(echo_mage, rng, 240, 3)
+    network = network_of(echo_mage, mages, block_size=32, precision=precision)
+    members = list(mages)
+    for step in range(300):
+        if step % 3 == 2:
+            mage = echo_mage.EchoMage(f"n{step}", rng.normal(size=3).tolist())
+            network.add_mage(mage)
+            members.append(mage)
+        else:
+            network.remove_mage(members.pop(int(rng.integers(len(members)))))
+
+    assert [mage.name for mage in network.mages] == [mage.name for mage in members]
+    assert pairs_of(network.find_optimal_pairings()).keys() == reference_pairs(members).keys()
+    assert network.find_clans().tolist() == reference_clans(members)
+    assert network.calculate_network_coherence() == pytest.approx(reference_coherence(members))
+    for mage in members[::19]:
+        assert [m.name for m in network.kin_of(mage)] == [m.name for m in mage.sense_kin(members)]
+
+
+def test_mages_is_a_cached_read_only_view(echo_mage, rng):
+    mages = clustered_mages(echo_mage, rng, 50, 3)
+    network = network_of(echo_mage, mages, block_size=16)
+    members = list(mages)
+    view = network.mages
+    assert network.mages is view and list(view) == members
+    with pytest.raises(TypeError):
+        view[0] = mages[1]
+    assert not hasattr(view, "append")
+
+    network.add_mage(extra := echo_mage.EchoMage("extra", [1.0, 0.0, 0.0]))
+    members.append(extra)
+    for mage in mages[3:40:4]:
+        network.remove_mage(mage)
+        members.remove(mage)
+        assert network.mages is not view and list(network.mages) == members
+        view = network.mages
+        assert network.mages is view
+    mages[45].kin_threshold = 0.5  # Not a membership change
+    assert network.mages is view
+
+    assert len(view) == len(members) and view[-1] is extra and view[2:5] == members[2:5]
+    assert extra in view and view.index(members[7]) == 7
+    for position, mage in enumerate(members):
+        assert network._position_of(mage) == position
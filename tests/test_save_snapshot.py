@@ -0,0 +1,73 @@
+"""save_snapshot / open_snapshot round trips"""
+
+import json
+
+import numpy as np
+import pytest
+
+CASES = [
+    pytest.param(3, "full", True, id="3d"),
+    pytest.param(3, "full", False, id="3d-in-memory"),
+    pytest.param(24, "full", True, id="embeddings"),
+    pytest.param(24, "int8", True, id="embeddings-int8"),
+    pytest.param(24, "float16", False, id="embeddings-float16-in-memory"),
+]
+
+
+def saved_network(echo_mage, rng, dimensions, precision):
+    network = echo_mage.ResonanceNetwork(block_size=16)
+    for i in range(60):
+        mage = echo_mage.EchoMage(f"m{i}-é", rng.normal(size=dimensions).tolist(),
+                                  kin_threshold=0.5 + 0.01 * i)
+        network.add_mage(mage)
+        if i % 4 == 0:
+            mage.invoke_echo()
+    network.set_precision(precision)
+    for name in ("m3-é", "m17-é", "m40-é"):  # Tombstones, too few to compact
+        network.remove_mage(name)
+    network.entanglements = {"m0-é": {"m1-é": 0.5}}
+    assert network._tombstones == 3
+    return network
+
+
+def state_of(network):
+    """export_network_state, through JSON as it would be stored"""
+    return json.loads(json.dumps(network.export_network_state()))
+
+
+@pytest.mark.parametrize("dimensions, precision, mmap", CASES)
+def test_round_trip(echo_mage, rng, tmp_path, dimensions, precision, mmap):
+    network = saved_network(echo_mage, rng, dimensions, precision)
+    network.save_snapshot(str(tmp_path))
+    opened = echo_mage.ResonanceNetwork.open_snapshot(str(tmp_path), mmap=mmap)
+
+    assert state_of(opened) == state_of(network)
+    assert opened.precision == precision and opened.dimensions == dimensions
+    assert opened._live_count() == 57 and not opened._tombstones
+    assert isinstance(opened.mages[0].intent, type(network.mages[0].intent))
+    assert opened.calculate_network_coherence() == pytest.approx(
+        network.calculate_network_coherence())
+    assert [(a.name, b.name) for a, b, _ in opened.find_optimal_pairings()] == \
+        [(a.name, b.name) for a, b, _ in network.find_optimal_pairings()]
+
+
+@pytest.mark.parametrize("dimensions, precision, mmap", CASES)
+def test_changes_after_opening(echo_mage, rng, tmp_path, dimensions, precision, mmap):
+    network = saved_network(echo_mage, rng, dimensions, precision)
+    network.save_snapshot(str(tmp_path))
+    files = {path.name: path.read_bytes() for path in tmp_path.iterdir()}
+    opened = echo_mage.ResonanceNetwork.open_snapshot(str(tmp_path), mmap=mmap)
+
+    for target in (network, opened):
+        target.remove_mage("m5-é")
+        target.add_mage(echo_mage.EchoMage("new", rng.normal(size=dimensions).tolist()))
+        target.get("m6-é").drift_state(np.ones(dimensions).tolist())
+        target.get("m7-é").kin_threshold = 0.1
+    opened.get("new").intent = network.get("new").intent
+
+    assert state_of(opened) == state_of(network)
+    for mage in network.mages[::9]:
+        assert [m.name for m in opened.kin_of(opened.get(mage.name))] == \
+            [m.name for m in network.kin_of(mage)]
+    # Copy-on-write maps and in-memory loads both leave the files alone
+    assert {path.name: path.read_bytes() for path in tmp_path.iterdir()} == files
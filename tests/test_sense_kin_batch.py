@@ -0,0 +1,66 @@
+"""sense_kin_batch's CSR output against per-seeker sense_kin"""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def network(echo_mage, rng):
+    centers = rng.normal(size=(4, 8))
+    network = echo_mage.ResonanceNetwork(block_size=32)
+    for i in range(90):
+        intent = centers[i % 4] + 0.4 * rng.normal(size=8)
+        network.add_mage(echo_mage.EchoMage(f"m{i}", intent.tolist(),
+                                            kin_threshold=0.5 + 0.1 * (i % 4),
+                                            stranger_threshold=0.97 + 0.01 * (i % 3)))
+    network.remove_mage("m11")
+    return network
+
+
+def assert_matches_sense_kin(indptr, indices, seekers, candidates):
+    assert len(indptr) == len(seekers) + 1 and indptr[0] == 0
+    assert indptr[-1] == len(indices) and (np.diff(indptr) >= 0).all()
+    for q, seeker in enumerate(seekers):
+        kin = indices[indptr[q]:indptr[q + 1]].tolist()
+        assert kin == sorted(kin)
+        assert [candidates[c] for c in kin] == seeker.sense_kin(candidates)
+
+
+@pytest.mark.parametrize("block_size", [None, 5])
+def test_network_candidates(echo_mage, rng, network, block_size):
+    members = list(network.mages)
+    outsiders = [echo_mage.EchoMage(f"x{i}", rng.normal(size=8).tolist(), kin_threshold=0.3)
+                 for i in range(7)]
+    seekers = members[::3] + outsiders
+    indptr, indices = network.sense_kin_batch(seekers, block_size=block_size)
+    assert_matches_sense_kin(indptr, indices, seekers, members)
+    assert indices.max() < len(members)
+
+
+@pytest.mark.parametrize("block_size", [None, 4])
+def test_list_candidates(echo_mage, rng, network, block_size):
+    members = list(network.mages)
+    pool = members[1::2] + [echo_mage.EchoMage("zero", [0.0] * 8)]
+    seekers = members[::5]
+    indptr, indices = network.sense_kin_batch(seekers, pool, block_size=block_size)
+    assert_matches_sense_kin(indptr, indices, seekers, pool)
+
+
+def test_network_seekers_and_other_network(echo_mage, network):
+    members = list(network.mages)
+    other = echo_mage.ResonanceNetwork()
+    for mage in members[:20]:
+        other.add_mage(mage)
+    indptr, indices = network.sense_kin_batch(other, network, block_size=6)
+    assert_matches_sense_kin(indptr, indices, members[:20], members)
+    indptr, indices = other.sense_kin_batch(members[40:70], block_size=3)
+    assert_matches_sense_kin(indptr, indices, members[40:70], members[:20])
+
+
+def test_empty_batches_and_mismatched_dimensions(echo_mage, network):
+    indptr, indices = network.sense_kin_batch([])
+    assert indptr.tolist() == [0] and len(indices) == 0
+    indptr, indices = network.sense_kin_batch(list(network.mages)[:3], [])
+    assert indptr.tolist() == [0, 0, 0, 0] and len(indices) == 0
+    with pytest.raises(ValueError, match="dimensions"):
+        network.sense_kin_batch([echo_mage.EchoMage("flat", [1.0, 0.0, 0.0])])
@@ -0,0 +1,142 @@
+"""ResonanceServer's micro-batches, driven through asyncio"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      "..", "src", "lexos", "echo-mage-server.py")
+
+
+@pytest.fixture(scope="module")
+def echo_mage_server(echo_mage):
+    """src/lexos/echo-mage-server.py, on the already loaded echo_mage module"""
+    module = sys.modules.get("echo_mage_server")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("echo_mage_server", SERVER)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["echo_mage_server"] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def network(echo_mage, rng):
+    network = echo_mage.ResonanceNetwork()
+    for i in range(40):
+        network.add_mage(echo_mage.EchoMage(f"m{i}", rng.normal(size=3).tolist(),
+                                            kin_threshold=0.6))
+    return network
+
+
+def serve(echo_mage_server, network, requests, max_delay=0.05):
+    """Answer requests queued all at once, returning the answers and server stats"""
+    async def main():
+        server = echo_mage_server.ResonanceServer(network, max_delay=max_delay)
+        await server.start()
+        try:
+            answers = await asyncio.gather(*(server.query(r) for r in requests))
+            return answers, server.stats()
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def kin_names(network, mage):
+    return [m.name for m in network.kin_of(mage)]
+
+
+def test_queued_reads_share_one_batch(echo_mage_server, network):
+    requests = [{"op": "kin", "seeker": {"name": f"m{i}"}} for i in range(30)]
+    requests += [{"op": "field", "seeker": {"name": "m3"}}, {"op": "coherence"}]
+    answers, stats = serve(echo_mage_server, network, requests)
+
+    assert stats["batches"] == 1 and stats["batch_sizes"] == {32: 1}
+    for i, answer in enumerate(answers[:30]):
+        assert answer == {"kin": kin_names(network, network.get(f"m{i}"))}
+    field = network.get("m3").calculate_resonance_field(network)
+    assert answers[30]["field"].keys() == field.keys()
+    assert all(answers[30]["field"][name]["similarity"] == pytest.approx(row["similarity"])
+               for name, row in field.items())
+    assert answers[31] == {"coherence": pytest.approx(network.calculate_network_coherence())}
+
+
+def test_bad_seeker_fails_alone(echo_mage_server, network):
+    requests = [{"op": "kin", "seeker": {"name": f"m{i}"}} for i in range(38)]
+    requests.insert(17, {"op": "kin", "seeker": {"intent": [1, 0, 0, 0]}})
+    requests.append({"op": "field", "seeker": {"name": "nobody"}})
+    requests.append({"op": "field", "seeker": {"intent": [1, 0, 0]}})
+    answers, stats = serve(echo_mage_server, network, requests)
+
+    assert stats["batches"] == 1
+    assert "4 dimensions" in answers[17]["error"]
+    assert "nobody" in answers[39]["error"]
+    good = answers[:17] + answers[18:39]
+    assert [a["kin"] for a in good] == [kin_names(network, network.get(f"m{i}"))
+                                        for i in range(38)]
+    assert len(answers[40]["field"]) == 40
+
+
+def test_grouped_failure_is_answered_one_by_one(echo_mage_server, echo_mage, network):
+    server = echo_mage_server.ResonanceServer(network)
+    product = server._kin_answers
+
+    def fussy(seekers):
+        if any(seeker.name == "odd" for seeker in seekers):
+            raise ValueError("odd seeker")
+        return product(seekers)
+
+    server._kin_answers = fussy
+    answers = server._answer_batch([{"op": "kin", "seeker": {"name": "m1"}},
+                                    {"op": "kin", "seeker": {"name": "odd", "intent": [0, 1, 0]}},
+                                    {"op": "kin", "seeker": {"name": "m2"}}])
+    assert answers[0] == {"kin": kin_names(network, network.get("m1"))}
+    assert answers[1] == {"error": "odd seeker"}
+    assert answers[2] == {"kin": kin_names(network, network.get("m2"))}
+
+
+def test_drift_applies_between_reads_in_arrival_order(echo_mage_server, echo_mage, network):
+    network.add_mage(echo_mage.EchoMage("anchor", [1.0, 0.0, 0.0]))
+    network.add_mage(echo_mage.EchoMage("rover", [0.0, 1.0, 0.0]))
+    seeker = {"name": "probe", "intent": [1.0, 0.0, 0.0], "kin_threshold": 0.95}
+    requests = [
+        {"op": "kin", "seeker": seeker, "id": 1},
+        {"op": "drift", "name": "rover", "intent": [1.0, 0.3, 0.0]},
+        {"op": "kin", "seeker": seeker},
+        {"op": "drift", "name": "rover", "intent": [0.0, 0.0, 1.0]},
+        {"op": "field", "seeker": {"name": "anchor"}},
+    ]
+    answers, stats = serve(echo_mage_server, network, requests)
+
+    assert stats["batches"] == 1
+    assert "rover" not in answers[0]["kin"]
+    assert answers[1] == {"intent": [1.0, 0.3, 0.0]}
+    assert "rover" in answers[2]["kin"]
+    assert answers[4]["field"]["rover"]["similarity"] == pytest.approx(0.0)
+
+
+def test_socket_round_trip(echo_mage_server, network):
+    async def main():
+        server = echo_mage_server.ResonanceServer(network)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b'{"op": "kin", "seeker": {"name": "m0"}, "id": "a"}\n'
+                         b'not json\n{"op": "stats", "id": "b"}\n')
+            await writer.drain()
+            lines = [json.loads(await reader.readline()) for _ in range(3)]
+            writer.close()
+            return lines
+        finally:
+            await server.close()
+
+    lines = asyncio.run(main())
+    by_id = {line.get("id"): line for line in lines}
+    assert by_id["a"]["kin"] == kin_names(network, network.get("m0"))
+    assert "queue_depth" in by_id["b"]  # Stats skip the queue, so may come first
+    assert "error" in by_id[None]
@@ -0,0 +1,85 @@
+"""SimilarityCache behind EchoMage.calculate_similarity"""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def cache(echo_mage, monkeypatch):
+    cache = echo_mage.SimilarityCache(maxsize=64)
+    monkeypatch.setattr(echo_mage.EchoMage, "similarity_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def pair(echo_mage):
+    a = echo_mage.EchoMage("a", [1.0, 0.0, 0.0])
+    b = echo_mage.EchoMage("b", [1.0, 1.0, 0.0])
+    return a, b
+
+
+def test_hits_misses_and_symmetry(cache, pair):
+    a, b = pair
+    assert a.calculate_similarity(b) == pytest.approx(np.sqrt(0.5))
+    assert b.calculate_similarity(a) == pytest.approx(np.sqrt(0.5))
+    a.calculate_similarity(b)
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 1)
+    assert cache.stats() == {"hits": 2, "misses": 1, "evictions": 0, "size": 1,
+                             "maxsize": 64, "hit_rate": pytest.approx(2 / 3)}
+    cache.clear()
+    assert cache.stats()["hit_rate"] == 0.0 and len(cache) == 0
+
+
+@pytest.mark.parametrize("member", [False, True], ids=["detached", "member"])
+def test_writes_invalidate_entries(echo_mage, cache, pair, member):
+    a, b = pair
+    if member:
+        network = echo_mage.ResonanceNetwork()
+        network.add_mage(a)
+        network.add_mage(b)
+    a.calculate_similarity(b)
+
+    a.drift_state([0.0, 1.0, 0.0])
+    assert a.calculate_similarity(b) == pytest.approx(np.sqrt(0.5))
+    assert cache.misses == 2
+    b.intent = echo_mage.IntentVector(0.0, 0.0, 1.0)
+    assert a.calculate_similarity(b) == 0.0 and cache.misses == 3
+
+    # Thresholds do not change the similarity, but do give a new version
+    b.kin_threshold = 0.2
+    a.calculate_similarity(b)
+    a.stranger_threshold = 0.95
+    a.calculate_similarity(b)
+    assert (cache.hits, cache.misses) == (0, 5)
+    a.echo_activated = True  # Not versioned
+    a.calculate_similarity(b)
+    assert cache.hits == 1
+
+
+def test_applied_drift_invalidates_members(echo_mage, cache, rng):
+    network = echo_mage.ResonanceNetwork()
+    mages = [echo_mage.EchoMage(f"m{i}", rng.normal(size=3).tolist()) for i in range(4)]
+    for mage in mages:
+        network.add_mage(mage)
+    before = mages[0].calculate_similarity(mages[1])
+    network.simulate_drift(5, scales=0.3, apply=True)
+    after = mages[0].calculate_similarity(mages[1])
+    assert cache.misses == 2 and after != pytest.approx(before)
+    assert after == pytest.approx(mages[0]._similarity(mages[1]))
+
+
+def test_least_recently_used_entry_is_evicted(echo_mage, cache):
+    cache.maxsize = 2
+    a, b, c, d = (echo_mage.EchoMage(name, [1.0, i, 0.0]) for i, name in enumerate("abcd"))
+    a.calculate_similarity(b)
+    a.calculate_similarity(c)
+    a.calculate_similarity(b)  # Now a-c is the least recently used
+    a.calculate_similarity(d)
+    assert cache.evictions == 1 and len(cache) == 2
+
+    misses = cache.misses
+    a.calculate_similarity(b)
+    a.calculate_similarity(d)
+    assert cache.misses == misses
+    a.calculate_similarity(c)
+    assert cache.misses == misses + 1 and cache.evictions == 2
@@ -0,0 +1,84 @@
+"""similarity_report against brute-force pairwise similarities"""
+
+import numpy as np
+import pytest
+
+THRESHOLD_SETS = [(0.85, 0.99), (0.6, 0.9), (0.3, 0.7)]
+
+
+def reference_similarities(network):
+    """Every pair's similarity from the raw intents, in float64"""
+    intents = np.array([mage.intent.to_array() for mage in network.mages], dtype=np.float64)
+    norms = np.linalg.norm(intents, axis=1, keepdims=True)
+    units = np.divide(intents, norms, out=np.zeros_like(intents), where=norms > 0)
+    return (units @ units.T)[np.triu_indices(len(units), 1)]
+
+
+def reference_counts(similarities, kin, stranger):
+    twin = similarities >= stranger
+    kin_pairs = ~twin & (similarities >= kin)
+    distant = ~twin & ~kin_pairs & (similarities >= 0.5)
+    neutral = (similarities >= 0) & (similarities < 0.5) & (similarities < kin)
+    return {"kin_threshold": kin, "stranger_threshold": stranger,
+            "TWIN": int(twin.sum()), "KIN": int(kin_pairs.sum()),
+            "DISTANT": int(distant.sum()), "NEUTRAL": int(neutral.sum()),
+            "OPPOSED": int((~twin & ~kin_pairs & ~distant & ~neutral).sum())}
+
+
+def clustered_network(echo_mage, rng, n, dimensions, **options):
+    centers = rng.normal(size=(5, dimensions))
+    network = echo_mage.ResonanceNetwork(block_size=32, **options)
+    for i in range(n):
+        intent = centers[i % 5] + 0.3 * rng.normal(size=dimensions)
+        if i % 53 == 0:
+            intent = np.zeros(dimensions)
+        network.add_mage(echo_mage.EchoMage(f"m{i}", intent.tolist()))
+    for name in ("m7", "m100"):
+        network.remove_mage(name)
+    return network
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("bins", [40, 16])
+def test_counts_and_histogram_match_brute_force(echo_mage, rng, workers, bins):
+    network = clustered_network(echo_mage, rng, 300, 3, workers=workers)
+    similarities = reference_similarities(network)
+    report = network.similarity_report(THRESHOLD_SETS, bins=bins, ideals=(0.9, 0.5))
+
+    assert report["pairs"] == len(similarities) == 298 * 297 // 2
+    assert report["threshold_sets"] == [reference_counts(similarities, *pair)
+                                        for pair in THRESHOLD_SETS]
+    index = np.clip(((similarities + 1) * (bins / 2)).astype(np.int64), 0, bins - 1)
+    assert report["histogram"]["counts"] == np.bincount(index, minlength=bins).tolist()
+    assert report["histogram"]["edges"] == pytest.approx(np.linspace(-1, 1, bins + 1).tolist())
+    mean = similarities.mean()
+    assert report["mean_similarity"] == pytest.approx(mean)
+    assert report["coherence"] == {0.9: pytest.approx(1 - abs(mean - 0.9)),
+                                   0.5: pytest.approx(max(0.0, 1 - abs(mean - 0.5)))}
+    assert report["coherence"][0.9] == pytest.approx(network.calculate_network_coherence())
+    sketch_bin = 2 / network.sketch_bins
+    for q, value in report["quantiles"].items():
+        assert abs(value - np.quantile(similarities, q)) <= 2 * sketch_bin
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("precision", ["int8", "float16"])
+def test_quantized_threshold_counts_stay_exact(echo_mage, rng, workers, precision):
+    network = clustered_network(echo_mage, rng, 300, 16, workers=workers)
+    network.set_precision(precision)
+    similarities = reference_similarities(network)
+    report = network.similarity_report(THRESHOLD_SETS)
+
+    assert report["threshold_sets"] == [reference_counts(similarities, *pair)
+                                        for pair in THRESHOLD_SETS]
+    assert report["mean_similarity"] == pytest.approx(similarities.mean(), abs=1e-3)
+    assert sum(report["histogram"]["counts"]) == len(similarities)
+
+
+def test_empty_and_single_member_reports(echo_mage):
+    network = echo_mage.ResonanceNetwork()
+    assert network.similarity_report()["pairs"] == 0
+    network.add_mage(echo_mage.EchoMage("solo", [1.0, 0.0, 0.0]))
+    report = network.similarity_report()
+    assert report["pairs"] == 0 and report["quantiles"][0.5] is None
+    assert report["threshold_sets"][0]["KIN"] == 0 and report["coherence"] == {0.9: 0.0}
@@ -0,0 +1,104 @@
+"""Snapshots taken while the network changes under them"""
+
+import sys
+import threading
+
+import numpy as np
+
+
+def fingerprint(snapshot):
+    return ([mage.name for mage in snapshot.mages], snapshot._intents.copy(),
+            snapshot._kin.copy(), snapshot.calculate_network_coherence())
+
+
+def test_snapshot_stays_fixed_during_unbatched_writes(echo_mage, rng):
+    network = echo_mage.ResonanceNetwork()
+    for i in range(200):
+        network.add_mage(echo_mage.EchoMage(f"m{i}", rng.normal(size=3).tolist()))
+    done = threading.Event()
+    failures = []
+
+    def write():
+        try:
+            for k in range(1500):
+                network.add_mage(echo_mage.EchoMage(f"w{k}", rng.normal(size=3).tolist()))
+                mage = network.mages[k % 150]
+                mage.intent = echo_mage.IntentVector(*rng.normal(size=3))
+                mage.kin_threshold = 0.75 + 0.01 * (k % 10)
+                network.remove_mage(network.mages[-2])
+        except Exception as error:  # Surfaces in the main thread's assert
+            failures.append(repr(error))
+        finally:
+            done.set()
+
+    def read():
+        while not done.is_set():
+            snapshot = network.snapshot()
+            before = fingerprint(snapshot)
+            units = snapshot._units
+            if not np.allclose(snapshot._unit_sum, units.sum(axis=0)):
+                failures.append("coherence aggregates of another version")
+            snapshot.find_optimal_pairings()
+            after = fingerprint(snapshot)
+            if (before[0] != after[0] or not np.array_equal(before[1], after[1])
+                    or not np.array_equal(before[2], after[2]) or before[3] != after[3]):
+                failures.append("snapshot changed under its reader")
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads often enough to interleave writes
+    try:
+        threads = [threading.Thread(target=write)] + [threading.Thread(target=read)
+                                                       for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert not failures, failures[:3]
+    assert len(network.snapshot().mages) == 200
+
+
+def test_batch_publishes_one_version(echo_mage, rng):
+    network = echo_mage.ResonanceNetwork()
+    for i in range(20):
+        network.add_mage(echo_mage.EchoMage(f"m{i}", rng.normal(size=3).tolist()))
+    before = network.snapshot()
+    with network.batch_updates():
+        network.remove_mage("m3")
+        network.add_mage(echo_mage.EchoMage("x", [1.0, 0.0, 0.0]))
+        assert network.snapshot() is before
+    after = network.snapshot()
+    assert after.version > before.version
+    assert "m3" in [mage.name for mage in before.mages]
+    assert [mage.name for mage in after.mages][-1] == "x" and "m3" not in after
+
+
+def test_writes_copy_only_the_columns_they_touch(echo_mage, rng):
+    network = echo_mage.ResonanceNetwork()
+    network.set_precision("int8")
+    for i in range(20):
+        network.add_mage(echo_mage.EchoMage(f"m{i}", rng.normal(size=3).tolist()))
+    snapshot = network.snapshot()
+    stored = {column: getattr(network, column) for column in network._COLUMNS}
+    frozen = fingerprint(snapshot)
+
+    def copied():
+        return {column for column in network._COLUMNS
+                if getattr(network, column) is not stored[column]}
+
+    network.mages[1].echo_activated = True
+    assert copied() == {"_echo"}
+    network.mages[2].kin_threshold = 0.5
+    network.mages[3].echo_activated = True  # _echo is already private
+    assert copied() == {"_echo", "_kin"}
+    network.mages[4].intent = echo_mage.IntentVector(1.0, 2.0, 3.0)
+    assert copied() == {"_echo", "_kin", "_intents", "_units", "_unit_scales", "_unit_errors"}
+    members = network._members
+    network.remove_mage("m5")
+    assert copied() == set(network._COLUMNS) and network._members is not members
+
+    after = fingerprint(snapshot)
+    assert frozen[0] == after[0] and frozen[3] == after[3]
+    assert np.array_equal(frozen[1], after[1]) and np.array_equal(frozen[2], after[2])
+    assert not snapshot._echo.any()